@@ -1,19 +1,38 @@
+from __future__ import annotations
+
+# keep module level imports cheap, heavy modules ('doxmlparser', 'lxml', executors, ...)
+# are imported where they are used, see 'doxmlparser_module'
 import logging
-import inspect
+import copy
+import fnmatch
+import importlib
+import importlib.util
+import io
+import itertools
 import json
+import keyword
+import os
+import re
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import TextIO
+from typing import TYPE_CHECKING
+from contextlib import contextmanager
+from contextlib import redirect_stdout
 from enum import Enum
 from argparse import ArgumentParser
-from queue import Queue
+from argparse import Namespace
 from threading import Lock
-from concurrent.futures import Executor
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import ProcessPoolExecutor
-from concurrent.futures import Future
 
-import doxmlparser
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from concurrent.futures import Future
 
 __version__ = '1.10.0.3'
 
@@ -24,6 +43,39 @@ class Xml2Json:
     """
     __logger = logging.getLogger('.'.join([__name__, __qualname__]))
     __lock = Lock()
+    MANIFEST_FILE_NAME = 'xml2json.manifest.json'
+    SHARD_MANIFEST_FILE_NAME = 'xml2json.manifest.shard-{index}-of-{count}.json'
+    ENUMS_FILE_NAME = 'enums.json'
+    BUFFER_SIZE = 1024 * 1024
+    NDJSON_FILE_NAME = 'xml2json.ndjson'
+    REFIDS_FILE_NAME = 'xml2json.refids.json'
+    COMPRESSION_SUFFIXES = {'none': '', 'gzip': '.gz', 'lzma': '.xz'}
+    STATS_PHASES = ['read', 'check', 'parse', 'convert', 'serialize', 'stream', 'write']
+    JSON_BACKENDS = ['auto', 'stdlib', 'orjson']
+    LEAN_STRING_SIZE = 256
+    AUTO_POOL_STARTUP = 0.25
+    AUTO_TASK_TIME = 0.05
+    AUTO_CALIBRATION_BYTES = 256 * 1024
+    __stats_hook: Callable[[dict[str, Any], list[dict[str, Any]]], None] | None = None
+    __json_backend: str | None = None
+    __orjson: Any = None
+    __worker_tasks = 0
+    __enum_dicts_cache: dict[str, list[dict[str, Any]]] = {}
+    __doxmlparser_modules: dict[str, Any] = {}
+    __to_dict_types: dict[type, bool] = {}
+    __to_dict_plans: dict[type, list[tuple[str, Any]]] = {}
+    __stream_spill_size = 1024 * 1024
+    __stream_containers: dict[str, set[tuple[str, ...]]] = {
+        'index': {
+            ('doxygenindex',)
+        },
+        'compound': {
+            ('doxygen',),
+            ('doxygen', 'compounddef'),
+            ('doxygen', 'compounddef', 'sectiondef'),
+            ('doxygen', 'compounddef', 'programlisting')
+        }
+    }
 
     @classmethod
     def set_logger_level(cls, level=logging.DEBUG):
@@ -42,19 +94,139 @@ class Xml2Json:
             raise e
 
     @classmethod
-    def main(cls, arguments: list[str]) -> int:
+    def set_stats_hook(cls, hook: Callable[[dict[str, Any], list[dict[str, Any]]], None] | None) -> None:
+        """
+        Set function called with '(report, records)' after every 'main' run, see 'stats_report'.
+        None: no hook, report is collected only with '--stats'.
+        """
+        try:
+            cls.__stats_hook = hook
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def set_json_backend(cls, backend: str = 'auto') -> str:
+        """
+        Select JSON encoder, output text is the same with every backend, see 'json_dumps'.
+        'auto': 'orjson' if installed, otherwise 'stdlib'.
+
+        :return: active backend name.
+        """
+        try:
+            if backend not in cls.JSON_BACKENDS:
+                raise Exception(f"Unsupported 'backend': '{backend}'!")
+
+            orjson = None
+            if backend != 'stdlib':
+                try:
+                    orjson = importlib.import_module('orjson')
+                except ImportError:
+                    if backend == 'orjson':
+                        raise Exception(f"'orjson' is not installed!")
+
+            cls.__orjson = orjson
+            cls.__json_backend = 'stdlib' if orjson is None else 'orjson'
+
+            return cls.__json_backend
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def json_backend(cls) -> str:
+        """
+        :return: active JSON encoder name, 'auto' is resolved on first call, see 'set_json_backend'.
+        """
+        try:
+            if cls.__json_backend is None:
+                cls.set_json_backend()
+
+            return cls.__json_backend
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def json_encoder(cls, indent: int | None) -> str:
+        """
+        :param indent: JSON indent, negative: compact.
+
+        :return: encoder of 'json_dumps' for 'indent': 'orjson' backend only for compact text and indent 2,
+                 other indents are not supported by 'orjson' and use 'stdlib'.
+        """
+        try:
+            if cls.json_backend() == 'orjson' and indent is not None and (indent < 0 or indent == 2):
+                return 'orjson'
+
+            return 'stdlib'
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def argument_parser(cls, request: bool = False) -> ArgumentParser:
+        """
+        Command line arguments parser.
+
+        :param request: parser of 'serve_stream' requests, without process level options
+                        ('--version', '--stats-hook', '--watch', '--watch-interval', '--serve', '--merge').
+        """
         try:
             parser = ArgumentParser()
-            parser.add_argument('--version', action='store_true')
+            if not request:
+                parser.add_argument('--version', action='store_true')
             parser.add_argument('--verbose', action='store_true')
             parser.add_argument('--xml-file', type=str)
             parser.add_argument('--output-dir', type=str, default='<default>', help='default: XML_FILE/../../json')
-            parser.add_argument('--parallel', type=int, default=0, help='default: 0')
-            parser.add_argument('--parallel-type', type=str, default='thread', help='default: thread', choices=['thread', 'process'])
-            parser.add_argument('--indent', type=int, default=4, help='default: 4')
+            parser.add_argument('--parallel', type=cls.parse_parallel, default=0, help='default: 0, auto: choose --parallel, --parallel-type and --batch-size from cpu count, compounds and a calibration run, see auto_parallel')
+            parser.add_argument('--parallel-type', type=str, default='thread', help='default: thread, pipeline: reader thread, process pool conversion, writer thread', choices=['thread', 'process', 'pipeline'])
+            parser.add_argument('--indent', type=int, default=4, help='default: 4, -1: compact')
+            parser.add_argument('--json-backend', type=str, default='auto', help='default: auto (orjson if installed, otherwise stdlib), orjson encodes only --indent -1 and 2, same output with every backend', choices=cls.JSON_BACKENDS)
+            parser.add_argument('--buffer-size', type=int, default=cls.BUFFER_SIZE, help=f"default: {cls.BUFFER_SIZE}, output file buffer bytes")
             parser.add_argument('--silence', type=bool, default=True, help='default: True')
             parser.add_argument('--warnings', type=bool, default=True, help='default: True')
             parser.add_argument('--xml-type', type=str, default='all', help='default: all', choices=['all', 'index', 'compound'])
+            parser.add_argument('--max-worker-tasks', type=int, default=0, help='default: 0, replace process workers after one of them ran this many tasks, 0: never')
+            parser.add_argument('--max-worker-rss', type=int, default=0, help='default: 0, replace process workers after one of them is above this resident memory in MiB, 0: never, Linux only (needs /proc/self/statm)')
+            parser.add_argument('--large-file-size', type=int, default=0, help='default: 0, compound XML files of at least this many bytes go to a lane of --large-file-parallel workers, parallel only, 0: no lane')
+            parser.add_argument('--large-file-parallel', type=int, default=1, help='default: 1, max large files converted at the same time')
+            parser.add_argument('--order', type=str, default='size', help='default: size (largest first), parallel only', choices=['size', 'index'])
+            parser.add_argument('--batch-size', type=int, default=65536, help='default: 65536, convert smaller files in one task up to this total bytes, parallel only, 0: disabled')
+            parser.add_argument('--engine', type=str, default='object', help='default: object', choices=['object', 'stream'])
+            parser.add_argument('--enums', type=str, default='inline', help=f"default: inline, shared: write once to OUTPUT_DIR/{cls.ENUMS_FILE_NAME}", choices=['inline', 'shared'])
+            parser.add_argument('--output-format', type=str, default='files', help=f"default: files, ndjson: single OUTPUT_DIR/{cls.NDJSON_FILE_NAME} stream", choices=['files', 'ndjson'])
+            parser.add_argument('--compression', type=str, default='none', help='default: none, ndjson only', choices=['none', 'gzip', 'lzma'])
+            parser.add_argument('--incremental', action='store_true', help=f"convert only changed compounds, state in OUTPUT_DIR/{cls.MANIFEST_FILE_NAME}")
+            parser.add_argument('--refid-index', action='store_true', help=f"write refid lookup OUTPUT_DIR/{cls.REFIDS_FILE_NAME}, see open_index, xml-type all only")
+            parser.add_argument('--include-kind', type=str, nargs='+', help='convert only compounds of these kinds (class, namespace, group, ...)')
+            parser.add_argument('--exclude-kind', type=str, nargs='+', help='skip compounds of these kinds')
+            parser.add_argument('--include-refid', type=str, nargs='+', help="convert only compounds with refid matching glob or 're:REGEX'")
+            parser.add_argument('--exclude-refid', type=str, nargs='+', help="skip compounds with refid matching glob or 're:REGEX'")
+            parser.add_argument('--select-from', type=str, help="convert only compounds listed in file, one refid or source file path per line (compounds located in that file, paths match if one ends with the other at a '/', so a bare file name matches it in every directory), '-': stdin")
+            parser.add_argument('--stats', type=str, help='write per-phase timing and counters report to STATS JSON file')
+            parser.add_argument('--stats-slowest', type=int, default=10, help='default: 10, number of slowest files in stats report')
+            if not request:
+                parser.add_argument('--stats-hook', type=str, help='MODULE:FUNCTION called with (report, records) after this run, see set_stats_hook')
+                parser.add_argument('--watch', action='store_true', help='keep running, poll XML_FILE dir and reconvert changed compounds')
+                parser.add_argument('--watch-interval', type=float, default=1.0, help='default: 1.0, seconds between polls')
+                parser.add_argument('--serve', type=str, help="keep running, read JSON requests from '-' (stdin) or loopback 'HOST:PORT', see serve_stream")
+            parser.add_argument('--dedup-members', action='store_true', help="convert each memberdef once, in the compound that owns it (the compound whose refid prefixes the member refid, otherwise the first compound listing it, see refid_map), other compounds get {'refid': ID} entries, xml-type all only. Only memberdef elements are deduplicated: enumvalues are not references of their own, they stay inside their enum memberdef (so only in the owning compound), and index.json still lists members under every compound")
+            parser.add_argument('--shard', type=str, help="convert only shard INDEX/COUNT (1-based) of index and compounds balanced by XML size, see shard_plan and merge_shards")
+            if not request:
+                parser.add_argument('--merge', type=str, nargs='+', help='validate and combine shard output dirs into OUTPUT_DIR')
+            else:
+                parser.set_defaults(version=False, stats_hook=None, watch=False, watch_interval=1.0, serve=None, merge=None)
+
+            return parser
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def main(cls, arguments: list[str]) -> int:
+        try:
+            parser = cls.argument_parser()
 
             args = parser.parse_args(arguments[1:])
 
@@ -68,322 +240,3233 @@ class Xml2Json:
             cls.__logger.debug(f"args.parallel: '{args.parallel}' ({type(args.parallel)})")
             cls.__logger.debug(f"args.parallel_type: '{args.parallel_type}' ({type(args.parallel_type)})")
             cls.__logger.debug(f"args.indent: '{args.indent}' ({type(args.indent)})")
+            cls.__logger.debug(f"args.buffer_size: '{args.buffer_size}' ({type(args.buffer_size)})")
             cls.__logger.debug(f"args.silence: '{args.silence}' ({type(args.silence)})")
             cls.__logger.debug(f"args.warnings: '{args.warnings}' ({type(args.warnings)})")
             cls.__logger.debug(f"args.xml_type: '{args.xml_type}' ({type(args.xml_type)})")
+            cls.__logger.debug(f"args.max_worker_tasks: '{args.max_worker_tasks}' ({type(args.max_worker_tasks)})")
+            cls.__logger.debug(f"args.max_worker_rss: '{args.max_worker_rss}' ({type(args.max_worker_rss)})")
+            cls.__logger.debug(f"args.large_file_size: '{args.large_file_size}' ({type(args.large_file_size)})")
+            cls.__logger.debug(f"args.large_file_parallel: '{args.large_file_parallel}' ({type(args.large_file_parallel)})")
+            cls.__logger.debug(f"args.order: '{args.order}' ({type(args.order)})")
+            cls.__logger.debug(f"args.batch_size: '{args.batch_size}' ({type(args.batch_size)})")
+            cls.__logger.debug(f"args.engine: '{args.engine}' ({type(args.engine)})")
+            cls.__logger.debug(f"args.enums: '{args.enums}' ({type(args.enums)})")
+            cls.__logger.debug(f"args.output_format: '{args.output_format}' ({type(args.output_format)})")
+            cls.__logger.debug(f"args.compression: '{args.compression}' ({type(args.compression)})")
+            cls.__logger.debug(f"args.incremental: '{args.incremental}' ({type(args.incremental)})")
+            cls.__logger.debug(f"args.refid_index: '{args.refid_index}' ({type(args.refid_index)})")
+            cls.__logger.debug(f"args.include_kind: '{args.include_kind}' ({type(args.include_kind)})")
+            cls.__logger.debug(f"args.exclude_kind: '{args.exclude_kind}' ({type(args.exclude_kind)})")
+            cls.__logger.debug(f"args.include_refid: '{args.include_refid}' ({type(args.include_refid)})")
+            cls.__logger.debug(f"args.exclude_refid: '{args.exclude_refid}' ({type(args.exclude_refid)})")
+            cls.__logger.debug(f"args.select_from: '{args.select_from}' ({type(args.select_from)})")
+            cls.__logger.debug(f"args.stats: '{args.stats}' ({type(args.stats)})")
+            cls.__logger.debug(f"args.stats_slowest: '{args.stats_slowest}' ({type(args.stats_slowest)})")
+            cls.__logger.debug(f"args.stats_hook: '{args.stats_hook}' ({type(args.stats_hook)})")
+            cls.__logger.debug(f"args.watch: '{args.watch}' ({type(args.watch)})")
+            cls.__logger.debug(f"args.watch_interval: '{args.watch_interval}' ({type(args.watch_interval)})")
+            cls.__logger.debug(f"args.serve: '{args.serve}' ({type(args.serve)})")
+            cls.__logger.debug(f"args.dedup_members: '{args.dedup_members}' ({type(args.dedup_members)})")
+            cls.__logger.debug(f"args.shard: '{args.shard}' ({type(args.shard)})")
+            cls.__logger.debug(f"args.merge: '{args.merge}' ({type(args.merge)})")
 
             if args.version:
                 print(__version__)
                 return 0
             else:
-                if args.xml_file is None:
+                if args.xml_file is None and args.serve is None and args.merge is None:
                     parser.print_help()
                     return 1
 
+            if args.merge is not None:
+                if args.output_dir == '<default>':
+                    raise Exception(f"'--output-dir' is required with '--merge'!")
+                cls.merge_shards(args.merge, args.output_dir, args.verbose)
+                return 0
+
+            if args.watch or args.serve is not None:
+                return cls.daemon(args)
+
+            return cls.run(args)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def run(cls, args: Namespace, executor: Executor | None = None) -> int:
+        """
+        Convert for parsed command line arguments.
+
+        :param args: parsed command line arguments, see 'argument_parser'.
+        :param executor: warm pool to use instead of a new one, must match 'args.parallel_type'.
+
+        :return: exit code.
+        """
+        try:
             cls.check_output_dir(args.output_dir)
+            cls.check_indent(args.indent)
+
+            select = None
+            if args.select_from is not None:
+                if args.select_from == '-':
+                    select = sys.stdin.read().splitlines()
+                else:
+                    select = Path(args.select_from).read_text().splitlines()
+
+            args.selection = cls.compound_selection(
+                include_kinds=args.include_kind,
+                exclude_kinds=args.exclude_kind,
+                include_refids=args.include_refid,
+                exclude_refids=args.exclude_refid,
+                select=select,
+                xml_file=args.xml_file if args.xml_type != 'compound' else None
+            )
+
+            cls.resolve_parallel(args)
             cls.check_parallel(args.parallel)
+            cls.check_worker_limits(args)
+
+            if args.parallel_type == 'pipeline' and args.parallel > 0 and args.engine == 'stream':
+                raise Exception(f"'--engine stream' is not supported with '--parallel-type pipeline'!")
+
+            if args.selection is not None and args.incremental:
+                raise Exception(f"'--incremental' is not supported with compound selection!")
+
+            if args.dedup_members:
+                if args.xml_type != 'all':
+                    raise Exception(f"'--dedup-members' requires '--xml-type all'!")
+                if args.incremental:
+                    raise Exception(f"'--incremental' is not supported with '--dedup-members'!")
+
+            args.shard_spec = cls.parse_shard(args.shard)
+            if args.shard_spec is not None:
+                if args.xml_type != 'all':
+                    raise Exception(f"'--shard' requires '--xml-type all'!")
+                if args.incremental:
+                    raise Exception(f"'--incremental' is not supported with '--shard'!")
+                if args.output_format == 'ndjson':
+                    raise Exception(f"'--output-format ndjson' is not supported with '--shard'!")
+
+            # '--stats-hook' applies to this run only, 'set_stats_hook' to all runs
+            stats_hook = cls.__stats_hook
+            if args.stats_hook is not None:
+                module_name, function_name = args.stats_hook.split(':', 1)
+                stats_hook = getattr(importlib.import_module(module_name), function_name)
+
+            records = None
+            if args.stats is not None or stats_hook is not None:
+                records = []
+            start = time.perf_counter()
+
+            json_backend = cls.set_json_backend(args.json_backend)
 
             if args.verbose:
                 cls.info_message(f"process: '{args.xml_file}'")
+                cls.info_message(f"json backend: '{json_backend}', encoder: '{cls.json_encoder(args.indent)}'")
 
-            if args.xml_type == 'all':
-                root_result = cls.transform(
-                    xml_file=args.xml_file,
-                    silence=args.silence,
-                    warnings=args.warnings,
-                    xml_type='index'
-                )
-                json_file = Path(args.output_dir).joinpath(Path(args.xml_file).stem + '.json')
-                json_str = json.dumps(root_result, indent=args.indent)
+            if args.output_format == 'ndjson':
+                if args.incremental:
+                    raise Exception(f"'--incremental' is not supported with '--output-format ndjson'!")
 
-                Path(json_file).parent.mkdir(parents=True, exist_ok=True)
-                Path(json_file).write_text(json_str)
+                import shutil
+                import tempfile
 
-                if len(root_result) == 0:
-                    raise Exception(f"'root_result' is empty!")
-                compound_dict = root_result[len(root_result) - 1]
-                if len(compound_dict) < 2:
-                    raise Exception(f"'compound_dict' too small!")
-                if args.parallel == 0:
-                    for compound in compound_dict['compound']:
-                        compound_xml_file_name = compound['refid'] + '.xml'
-                        compound_xml_file = str(Path(args.xml_file).parent.joinpath(compound_xml_file_name))
+                ndjson_file = Path(args.output_dir).joinpath(cls.NDJSON_FILE_NAME + cls.COMPRESSION_SUFFIXES[args.compression])
+                Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+                parts_dir = tempfile.mkdtemp(prefix='.xml2json-', dir=args.output_dir)
+                try:
+                    parts_args = copy.copy(args)
+                    parts_args.output_dir = parts_dir
+                    parts_args.indent = -1
+                    names = cls.__convert(parts_args, records, executor)
 
-                        if args.verbose:
-                            cls.info_message(f"process: '{compound_xml_file}'")
+                    if args.verbose:
+                        cls.info_message(f"write: '{ndjson_file}'")
 
-                        compound_result = cls.transform(
-                            xml_file=compound_xml_file,
-                            silence=args.silence,
-                            warnings=args.warnings,
-                            xml_type='compound'
-                        )
-                        json_file = Path(args.output_dir).joinpath(Path(compound_xml_file_name).stem + '.json')
-                        json_str = json.dumps(compound_result, indent=args.indent)
-                        Path(json_file).parent.mkdir(parents=True, exist_ok=True)
-                        Path(json_file).write_text(json_str)
-                else:
-                    queue_files: Queue[str] = Queue()
-                    queue_futures: Queue[Future] = Queue(maxsize=args.parallel)
-                    for compound in compound_dict['compound']:
-                        compound_xml_file_name = compound['refid'] + '.xml'
-                        compound_xml_file = str(Path(args.xml_file).parent.joinpath(compound_xml_file_name))
-                        queue_files.put(compound_xml_file)
-
-                    executor: Executor
-                    if args.parallel_type == 'thread':
-                        executor = ThreadPoolExecutor(max_workers=args.parallel)
-                    else:
-                        executor = ProcessPoolExecutor(max_workers=args.parallel)
+                    offsets = cls.write_ndjson(str(ndjson_file), parts_dir, names, args.compression, args.buffer_size)
+                finally:
+                    shutil.rmtree(parts_dir, ignore_errors=True)
 
-                    try:
-                        while not queue_files.empty():
-                            list_futures: list[Future] = []
-                            while not queue_futures.empty():
-                                future = queue_futures.get()
-                                list_futures.append(future)
+                if args.refid_index and args.xml_type == 'all':
+                    cls.write_refid_index(args.output_dir, cls.refid_map(args.xml_file, args.selection), ndjson_file.name, offsets)
+            else:
+                cls.__convert(args, records, executor)
 
-                            for future in list_futures:
-                                if not future.done():
-                                    queue_futures.put(future)
+                if args.refid_index and args.xml_type == 'all':
+                    cls.write_refid_index(args.output_dir, cls.refid_map(args.xml_file, args.selection))
 
-                            if queue_futures.full():
-                                continue
+            if records is not None:
+                report = cls.stats_report(records, time.perf_counter() - start, args.stats_slowest, cls.json_encoder(args.indent))
+
+                if args.stats is not None:
+                    cls.write_json(args.stats, report, 4, fast=False)
+
+                if stats_hook is not None:
+                    stats_hook(report, records)
+
+            return 0
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __convert(
+        cls,
+        args: Namespace,
+        records: list[dict[str, Any]] | None = None,
+        executor: Executor | None = None
+    ) -> list[str]:
+        """
+        Write JSON files for parsed command line arguments.
+
+        :param args: parsed command line arguments.
+        :param records: collect per-file stats records, see 'execute_in_parallel', None: no stats.
+        :param executor: warm pool, None: new pool if 'args.parallel' is set.
 
-                            compound_xml_file = queue_files.get()
+        :return: written JSON file stems in output order.
+        """
+        try:
+            names: list[str] = []
+            enums = args.enums == 'inline'
+            stats = records is not None
+
+            if not enums and args.xml_type != 'index':
+                enums_json_file = Path(args.output_dir).joinpath(cls.ENUMS_FILE_NAME)
+                cls.write_json(str(enums_json_file), cls.compound_enum_dicts(), args.indent, args.buffer_size)
+                names.append(Path(enums_json_file).stem)
+
+            if args.xml_type == 'all':
+                json_file = Path(args.output_dir).joinpath(Path(args.xml_file).stem + '.json')
+                xml_dir = Path(args.xml_file).parent
+
+                shard = getattr(args, 'shard_spec', None)
+                shard_names = None
+                if shard is not None:
+                    shard_names = cls.shard_plan(args.xml_file, shard[1], args.selection)[shard[0] - 1]
+
+                manifest = None
+                previous_manifest = None
+                if args.incremental or shard is not None:
+                    manifest = {
+                        'version': __version__,
+                        'options': {'indent': args.indent, 'enums': args.enums, 'dedup_members': args.dedup_members},
+                        'index': {'xml': Path(args.xml_file).name, 'hash': cls.file_hash(args.xml_file)},
+                        'compounds': {}
+                    }
+                if args.incremental:
+                    previous_manifest = cls.read_manifest(args.output_dir)
+
+                index_skip = (
+                    cls.is_manifest_reusable(manifest, previous_manifest)
+                    and previous_manifest['index'] == manifest['index']
+                    and Path(json_file).exists()
+                )
+                if index_skip and args.verbose:
+                    cls.info_message(f"skip: '{args.xml_file}'")
+
+                index_other_shard = shard_names is not None and Path(json_file).stem not in shard_names
+
+                args.member_refs = cls.foreign_members(args.xml_file, args.selection) if args.dedup_members else None
+
+                own_executor = None
+                if executor is None:
+                    executor = own_executor = cls.create_executor(
+                        parallel=args.parallel,
+                        parallel_type=args.parallel_type,
+                        max_tasks=args.max_worker_tasks,
+                        max_rss=args.max_worker_rss * 1024 * 1024
+                    )
+                elif args.parallel == 0:
+                    executor = None
+
+                try:
+                    # compounds do not depend on 'index.json', parallel runs convert it next to them
+                    index_future: Future | None = None
+                    if not index_skip and not index_other_shard:
+                        index_task = (
+                            args.xml_file,
+                            args.silence,
+                            args.warnings,
+                            args.output_dir,
+                            args.indent,
+                            args.engine,
+                            True,
+                            args.buffer_size,
+                            stats,
+                            'index',
+                            args.selection
+                        )
+                        if executor is None:
+                            record = cls.execute_in_parallel(*index_task)
+                            if stats:
+                                records.append(record)
+                        else:
+                            index_future = executor.submit(cls.execute_in_parallel, *index_task)
 
-                            if args.verbose:
-                                cls.info_message(f"process: '{compound_xml_file}'")
+                    if not index_other_shard:
+                        names.append(Path(json_file).stem)
 
-                            future = executor.submit(
-                                cls.execute_in_parallel,
-                                compound_xml_file,
-                                args.silence,
-                                args.warnings,
-                                args.output_dir,
-                                args.indent
+                    if shard_names is not None:
+                        refids: Iterable[str] = [refid for refid in shard_names if refid != Path(json_file).stem]
+                        names.extend(refids)
+                        for refid in refids:
+                            xml_file = xml_dir.joinpath(refid + '.xml')
+                            manifest['compounds'][refid] = {'xml': xml_file.name, 'hash': cls.file_hash(str(xml_file))}
+                    else:
+                        # refids are read as 'index.xml' is parsed, compounds start before its end
+                        refids = cls.iter_index_refids(args.xml_file, names, args.selection)
+
+                        if manifest is not None:
+                            refids = cls.incremental_refids(
+                                manifest=manifest,
+                                previous_manifest=previous_manifest,
+                                xml_dir=str(xml_dir),
+                                output_dir=args.output_dir,
+                                refids=list(refids),
+                                verbose=args.verbose
                             )
-                            queue_futures.put(future)
-                    finally:
-                        executor.shutdown(wait=True)
+
+                    compound_xml_files = (str(xml_dir.joinpath(refid + '.xml')) for refid in refids)
+                    cls.__convert_compounds(args, compound_xml_files, executor, records)
+
+                    if index_future is not None:
+                        record = index_future.result()
+                        if stats:
+                            records.insert(0, record)
+                except Exception as e:
+                    if own_executor is not None:
+                        own_executor.shutdown(wait=True, cancel_futures=True)
+                    raise e
+                finally:
+                    if own_executor is not None:
+                        own_executor.shutdown(wait=True)
+
+                if shard is not None:
+                    manifest['shard'] = {
+                        'index': shard[0],
+                        'count': shard[1],
+                        'names': names,
+                        'positions': [shard_names[refid] for refid in manifest['compounds']]
+                    }
+                    shard_manifest_file = Path(args.output_dir).joinpath(
+                        cls.SHARD_MANIFEST_FILE_NAME.format(index=shard[0], count=shard[1])
+                    )
+                    cls.write_json(str(shard_manifest_file), manifest, 4)
+                elif manifest is not None:
+                    cls.write_manifest(args.output_dir, manifest)
+            elif args.engine == 'stream':
+                json_file = Path(args.output_dir).joinpath(Path(args.xml_file).stem + '.json')
+                names.append(Path(json_file).stem)
+                record = cls.stats_record(args.xml_file) if stats else None
+                cls.transform_stream(
+                    xml_file=args.xml_file,
+                    json_file=str(json_file),
+                    indent=args.indent,
+                    warnings=args.warnings,
+                    xml_type=args.xml_type,
+                    enums=enums or args.xml_type == 'index',
+                    buffer_size=args.buffer_size,
+                    stats=record,
+                    selection=args.selection
+                )
+                if stats:
+                    records.append(cls.stats_record_done(record, str(json_file)))
             else:
+                record = cls.stats_record(args.xml_file) if stats else None
                 root_result = cls.transform(
                     xml_file=args.xml_file,
                     silence=args.silence,
                     warnings=args.warnings,
-                    xml_type=args.xml_type
+                    xml_type=args.xml_type,
+                    enums=enums or args.xml_type == 'index',
+                    stats=record,
+                    selection=args.selection
                 )
                 json_file = Path(args.output_dir).joinpath(Path(args.xml_file).stem + '.json')
-                json_str = json.dumps(root_result, indent=args.indent)
-
-                Path(json_file).parent.mkdir(parents=True, exist_ok=True)
-                Path(json_file).write_text(json_str)
+                cls.write_json(str(json_file), root_result, args.indent, args.buffer_size, record)
+                names.append(Path(json_file).stem)
+                if stats:
+                    records.append(cls.stats_record_done(record, str(json_file)))
 
-            return 0
+            return names
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def execute_in_parallel(
+    def __convert_compounds(
         cls,
-        compound_xml_file: str,
-        silence: bool,
-        warnings: bool,
-        output_dir: str,
-        indent: int
+        args: Namespace,
+        compound_xml_files: Iterable[str],
+        executor: Executor | None,
+        records: list[dict[str, Any]] | None = None
     ) -> None:
+        """
+        Convert compound XML files serially or on 'executor' as set by parsed command line arguments.
+        """
         try:
-            compound_result = cls.transform(
-                xml_file=compound_xml_file,
-                silence=silence,
-                warnings=warnings,
-                xml_type='compound'
-            )
-            json_file = Path(output_dir).joinpath(Path(Path(compound_xml_file).name).stem + '.json')
-            json_str = json.dumps(compound_result, indent=indent)
-            Path(json_file).parent.mkdir(parents=True, exist_ok=True)
-            Path(json_file).write_text(json_str)
+            enums = args.enums == 'inline'
+            stats = records is not None
+            member_refs: dict[str, list[str]] | None = getattr(args, 'member_refs', None)
+
+            lane = None
+            if args.large_file_size > 0:
+                def lane(task: tuple) -> bool:
+                    files = task[0] if isinstance(task[0], list) else [task[0]]
+                    return sum(cls.file_cost(file) for file in files) >= args.large_file_size
+
+            if executor is None or args.parallel == 0:
+                for compound_xml_file in compound_xml_files:
+                    if args.verbose:
+                        cls.info_message(f"process: '{compound_xml_file}'")
+
+                    record = cls.execute_in_parallel(
+                        compound_xml_file,
+                        args.silence,
+                        args.warnings,
+                        args.output_dir,
+                        args.indent,
+                        args.engine,
+                        enums,
+                        args.buffer_size,
+                        stats,
+                        member_refs=member_refs.get(Path(compound_xml_file).stem) if member_refs else None
+                    )
+                    if stats:
+                        records.append(record)
+            elif args.parallel_type == 'pipeline':
+                if args.order == 'size':
+                    compound_xml_files = [batch[0] for batch in cls.plan_batches(list(compound_xml_files))]
+
+                result = cls.execute_pipeline(
+                    executor=executor,
+                    compound_xml_files=compound_xml_files,
+                    silence=args.silence,
+                    warnings=args.warnings,
+                    output_dir=args.output_dir,
+                    indent=args.indent,
+                    enums=enums,
+                    buffer_size=args.buffer_size,
+                    max_pending=args.parallel * 2,
+                    stats=stats,
+                    verbose=args.verbose,
+                    member_refs=member_refs,
+                    lane=lane,
+                    lane_pending=args.large_file_parallel
+                )
+                if stats:
+                    records.extend(result['records'])
+                cls.__logger.debug(
+                    f"converted: {result['files']} files, {result['bytes']} bytes, {result['time']:.3f} worker seconds"
+                )
+            else:
+                if args.order == 'size':
+                    batches = cls.plan_batches(
+                        xml_files=list(compound_xml_files),
+                        batch_cost=args.batch_size,
+                        largest_first=True
+                    )
+                else:
+                    batches = cls.iter_batches(xml_files=compound_xml_files, batch_cost=args.batch_size)
+                tasks = (
+                    (
+                        batch,
+                        args.silence,
+                        args.warnings,
+                        args.output_dir,
+                        args.indent,
+                        args.engine,
+                        enums,
+                        args.buffer_size,
+                        stats,
+                        cls.__batch_member_refs(batch, member_refs)
+                    )
+                    for batch in batches
+                )
+
+                totals = {'files': 0, 'bytes': 0, 'time': 0.0}
+                for result in cls.schedule(
+                    executor=executor,
+                    fn=cls.execute_batch,
+                    tasks=tasks,
+                    max_pending=args.parallel * 2,
+                    verbose=args.verbose,
+                    lane=lane,
+                    lane_pending=args.large_file_parallel
+                ):
+                    if len(result['errors']) > 0:
+                        raise Exception(f"Conversion failed: {result['errors'][0]}")
+                    for key in totals:
+                        totals[key] += result[key]
+                    if stats:
+                        records.extend(result['records'])
+                cls.__logger.debug(
+                    f"converted: {totals['files']} files, {totals['bytes']} bytes, {totals['time']:.3f} worker seconds"
+                )
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def transform(
-        cls,
-        xml_file: str,
-        silence: bool = True,
-        warnings: bool = True,
-        xml_type: str = None
-    ) -> list[dict[str, Any]]:
+    def parse_parallel(cls, value: str) -> int | str:
         """
-        Main method.
-
-        :param xml_file: XML file path string.
-        :param silence: silence.
-        :param warnings: print warnings.
-        :param xml_type: XML file type string.
+        '--parallel' argument type.
 
-        :return: index JSON file path string.
+        :return: 'auto' or number of workers.
+        """
+        if value == 'auto':
+            return value
+        return int(value)
 
-        :raise Exception: on error.
+    @classmethod
+    def resolve_parallel(cls, args: Namespace) -> None:
+        """
+        Replace '--parallel auto' in parsed command line arguments by the 'auto_parallel' choice
+        for the compounds of 'args.selection' (all if not set yet).
         """
         try:
-            if xml_type is None:
-                if Path(xml_file).name == 'index.xml':
-                    xml_type = 'index'
-                else:
-                    xml_type = 'compound'
-            elif xml_type != 'index' and xml_type != 'compound':
-                raise Exception(f"Unsupported 'xml_type': '{xml_type}'! Supported: ['index', 'compound']")
+            if args.parallel != 'auto':
+                return
 
-            if xml_type == 'index':
-                return cls.transform_index(xml_file, silence, warnings)
-            elif xml_type == 'compound':
-                return cls.transform_compound(xml_file, silence, warnings)
+            if args.xml_file is None or args.xml_type != 'all':
+                choice = {'parallel': 0, 'parallel_type': args.parallel_type, 'batch_size': args.batch_size}
+                message = 'parallel auto: 0 (single XML file)'
             else:
-                raise Exception(f"Unsupported 'xml_type': '{xml_type}'!")
+                choice = cls.auto_parallel(args.xml_file, selection=getattr(args, 'selection', None))
+                if args.max_worker_tasks > 0 or args.max_worker_rss > 0:
+                    # only process workers can be replaced to release memory
+                    choice['parallel_type'] = 'process'
+                message = (
+                    f"parallel auto: {choice['parallel']} {choice['parallel_type']} batch-size: {choice['batch_size']}"
+                    f" (cpu: {choice['cpu_count']}, compounds: {choice['compounds']}, bytes: {choice['bytes']},"
+                    f" calibration: '{choice['calibration']['file']}' {choice['calibration']['bytes']} bytes"
+                    f" in {choice['calibration']['time']:.3f} s, serial estimate: {choice['serial_time']:.2f} s)"
+                )
+
+            args.parallel = choice['parallel']
+            args.parallel_type = choice['parallel_type']
+            args.batch_size = choice['batch_size']
+
+            cls.__logger.info(message)
+            if args.verbose:
+                cls.info_message(message)
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def info_message(cls, message: str) -> None:
+    def auto_parallel(
+        cls,
+        xml_file: str,
+        cpu_count: int | None = None,
+        seconds_per_byte: float | None = None,
+        selection: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Choose pool for converting 'index.xml' and its selected compounds. Conversion time is estimated from
+        total selected compound XML bytes and a calibration run on one median-sized compound. A pool is used only
+        if it saves at least a fifth of the estimate after 'AUTO_POOL_STARTUP' seconds, thread workers
+        only without GIL (they do not scale with it), otherwise process workers. Files cheaper than
+        'AUTO_TASK_TIME' seconds are batched, keeping at least four tasks per worker.
+
+        :param xml_file: 'index.xml' file path string.
+        :param cpu_count: usable CPUs, None: detect.
+        :param seconds_per_byte: conversion cost, None: calibrate.
+        :param selection: compounds filter, see 'compound_selection', None: all.
+
+        :return: 'parallel', 'parallel_type', 'batch_size' and the inputs of the decision:
+                 'cpu_count', 'compounds', 'bytes', 'calibration' ('file', 'bytes', 'time'), 'serial_time'.
+        """
         try:
-            with cls.__lock:
-                print(message)
+            if cpu_count is None:
+                if hasattr(os, 'sched_getaffinity'):
+                    cpu_count = len(os.sched_getaffinity(0))
+                else:
+                    cpu_count = os.cpu_count() or 1
+
+            xml_dir = Path(xml_file).parent
+            sizes = sorted(
+                (xml_dir.joinpath(refid + '.xml').stat().st_size, refid) for refid in cls.iter_index_refids(xml_file, selection=selection)
+            )
+            total_bytes = sum(size for size, _ in sizes)
+
+            calibration = {'file': None, 'bytes': 0, 'time': 0.0}
+            if seconds_per_byte is None:
+                seconds_per_byte = 0.0
+                if len(sizes) > 0:
+                    target = min(sizes[len(sizes) // 2][0], cls.AUTO_CALIBRATION_BYTES)
+                    size, refid = min(sizes, key=lambda item: abs(item[0] - target))
+                    calibration_file = str(xml_dir.joinpath(refid + '.xml'))
+
+                    # warm caches first, a real run builds them once too
+                    cls.init_worker()
+                    start = time.perf_counter()
+                    cls.json_dumps(cls.transform(calibration_file, xml_type='compound'), 4)
+                    calibration = {'file': calibration_file, 'bytes': size, 'time': time.perf_counter() - start}
+                    seconds_per_byte = calibration['time'] / max(size, 1)
+
+            serial_time = total_bytes * seconds_per_byte
+            workers = min(cpu_count, len(sizes))
+            parallel_type = 'thread' if not getattr(sys, '_is_gil_enabled', lambda: True)() else 'process'
+            parallel_time = serial_time / max(workers, 1) + cls.AUTO_POOL_STARTUP
+
+            if workers < 2 or parallel_time > serial_time * 0.8:
+                workers = 0
+                batch_size = 0
+            else:
+                batch_size = int(min(cls.AUTO_TASK_TIME / max(seconds_per_byte, 1e-12), total_bytes / (4 * workers)))
+
+            return {
+                'parallel': workers,
+                'parallel_type': parallel_type,
+                'batch_size': batch_size,
+                'cpu_count': cpu_count,
+                'compounds': len(sizes),
+                'bytes': total_bytes,
+                'calibration': calibration,
+                'serial_time': serial_time
+            }
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def check_xml_file(cls, xml_file: str) -> None:
-        try:
-            if xml_file is None:
-                raise Exception(f"'xml_file' is None!")
-
-            if len(xml_file) == 0:
-                raise Exception(f"'xml_file' is empty!")
+    def __batch_member_refs(
+        cls,
+        compound_xml_files: list[str],
+        member_refs: dict[str, list[str]] | None
+    ) -> dict[str, list[str]] | None:
+        """
+        :return: 'member_refs' entries of batch files only, so tasks do not carry the whole table.
+        """
+        if not member_refs:
+            return None
 
-            if not Path(xml_file).exists():
-                raise Exception(f"'xml_file' not exists!")
-        except Exception as e:
-            cls.__logger.error(e, exc_info=True)
-            raise e
+        result = {}
+        for compound_xml_file in compound_xml_files:
+            refid = Path(compound_xml_file).stem
+            if refid in member_refs:
+                result[refid] = member_refs[refid]
+        return result
 
     @classmethod
-    def check_output_dir(cls, output_dir: str) -> None:
+    def create_executor(
+        cls,
+        parallel: int,
+        parallel_type: str,
+        max_tasks: int = 0,
+        max_rss: int = 0
+    ) -> Executor | None:
+        """
+        Pool with warm workers, see 'init_worker'.
+
+        :param parallel: number of workers.
+        :param parallel_type: 'thread', 'process' or 'pipeline' (process workers).
+        :param max_tasks: replace process workers after one of them ran this many tasks, 0: never.
+        :param max_rss: replace process workers after one of them is above this resident memory in bytes, 0: never.
+
+        :return: executor, 'Xml2JsonWorkerPool' if 'max_tasks' or 'max_rss' is set, or None if 'parallel' is 0.
+        """
         try:
-            if output_dir is None:
-                raise Exception(f"'output_dir' is None!")
+            if parallel == 0:
+                return None
 
-            if len(output_dir) == 0:
-                raise Exception(f"'output_dir' is empty!")
+            if parallel_type == 'thread':
+                if max_tasks > 0 or max_rss > 0:
+                    raise Exception(f"'max_tasks' and 'max_rss' require process workers!")
+
+                from concurrent.futures import ThreadPoolExecutor
+
+                cls.init_worker()
+                return ThreadPoolExecutor(max_workers=parallel)
+
+            from concurrent.futures import ProcessPoolExecutor
+
+            json_backend = cls.json_backend()
+
+            def factory() -> Executor:
+                return ProcessPoolExecutor(max_workers=parallel, initializer=cls.init_worker, initargs=(json_backend,))
+
+            if max_tasks > 0 or max_rss > 0:
+                return Xml2JsonWorkerPool(factory, max_tasks, max_rss)
+
+            return factory()
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def check_parallel(cls, parallel: int) -> None:
-        try:
-            if parallel is None:
-                raise Exception(f"'parallel' is None!")
+    def worker_task(cls, fn: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> tuple[Any, dict[str, Any]]:
+        """
+        Run task in a 'Xml2JsonWorkerPool' worker.
 
-            if parallel < 0 or parallel > 1024:
-                raise Exception(f"'parallel' out of range 0-1024!")
+        :return: 'fn' result and 'worker_memory' after it.
+        """
+        try:
+            result = fn(*args, **kwargs)
+            with cls.__lock:
+                cls.__worker_tasks += 1
+            return result, cls.worker_memory()
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def transform_index(
-        cls,
-        xml_file: str,
-        silence: bool = False,
-        warnings: bool = False
-    ) -> list[dict[str, Any]]:
+    def worker_memory(cls) -> dict[str, Any]:
+        """
+        Memory of current process (all threads).
+
+        :return: 'pid', 'rss' current and 'peak_rss' resident memory in bytes (None if unknown on this platform),
+                 'tasks' run by 'worker_task'.
+        """
         try:
-            cls.check_xml_file(xml_file)
+            rss = None
+            peak_rss = None
 
-            root_xml = doxmlparser.index.parse(xml_file, silence=silence, print_warnings=warnings)
+            try:
+                with open('/proc/self/statm', 'rb') as statm:
+                    rss = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+            except (OSError, ValueError, AttributeError):
+                pass
 
-            root_result = cls.index_enum_dicts()
-            root_result.append(cls.to_dict(root_xml))
+            try:
+                import resource
 
-            return root_result
+                # 'ru_maxrss' is KiB on Linux, bytes on macOS
+                peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                if sys.platform != 'darwin':
+                    peak_rss *= 1024
+            except ImportError:
+                pass
+
+            if rss is not None and peak_rss is not None:
+                peak_rss = max(peak_rss, rss)
+
+            return {'pid': os.getpid(), 'rss': rss, 'peak_rss': peak_rss, 'tasks': cls.__worker_tasks}
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def transform_compound(
-        cls,
-        xml_file: str,
-        silence: bool = False,
-        warnings: bool = False
-    ) -> list[dict[str, Any]]:
+    def daemon(cls, args: Namespace) -> int:
+        """
+        Keep one warm pool and the conversion caches for many conversions, see 'watch' and 'serve'.
+        """
         try:
-            cls.check_xml_file(xml_file)
+            if args.watch and args.serve is not None:
+                raise Exception(f"'--watch' and '--serve' are exclusive!")
 
-            root_xml = doxmlparser.compound.parse(xml_file, silence=silence, print_warnings=warnings)
+            if args.watch and args.shard is not None:
+                raise Exception(f"'--shard' is not supported with '--watch'!")
 
-            root_result = cls.compound_enum_dicts()
-            root_result.append(cls.to_dict(root_xml))
+            if args.watch and args.dedup_members:
+                raise Exception(f"'--dedup-members' is not supported with '--watch'!")
 
-            return root_result
+            json_backend = cls.set_json_backend(args.json_backend)
+            if args.verbose:
+                cls.info_message(f"json backend: '{json_backend}', encoder: '{cls.json_encoder(args.indent)}'")
+
+            cls.resolve_parallel(args)
+            cls.check_worker_limits(args)
+            executor = cls.create_executor(
+                parallel=args.parallel,
+                parallel_type=args.parallel_type,
+                max_tasks=args.max_worker_tasks,
+                max_rss=args.max_worker_rss * 1024 * 1024
+            )
+            if executor is None:
+                cls.init_worker()
+
+            try:
+                if args.watch:
+                    cls.watch(args, executor)
+                else:
+                    cls.serve(args, executor)
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+
+            return 0
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def index_enum_dicts(cls) -> list[dict[str, Any]]:
+    def watch(cls, args: Namespace, executor: Executor | None = None, stop: threading.Event | None = None) -> None:
+        """
+        Convert all, then poll 'args.xml_file' directory every 'args.watch_interval' seconds
+        and reconvert compounds whose XML content changed. Changes are processed once
+        two polls see the same file sizes and mtimes, so files still being written are not read.
+        A new 'index.xml' is reconverted and JSON files of compounds no longer listed are removed.
+        With '--xml-type index' or 'compound' only 'args.xml_file' is watched and reconverted as that type.
+
+        :param args: parsed command line arguments, see 'argument_parser'.
+        :param executor: warm pool, must match 'args.parallel_type'.
+        :param stop: stop polling when set, None: poll until interrupted.
+        """
         try:
-            result = []
-
-            members = inspect.getmembers(doxmlparser.index, predicate=inspect.isclass)
-            for name, type_obj in members:
-                type_obj: type = type_obj
-                if type_obj.__module__ == 'doxmlparser.index' and issubclass(type_obj, Enum):
-                    result_child_list = []
-                    for entry in type_obj:
-                        result_child_list.append(entry.value)
-                    result_child = {type_obj.__name__: result_child_list}
-                    result.append(result_child)
-
-            return result
+            if args.output_format != 'files':
+                raise Exception(f"'--watch' supports only '--output-format files'!")
+
+            if stop is None:
+                stop = threading.Event()
+
+            xml_dir = Path(args.xml_file).parent
+            index_name = Path(args.xml_file).name
+
+            processed = cls.__watch_snapshot(xml_dir)
+            hashes = {name: cls.file_hash(str(xml_dir.joinpath(name))) for name in processed}
+            cls.run(args, executor)
+            single = args.xml_type != 'all'
+            refids = set() if single else set(cls.iter_index_refids(args.xml_file, selection=args.selection))
+            seen = processed
+
+            while not stop.wait(args.watch_interval):
+                try:
+                    current = cls.__watch_snapshot(xml_dir)
+                    if current == processed:
+                        continue
+                    if current != seen:
+                        seen = current
+                        continue
+
+                    changed = []
+                    for name, state in current.items():
+                        if processed.get(name) != state:
+                            file_hash = cls.file_hash(str(xml_dir.joinpath(name)))
+                            if hashes.get(name) != file_hash:
+                                hashes[name] = file_hash
+                                changed.append(name)
+                    for name in set(processed) - set(current):
+                        hashes.pop(name, None)
+                    processed = current
+
+                    if len(changed) == 0:
+                        continue
+
+                    start = time.perf_counter()
+
+                    if single:
+                        if index_name in changed:
+                            cls.run(args, executor)
+                        cls.__logger.debug(f"watch: {len(changed)} changed, {time.perf_counter() - start:.3f} seconds")
+                        continue
+
+                    if index_name in changed:
+                        if args.verbose:
+                            cls.info_message(f"process: '{args.xml_file}'")
+                        cls.execute_in_parallel(
+                            args.xml_file,
+                            args.silence,
+                            args.warnings,
+                            args.output_dir,
+                            args.indent,
+                            args.engine,
+                            True,
+                            args.buffer_size,
+                            False,
+                            'index',
+                            args.selection
+                        )
+                        previous_refids = refids
+                        refids = set(cls.iter_index_refids(args.xml_file, selection=args.selection))
+                        if args.refid_index:
+                            cls.write_refid_index(args.output_dir, cls.refid_map(args.xml_file, args.selection))
+                        for refid in sorted(previous_refids - refids):
+                            json_file = Path(args.output_dir).joinpath(refid + '.json')
+                            if json_file.exists():
+                                if args.verbose:
+                                    cls.info_message(f"remove: '{json_file}'")
+                                json_file.unlink()
+
+                    compound_xml_files = [
+                        str(xml_dir.joinpath(name)) for name in sorted(changed) if Path(name).stem in refids
+                    ]
+                    cls.__convert_compounds(args, compound_xml_files, executor)
+
+                    cls.__logger.debug(
+                        f"watch: {len(changed)} changed, {len(compound_xml_files)} compounds, {time.perf_counter() - start:.3f} seconds"
+                    )
+                except Exception as e:
+                    cls.__logger.error(e, exc_info=True)
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
     @classmethod
-    def compound_enum_dicts(cls) -> list[dict[str, Any]]:
-        try:
+    def __watch_snapshot(cls, xml_dir: Path) -> dict[str, tuple[int, int]]:
+        result = {}
+        for entry in os.scandir(xml_dir):
+            if entry.name.endswith('.xml') and entry.is_file():
+                stat = entry.stat()
+                result[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+    @classmethod
+    def serve(cls, args: Namespace, executor: Executor | None = None) -> None:
+        """
+        Answer conversion requests until 'shutdown' request or end of input, see 'serve_stream'.
+        'args.serve': '-' stdin/stdout (diagnostic output goes to stderr), 'HOST:PORT' TCP connections handled one at a time,
+        requests are not authenticated, so 'HOST' must resolve to loopback addresses only.
+        """
+        try:
+            if args.serve == '-':
+                output_stream = sys.stdout
+                with redirect_stdout(sys.stderr):
+                    cls.serve_stream(args, executor, sys.stdin, output_stream)
+                return
+
+            import ipaddress
+            import socket
+
+            host, port = args.serve.rsplit(':', 1)
+            host = host.strip('[]')
+            addresses = {info[4][0] for info in socket.getaddrinfo(host or None, int(port), type=socket.SOCK_STREAM)}
+            if len(host) == 0 or not all(ipaddress.ip_address(address.split('%', 1)[0]).is_loopback for address in addresses):
+                raise Exception(f"'--serve' host '{host}' is not loopback!")
+
+            with socket.create_server((host, int(port)), family=socket.AF_INET6 if ':' in host else socket.AF_INET) as server:
+                if args.verbose:
+                    cls.info_message(f"serve: '{host}:{server.getsockname()[1]}'")
+                while True:
+                    connection, _ = server.accept()
+                    with connection:
+                        with connection.makefile('r', encoding='utf-8') as input_stream:
+                            with connection.makefile('w', encoding='utf-8') as output_stream:
+                                if cls.serve_stream(args, executor, input_stream, output_stream):
+                                    return
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def serve_stream(cls, args: Namespace, executor: Executor | None, input_stream: TextIO, output_stream: TextIO) -> bool:
+        """
+        Answer one JSON request per input line with one JSON response line.
+        Request: '{"arguments": [...]}' command line arguments without program name, see 'argument_parser' 'request',
+        pool options ('--parallel', '--parallel-type') of the daemon are used, '--select-from -' is rejected.
+        Response: '{"exit_code": 0, "time": SECONDS}' or '{"exit_code": 1, "error": MESSAGE}'.
+        Request '{"command": "shutdown"}' stops the daemon.
+
+        :return: True if 'shutdown' was requested.
+        """
+        try:
+            for line in input_stream:
+                if len(line.strip()) == 0:
+                    continue
+
+                start = time.perf_counter()
+                shutdown = False
+                try:
+                    request = json.loads(line)
+                    if request.get('command') == 'shutdown':
+                        shutdown = True
+                        response = {'exit_code': 0}
+                    else:
+                        request_args = cls.argument_parser(request=True).parse_args(request['arguments'])
+                        if request_args.select_from == '-':
+                            raise Exception(f"'--select-from -' is not supported in requests!")
+                        if request_args.output_dir == '<default>' and request_args.xml_file is not None:
+                            request_args.output_dir = str(Path(request_args.xml_file).parent.parent.joinpath('json'))
+                        request_args.parallel = args.parallel
+                        request_args.parallel_type = args.parallel_type
+                        if request_args.xml_file is None:
+                            raise Exception(f"'--xml-file' is None!")
+                        response = {'exit_code': cls.run(request_args, executor), 'time': time.perf_counter() - start}
+                except (Exception, SystemExit) as e:
+                    cls.__logger.error(e, exc_info=True)
+                    response = {'exit_code': 1, 'error': f"{type(e).__name__}: {e}"}
+
+                output_stream.write(cls.json_dumps(response, None, False) + '\n')
+                output_stream.flush()
+
+                if shutdown:
+                    return True
+
+            return False
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def schedule(
+        cls,
+        executor: Executor,
+        fn: Callable[..., Any],
+        tasks: Iterable[tuple],
+        max_pending: int,
+        verbose: bool = False,
+        lane: Callable[[tuple], bool] | None = None,
+        lane_pending: int = 1
+    ) -> Iterator[Any]:
+        """
+        Submit tasks to executor keeping at most 'max_pending' futures in flight
+        and yield results in completion order. Blocks on completion (no polling).
+        Tasks matching 'lane' (large files) wait until fewer than 'lane_pending' of them are in flight,
+        other tasks are submitted meanwhile, up to 'max_pending' tasks wait.
+
+        :param executor: executor.
+        :param fn: function to call with each task tuple as arguments.
+        :param tasks: task argument tuples, first element (string or list of strings) is printed in verbose mode.
+        :param max_pending: max number of submitted but not yet consumed futures.
+        :param verbose: print task before submit.
+        :param lane: predicate of tasks with limited concurrency, None: no lane.
+        :param lane_pending: max number of 'lane' tasks in flight.
+
+        :return: iterator of 'fn' results.
+
+        :raise Exception: first task error, outstanding futures are cancelled.
+        """
+        try:
+            from collections import deque
+            from concurrent.futures import wait
+            from concurrent.futures import FIRST_COMPLETED
+
+            if max_pending < 1:
+                raise Exception(f"'max_pending' less than 1!")
+
+            if lane_pending < 1:
+                raise Exception(f"'lane_pending' less than 1!")
+
+            pending: set[Future] = set()
+            lane_futures: set[Future] = set()
+            lane_tasks: deque[tuple] = deque()
+            tasks = iter(tasks)
+            exhausted = False
+            try:
+                while True:
+                    if len(lane_tasks) > 0 and len(lane_futures) < lane_pending and len(pending) < max_pending:
+                        task = lane_tasks.popleft()
+                        in_lane = True
+                    elif not exhausted and len(pending) < max_pending and len(lane_tasks) < max_pending:
+                        task = next(tasks, None)
+                        if task is None:
+                            exhausted = True
+                            continue
+                        in_lane = False
+                        if lane is not None and lane(task):
+                            lane_tasks.append(task)
+                            continue
+                    elif len(pending) > 0:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        lane_futures.difference_update(done)
+                        for future in done:
+                            yield future.result()
+                        continue
+                    else:
+                        break
+
+                    if verbose:
+                        for name in task[0] if isinstance(task[0], list) else [task[0]]:
+                            cls.info_message(f"process: '{name}'")
+
+                    future = executor.submit(fn, *task)
+                    pending.add(future)
+                    if in_lane:
+                        lane_futures.add(future)
+            finally:
+                for future in pending:
+                    future.cancel()
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def file_cost(cls, file: str) -> int:
+        """
+        Default cost model: file size in bytes.
+        """
+        try:
+            return Path(file).stat().st_size
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def plan_batches(
+        cls,
+        xml_files: list[str],
+        cost: Callable[[str], int] | None = None,
+        batch_cost: int = 0,
+        largest_first: bool = True
+    ) -> list[list[str]]:
+        """
+        Order files by descending cost and group consecutive cheap files into batches.
+
+        :param xml_files: XML file path strings.
+        :param cost: cost model, called once per file, default: 'file_cost'.
+        :param batch_cost: files cheaper than this are grouped until the batch total reaches it, 0: no batches.
+        :param largest_first: order by descending cost, otherwise keep 'xml_files' order.
+
+        :return: list of batches, every file exactly once.
+        """
+        try:
+            if cost is None:
+                cost = cls.file_cost
+
+            if not largest_first:
+                return list(cls.iter_batches(xml_files, cost, batch_cost))
+
+            costs = {xml_file: cost(xml_file) for xml_file in xml_files}
+            ordered = sorted(xml_files, key=lambda xml_file: costs[xml_file], reverse=True)
+
+            return list(cls.iter_batches(ordered, costs.__getitem__, batch_cost))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def iter_batches(
+        cls,
+        xml_files: Iterable[str],
+        cost: Callable[[str], int] | None = None,
+        batch_cost: int = 0
+    ) -> Iterator[list[str]]:
+        """
+        Group consecutive cheap files into batches in 'xml_files' order,
+        each batch is yielded as soon as it is complete, 'xml_files' may be lazy.
+
+        :param xml_files: XML file path strings.
+        :param cost: cost model, called once per file, default: 'file_cost'.
+        :param batch_cost: files cheaper than this are grouped until the batch total reaches it, 0: no batches.
+
+        :return: iterator of batches, every file exactly once.
+        """
+        try:
+            if cost is None:
+                cost = cls.file_cost
+
+            batch: list[str] = []
+            batch_total = 0
+
+            for xml_file in xml_files:
+                xml_file_cost = cost(xml_file)
+
+                if xml_file_cost >= batch_cost:
+                    yield [xml_file]
+                    continue
+
+                batch.append(xml_file)
+                batch_total += xml_file_cost
+
+                if batch_total >= batch_cost:
+                    yield batch
+                    batch = []
+                    batch_total = 0
+
+            if len(batch) > 0:
+                yield batch
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def execute_batch(
+        cls,
+        compound_xml_files: list[str],
+        silence: bool,
+        warnings: bool,
+        output_dir: str,
+        indent: int,
+        engine: str = 'object',
+        enums: bool = True,
+        buffer_size: int = BUFFER_SIZE,
+        stats: bool = False,
+        member_refs: dict[str, list[str]] | None = None
+    ) -> dict[str, Any]:
+        """
+        Convert chunk of compound XML files, stops at first error.
+        'member_refs': memberdef ids written as references by compound refid, see 'foreign_members'.
+
+        :return: compact result: 'files' converted, 'bytes' of XML read, 'time' seconds, 'errors' messages,
+                 'records' per-file stats records if 'stats'.
+        """
+        try:
+            result = {'files': 0, 'bytes': 0, 'time': 0.0, 'errors': [], 'records': []}
+            start = time.perf_counter()
+
+            for compound_xml_file in compound_xml_files:
+                try:
+                    record = cls.execute_in_parallel(
+                        compound_xml_file,
+                        silence,
+                        warnings,
+                        output_dir,
+                        indent,
+                        engine,
+                        enums,
+                        buffer_size,
+                        stats,
+                        member_refs=member_refs.get(Path(compound_xml_file).stem) if member_refs else None
+                    )
+                except Exception as e:
+                    result['errors'].append(f"'{compound_xml_file}': {type(e).__name__}: {e}")
+                    break
+                if stats:
+                    result['records'].append(record)
+                result['files'] += 1
+                result['bytes'] += Path(compound_xml_file).stat().st_size
+
+            result['time'] = time.perf_counter() - start
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def execute_pipeline(
+        cls,
+        executor: Executor,
+        compound_xml_files: Iterable[str],
+        silence: bool,
+        warnings: bool,
+        output_dir: str,
+        indent: int,
+        enums: bool = True,
+        buffer_size: int = BUFFER_SIZE,
+        max_pending: int = 2,
+        stats: bool = False,
+        verbose: bool = False,
+        member_refs: dict[str, list[str]] | None = None,
+        lane: Callable[[tuple], bool] | None = None,
+        lane_pending: int = 1
+    ) -> dict[str, Any]:
+        """
+        Convert compound XML files in three overlapping stages: a reader thread prefetches XML bytes,
+        'executor' parses, converts and serializes them ('convert_xml_bytes'), a writer thread writes JSON files.
+        Stages are connected by queues of 'max_pending' entries and at most 'max_pending' conversions
+        are in flight, so memory is bounded by file sizes, not by the number of files.
+        'compound_xml_files' may be lazy, it is consumed by the reader thread.
+        'lane' and 'lane_pending' limit conversions of large files, see 'schedule'.
+
+        :return: compact result, see 'execute_batch'.
+
+        :raise Exception: first stage error, remaining stages are stopped.
+        """
+        try:
+            import queue
+
+            result = {'files': 0, 'bytes': 0, 'time': 0.0, 'errors': [], 'records': []}
+            stop = threading.Event()
+            read_queue: queue.Queue = queue.Queue(maxsize=max_pending)
+            write_queue: queue.Queue = queue.Queue(maxsize=max_pending)
+            stage_errors: list[Exception] = []
+
+            def put(q: queue.Queue, item: Any) -> bool:
+                while not stop.is_set():
+                    try:
+                        q.put(item, timeout=0.1)
+                        return True
+                    except queue.Full:
+                        pass
+                return False
+
+            def read() -> None:
+                try:
+                    for compound_xml_file in compound_xml_files:
+                        start = time.perf_counter()
+                        xml_bytes = Path(compound_xml_file).read_bytes()
+                        if not put(read_queue, (compound_xml_file, xml_bytes, time.perf_counter() - start)):
+                            return
+                except Exception as e:
+                    stage_errors.append(e)
+                finally:
+                    put(read_queue, None)
+
+            def write() -> None:
+                while True:
+                    item = write_queue.get()
+                    if item is None:
+                        return
+                    if len(stage_errors) > 0:
+                        continue
+                    try:
+                        start = time.perf_counter()
+                        json_file = Path(output_dir).joinpath(Path(item['file']).stem + '.json')
+                        with cls.open_atomic(str(json_file), buffer_size) as output:
+                            output.write(item['json'])
+                        result['files'] += 1
+                        result['bytes'] += item['bytes']
+                        result['time'] += item['time'] + time.perf_counter() - start
+                        if item['record'] is not None:
+                            item['record']['write'] += time.perf_counter() - start
+                            item['record']['time'] += item['record']['write']
+                            item['record']['bytes_out'] = len(item['json'].encode('utf-8'))
+                            result['records'].append(item['record'])
+                    except Exception as e:
+                        stage_errors.append(e)
+                        stop.set()
+
+            def tasks() -> Iterator[tuple]:
+                while not stop.is_set():
+                    try:
+                        item = read_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is None:
+                        return
+                    compound_xml_file, xml_bytes, read_time = item
+                    file_member_refs = member_refs.get(Path(compound_xml_file).stem) if member_refs else None
+                    yield compound_xml_file, xml_bytes, silence, warnings, indent, enums, stats, read_time, file_member_refs
+
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            reader = threading.Thread(target=read, name='xml2json-reader', daemon=True)
+            writer = threading.Thread(target=write, name='xml2json-writer', daemon=True)
+            reader.start()
+            writer.start()
+            try:
+                for item in cls.schedule(executor, cls.convert_xml_bytes, tasks(), max_pending, verbose, lane, lane_pending):
+                    if len(stage_errors) > 0:
+                        break
+                    write_queue.put(item)
+            finally:
+                stop.set()
+                write_queue.put(None)
+                reader.join()
+                writer.join()
+
+            if len(stage_errors) > 0:
+                raise stage_errors[0]
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def convert_xml_bytes(
+        cls,
+        compound_xml_file: str,
+        xml_bytes: bytes,
+        silence: bool,
+        warnings: bool,
+        indent: int,
+        enums: bool = True,
+        stats: bool = False,
+        read_time: float = 0.0,
+        member_refs: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Pipeline conversion stage: parse compound XML bytes, convert and serialize.
+        'member_refs': memberdef ids written as references, see 'foreign_members'.
+
+        :return: 'file', 'bytes' of XML, 'json' text, 'time' seconds, 'record' stats record without write phase if 'stats'.
+        """
+        try:
+            start = time.perf_counter()
+            record = None
+            if stats:
+                record = {'file': Path(compound_xml_file).name, 'bytes_in': len(xml_bytes), 'bytes_out': 0, 'nodes': 0}
+                for phase in cls.STATS_PHASES:
+                    record[phase] = 0.0
+                record['read'] = read_time
+
+            phase_start = start
+            root_xml = cls.parse_compound(io.BytesIO(xml_bytes), silence, warnings, member_refs)
+            phase_start = cls.stats_phase(record, 'parse', phase_start)
+
+            compound_result = cls.compound_enum_dicts() if enums else []
+            compound_result.append(cls.member_ref_dicts(cls.to_dict(root_xml), member_refs))
+            phase_start = cls.stats_phase(record, 'convert', phase_start)
+
+            json_text = cls.json_dumps(compound_result, indent)
+            cls.stats_phase(record, 'serialize', phase_start)
+
+            if record is not None:
+                record['nodes'] = cls.count_nodes(compound_result[-1])
+                record['time'] = read_time + time.perf_counter() - start
+                memory = cls.worker_memory()
+                record['pid'] = memory['pid']
+                record['peak_rss'] = memory['peak_rss']
+
+            return {
+                'file': compound_xml_file,
+                'bytes': len(xml_bytes),
+                'json': json_text,
+                'time': time.perf_counter() - start,
+                'record': record
+            }
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def init_worker(cls, json_backend: str | None = None) -> None:
+        """
+        Pool initializer, builds enum tables and conversion plans of all doxmlparser types once per worker.
+
+        :param json_backend: JSON encoder of the parent, see 'set_json_backend', None: keep current.
+        """
+        try:
+            if json_backend is not None:
+                cls.set_json_backend(json_backend)
+
+            cls.index_enum_dicts()
+            cls.compound_enum_dicts()
+
+            for module in [cls.doxmlparser_module('index'), cls.doxmlparser_module('compound')]:
+                for name in module.__all__:
+                    obj_type = getattr(module, name)
+                    if (
+                            isinstance(obj_type, type)
+                            and not issubclass(obj_type, Enum)
+                            and cls.__to_dict_is_doxmlparser_type(obj_type)
+                    ):
+                        cls.__to_dict_plan(obj_type)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def execute_in_parallel(
+        cls,
+        compound_xml_file: str,
+        silence: bool,
+        warnings: bool,
+        output_dir: str,
+        indent: int,
+        engine: str = 'object',
+        enums: bool = True,
+        buffer_size: int = BUFFER_SIZE,
+        stats: bool = False,
+        xml_type: str = 'compound',
+        selection: dict[str, Any] | None = None,
+        member_refs: list[str] | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Convert one compound (or 'xml_type' index) XML file.
+        Index compounds are filtered by 'selection', see 'compound_selection'.
+        Memberdefs listed in 'member_refs' are written as references, see 'foreign_members'.
+
+        :return: stats record if 'stats', see 'stats_record', otherwise None.
+        """
+        try:
+            json_file = Path(output_dir).joinpath(Path(Path(compound_xml_file).name).stem + '.json')
+            record = cls.stats_record(compound_xml_file) if stats else None
+
+            if engine == 'stream':
+                cls.transform_stream(
+                    xml_file=compound_xml_file,
+                    json_file=str(json_file),
+                    indent=indent,
+                    warnings=warnings,
+                    xml_type=xml_type,
+                    enums=enums,
+                    buffer_size=buffer_size,
+                    stats=record,
+                    selection=selection,
+                    member_refs=member_refs
+                )
+            else:
+                compound_result = cls.transform(
+                    xml_file=compound_xml_file,
+                    silence=silence,
+                    warnings=warnings,
+                    xml_type=xml_type,
+                    enums=enums,
+                    stats=record,
+                    selection=selection,
+                    member_refs=member_refs
+                )
+                cls.write_json(str(json_file), compound_result, indent, buffer_size, record)
+
+            if record is None:
+                return None
+
+            return cls.stats_record_done(record, str(json_file))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def transform(
+        cls,
+        xml_file: str,
+        silence: bool = True,
+        warnings: bool = True,
+        xml_type: str = None,
+        enums: bool = True,
+        stats: dict[str, Any] | None = None,
+        selection: dict[str, Any] | None = None,
+        lean: bool = False,
+        member_refs: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Main method.
+
+        :param xml_file: XML file path string.
+        :param silence: silence.
+        :param warnings: print warnings.
+        :param xml_type: XML file type string.
+        :param enums: prepend enum tables to result.
+        :param stats: stats record to add phase times and node count to, see 'stats_record'.
+        :param selection: index compounds filter, see 'compound_selection', None: all.
+        :param lean: memory-lean read-only result for keeping many results in memory, see 'lean',
+                     enum tables are one object shared by all lean results.
+        :param member_refs: compound memberdef ids to write as '{'refid': ID}' without converting them,
+                            see 'foreign_members'.
+
+        :return: index JSON file path string.
+
+        :raise Exception: on error.
+        """
+        try:
+            xml_type = cls.resolve_xml_type(xml_file, xml_type)
+
+            if xml_type == 'index':
+                result = cls.transform_index(xml_file, silence, warnings, enums and not lean, stats, selection)
+            elif xml_type == 'compound':
+                result = cls.transform_compound(xml_file, silence, warnings, enums and not lean, stats, member_refs)
+            else:
+                raise Exception(f"Unsupported 'xml_type': '{xml_type}'!")
+
+            if lean:
+                result = (cls.__lean_enum_dicts(xml_type) if enums else []) + cls.lean(result)
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def iter_transform(
+        cls,
+        xml_file: str,
+        parallel: int = 0,
+        parallel_type: str = 'thread',
+        executor: Executor | None = None,
+        max_pending: int | None = None,
+        silence: bool = True,
+        warnings: bool = True,
+        enums: bool = True,
+        selection: dict[str, Any] | None = None,
+        index: bool = True,
+        lean: bool = False
+    ) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """
+        Convert 'index.xml' and its compounds in memory, nothing is written to disk.
+        Compounds are submitted in index order while 'index.xml' is read, results are yielded
+        in completion order and at most 'max_pending' are converted ahead of the consumer.
+        Closing the iterator cancels outstanding conversions.
+
+        :param xml_file: 'index.xml' file path string.
+        :param parallel: workers of a new pool or of 'executor', 0 without 'executor': serial in the calling thread.
+        :param parallel_type: 'thread' or 'process' of a new pool, 'pipeline' is 'process' as there is no file IO to overlap.
+        :param executor: warm pool to use instead of a new one, see 'create_executor'.
+        :param max_pending: max number of results converted but not yet consumed, default: 2 * parallel.
+        :param silence: silence.
+        :param warnings: print warnings.
+        :param enums: prepend enum tables to every result, added by the consumer, not sent by workers.
+        :param selection: compounds filter, see 'compound_selection', None: all.
+        :param index: yield 'index.xml' result too.
+        :param lean: memory-lean results, see 'transform'.
+
+        :return: iterator of '(refid, result)', 'index.xml' as '(file stem, result)', see 'transform'.
+        """
+        try:
+            cls.check_xml_file(xml_file)
+            cls.check_parallel(parallel)
+
+            xml_dir = Path(xml_file).parent
+            index_name = Path(xml_file).stem
+            tasks = (
+                (str(xml_dir.joinpath(refid + '.xml')), silence, warnings, 'compound', None, lean)
+                for refid in cls.iter_index_refids(xml_file, None, selection)
+            )
+            if index:
+                tasks = itertools.chain([(xml_file, silence, warnings, 'index', selection, lean)], tasks)
+
+            if executor is None and parallel == 0:
+                for task in tasks:
+                    yield Path(task[0]).stem, cls.transform(task[0], silence, warnings, task[3], enums, None, task[4], lean)
+                return
+
+            own_executor = None
+            if executor is None:
+                executor = own_executor = cls.create_executor(parallel, parallel_type)
+
+            try:
+                if max_pending is None:
+                    max_pending = 2 * max(parallel, 1)
+
+                for name, result in cls.schedule(executor, cls.transform_task, tasks, max_pending):
+                    if enums:
+                        xml_type = 'index' if name == index_name else 'compound'
+                        if lean:
+                            result = cls.__lean_enum_dicts(xml_type) + result
+                        elif xml_type == 'index':
+                            result = cls.index_enum_dicts() + result
+                        else:
+                            result = cls.compound_enum_dicts() + result
+                    yield name, result
+            finally:
+                if own_executor is not None:
+                    own_executor.shutdown(wait=True, cancel_futures=True)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def transform_task(
+        cls,
+        xml_file: str,
+        silence: bool,
+        warnings: bool,
+        xml_type: str,
+        selection: dict[str, Any] | None = None,
+        lean: bool = False
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """
+        'iter_transform' worker task, result without enum tables.
+
+        :return: '(file stem, result)', see 'transform'.
+        """
+        try:
+            return Path(xml_file).stem, cls.transform(xml_file, silence, warnings, xml_type, False, None, selection, lean)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def lean(cls, value: Any) -> Any:
+        """
+        Memory-lean copy of converted result, equal to 'value' but must not be modified:
+        strings up to 'LEAN_STRING_SIZE' characters are interned (one object per process),
+        longer strings, integers and equal dicts and lists ('location', 'type', 'ref' ...) are one object per call.
+
+        :param value: JSON value, see 'transform'.
+        """
+        try:
+            return cls.__lean(value, {})[0]
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __lean(cls, value: Any, shared: dict[Any, Any]) -> tuple[Any, Any]:
+        """
+        :return: shared value and its key in parent keys, None: not shared, containers with
+                 values other than str, int, None, dict or list are copied but not shared.
+        """
+        value_type = type(value)
+
+        if value_type is str:
+            if len(value) <= cls.LEAN_STRING_SIZE:
+                value = sys.intern(value)
+            else:
+                value = shared.setdefault(value, value)
+            return value, value
+
+        if value_type is int:
+            value = shared.setdefault(value, value)
+            return value, value
+
+        if value is None:
+            return None, ()
+
+        if value_type is dict:
+            result = {}
+            key = ['d']
+            for k, v in value.items():
+                result[k], v_key = cls.__lean(v, shared)
+                key.append(k)
+                key.append(v_key)
+        elif value_type is list:
+            result = []
+            key = ['l']
+            for v in value:
+                v, v_key = cls.__lean(v, shared)
+                result.append(v)
+                key.append(v_key)
+        else:
+            return value, None
+
+        if None in key:
+            return result, None
+
+        # parent keys refer to a shared container by its marker object, not by its whole key
+        key = tuple(key)
+        entry = shared.get(key)
+        if entry is None:
+            entry = shared[key] = (result, object())
+        return entry
+
+    @classmethod
+    def json_dump_kwargs(cls, indent: int | None) -> dict[str, Any]:
+        """
+        'json.dump' arguments for indent, negative indent: compact, no whitespace.
+        """
+        if indent is not None and indent < 0:
+            return {'indent': None, 'separators': (',', ':')}
+        return {'indent': indent}
+
+    @classmethod
+    def json_dumps(cls, value: Any, indent: int | None = 4, fast: bool = True) -> str:
+        """
+        Encode 'value' with active backend, see 'set_json_backend',
+        text is always the same as 'json.dumps(value, **json_dump_kwargs(indent))'.
+
+        :param value: JSON value.
+        :param indent: JSON indent, negative: compact.
+        :param fast: False for values with floats, 'orjson' formats them differently.
+        """
+        try:
+            result = cls.__orjson_dumps(value, indent) if fast else None
+            if result is None:
+                result = json.dumps(value, **cls.json_dump_kwargs(indent))
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __orjson_dumps(cls, value: Any, indent: int | None) -> str | None:
+        """
+        :return: 'orjson' text if it is the same as 'json' text, None: use 'json'.
+        """
+        if cls.json_encoder(indent) != 'orjson':
+            return None
+
+        orjson = cls.__orjson
+        # subclasses, dataclasses and datetimes go to missing 'default' and fall back
+        option = orjson.OPT_PASSTHROUGH_SUBCLASS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent >= 0:
+            option |= orjson.OPT_INDENT_2
+
+        try:
+            result = orjson.dumps(value, option=option)
+        except TypeError:
+            # non-string keys, integers over 64 bits, unsupported types
+            return None
+
+        # 'json' escapes non-ASCII and DEL characters
+        if not result.isascii() or b'\x7f' in result:
+            return None
+
+        return result.decode('ascii')
+
+    @classmethod
+    @contextmanager
+    def open_atomic(cls, file: str, buffer_size: int = BUFFER_SIZE, compression: str = 'none') -> Iterator[TextIO]:
+        """
+        Open buffered temporary file next to 'file', rename it to 'file' on success, remove it on error,
+        so partially written files never appear under the final name.
+        Newlines are always written as LF, so text sizes and offsets do not depend on the platform.
+        Compression: 'none', 'gzip' (reproducible, no name or mtime in header) or 'lzma'.
+        """
+        tmp_file = None
+        try:
+            Path(file).parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = Path(file).with_name(f".{Path(file).name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+            if compression == 'none':
+                with open(tmp_file, 'w', buffering=buffer_size, encoding='utf-8', newline='\n') as output:
+                    yield output
+            elif compression == 'gzip':
+                import gzip
+
+                with open(tmp_file, 'wb', buffering=buffer_size) as raw:
+                    with gzip.GzipFile(filename='', mode='wb', fileobj=raw, mtime=0) as compressed:
+                        with io.TextIOWrapper(compressed, encoding='utf-8', newline='\n') as output:
+                            yield output
+            elif compression == 'lzma':
+                import lzma
+
+                with open(tmp_file, 'wb', buffering=buffer_size) as raw:
+                    with lzma.LZMAFile(raw, mode='wb') as compressed:
+                        with io.TextIOWrapper(compressed, encoding='utf-8', newline='\n') as output:
+                            yield output
+            else:
+                raise Exception(f"Unsupported 'compression': '{compression}'! Supported: {list(cls.COMPRESSION_SUFFIXES)}")
+
+            os.replace(tmp_file, file)
+            tmp_file = None
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+        finally:
+            if tmp_file is not None and Path(tmp_file).exists():
+                Path(tmp_file).unlink()
+
+    @classmethod
+    def write_ndjson(
+        cls,
+        ndjson_file: str,
+        json_dir: str,
+        names: list[str],
+        compression: str = 'none',
+        buffer_size: int = BUFFER_SIZE
+    ) -> dict[str, list[int]]:
+        """
+        Combine compact JSON files into one newline-delimited stream,
+        one '{"name": NAME, "data": JSON}' record per line in 'names' order.
+
+        :param ndjson_file: output file path string.
+        :param json_dir: directory with compact 'NAME.json' files.
+        :param names: JSON file stems.
+        :param compression: 'none', 'gzip' or 'lzma'.
+        :param buffer_size: output file buffer bytes.
+
+        :return: '[offset, length]' of each record line in uncompressed bytes by name.
+        """
+        try:
+            result = {}
+            offset = 0
+
+            with cls.open_atomic(ndjson_file, buffer_size, compression) as output:
+                for name in names:
+                    json_file = Path(json_dir).joinpath(name + '.json')
+                    prefix = '{"name":' + cls.json_dumps(name, -1) + ',"data":'
+                    length = 0
+                    with open(json_file, 'r', encoding='utf-8', newline='') as json_input:
+                        chunks = iter(lambda: json_input.read(buffer_size), '')
+                        for text in itertools.chain([prefix], chunks, ['}\n']):
+                            output.write(text)
+                            length += len(text.encode('utf-8'))
+
+                    result[name] = [offset, length]
+                    offset += length
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def refid_map(cls, xml_file: str, selection: dict[str, Any] | None = None) -> dict[str, list[str]]:
+        """
+        Compound and member refids of 'index.xml' without building the object tree.
+        A member listed by several compounds maps to the compound whose refid prefixes its own
+        (where Doxygen defines it), otherwise to the first compound listing it.
+
+        :param xml_file: 'index.xml' file path string.
+        :param selection: compounds filter, see 'compound_selection', None: all.
+
+        :return: '[compound refid (JSON file stem), kind]' by refid.
+        """
+        try:
+            from lxml import etree
+
+            cls.check_xml_file(xml_file)
+
+            result: dict[str, list[str]] = {}
+
+            for _, element in etree.iterparse(xml_file, events=('end',), tag='compound'):
+                refid = element.get('refid')
+                kind = element.get('kind')
+                if selection is None or cls.is_selected(selection, refid, kind, element.findtext('name')):
+                    result[refid] = [refid, kind]
+                    for member in element.iterchildren('member'):
+                        member_refid = member.get('refid')
+                        if member_refid not in result or member_refid.startswith(refid + '_1'):
+                            result[member_refid] = [refid, member.get('kind')]
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def write_refid_index(
+        cls,
+        output_dir: str,
+        refids: dict[str, list[str]],
+        ndjson_file_name: str | None = None,
+        offsets: dict[str, list[int]] | None = None
+    ) -> None:
+        """
+        Write compact refid lookup file 'OUTPUT_DIR/REFIDS_FILE_NAME', see 'open_index'.
+
+        :param output_dir: output directory path string.
+        :param refids: refid map, see 'refid_map'.
+        :param ndjson_file_name: combined output file name, None: one JSON file per compound.
+        :param offsets: record offsets of combined output, see 'write_ndjson'.
+        """
+        try:
+            refid_index = {
+                'version': __version__,
+                'ndjson': ndjson_file_name,
+                'offsets': offsets,
+                'refids': refids
+            }
+            cls.write_json(str(Path(output_dir).joinpath(cls.REFIDS_FILE_NAME)), refid_index, -1)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def open_index(cls, output_dir: str) -> Xml2JsonIndex:
+        """
+        Open refid lookup of converted output, see 'write_refid_index'.
+
+        :param output_dir: output directory path string.
+        """
+        try:
+            refids_file = Path(output_dir).joinpath(cls.REFIDS_FILE_NAME)
+
+            if not refids_file.exists():
+                raise Exception(f"'{refids_file}' not exists!")
+
+            with open(refids_file, 'r', encoding='utf-8') as refids_input:
+                return Xml2JsonIndex(output_dir, json.load(refids_input))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def write_json(
+        cls,
+        json_file: str,
+        value: Any,
+        indent: int | None = 4,
+        buffer_size: int = BUFFER_SIZE,
+        stats: dict[str, Any] | None = None,
+        fast: bool = True
+    ) -> None:
+        """
+        Encode 'value' into buffered file, see 'open_atomic' and 'json_dumps'.
+        Compact text ('indent' None, 0 or negative) and 'orjson' text are encoded in memory,
+        other indented text is streamed in 'json' encoder chunks joined up to 'buffer_size'.
+        'stats' gets encoding as 'serialize' and writing as 'write' phase.
+
+        :param fast: False for values with floats, see 'json_dumps'.
+        """
+        try:
+            start = time.perf_counter()
+            json_text = cls.__orjson_dumps(value, indent) if fast else None
+            if json_text is None and (indent is None or indent <= 0):
+                # 'json.dump' always uses the pure Python encoder, 'json.dumps' the C one for compact text
+                json_text = json.dumps(value, **cls.json_dump_kwargs(indent))
+
+            if json_text is None:
+                # indented text is encoded in Python anyway, so stream it instead of holding it in memory
+                write_time = 0.0
+                with cls.open_atomic(json_file, buffer_size) as output:
+                    chunks = []
+                    size = 0
+                    for chunk in itertools.chain(json.JSONEncoder(**cls.json_dump_kwargs(indent)).iterencode(value), [None]):
+                        if chunk is not None:
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size < buffer_size:
+                                continue
+                        write_start = time.perf_counter()
+                        output.write(''.join(chunks))
+                        write_time += time.perf_counter() - write_start
+                        chunks.clear()
+                        size = 0
+
+                if stats is not None:
+                    stats['serialize'] += time.perf_counter() - start - write_time
+                    stats['write'] += write_time
+                return
+
+            phase_start = cls.stats_phase(stats, 'serialize', start)
+
+            with cls.open_atomic(json_file, buffer_size) as output:
+                output.write(json_text)
+
+            cls.stats_phase(stats, 'write', phase_start)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def parse_shard(cls, shard: str | None) -> tuple[int, int] | None:
+        """
+        :param shard: 'INDEX/COUNT', 1 <= INDEX <= COUNT, None: no sharding.
+
+        :return: '(index, count)' or None.
+        """
+        try:
+            if shard is None:
+                return None
+
+            match = re.fullmatch(r'(\d+)/(\d+)', shard.strip())
+            if match is None or not 1 <= int(match.group(1)) <= int(match.group(2)):
+                raise Exception(f"Unsupported 'shard': '{shard}'! Expected: 'INDEX/COUNT', 1 <= INDEX <= COUNT")
+
+            return int(match.group(1)), int(match.group(2))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def shard_plan(
+        cls,
+        xml_file: str,
+        count: int,
+        selection: dict[str, Any] | None = None,
+        cost: Callable[[str], int] | None = None
+    ) -> list[dict[str, int]]:
+        """
+        Split 'index.xml' and its compounds into 'count' shards of balanced total cost:
+        largest first, each to the cheapest shard so far, ties by position and shard number,
+        so every machine computes the same plan from the same XML.
+
+        :param xml_file: 'index.xml' file path string.
+        :param count: number of shards.
+        :param selection: compounds filter, see 'compound_selection', None: all.
+        :param cost: cost model, default: 'file_cost'.
+
+        :return: per shard, JSON file stems ('index' and compound refids) with their position in 'index.xml', in index order.
+        """
+        try:
+            import heapq
+
+            if cost is None:
+                cost = cls.file_cost
+
+            xml_dir = Path(xml_file).parent
+            items = [(cost(xml_file), Path(xml_file).stem)]
+            for refid in cls.iter_index_refids(xml_file, None, selection):
+                items.append((cost(str(xml_dir.joinpath(refid + '.xml'))), refid))
+
+            order = sorted(range(len(items)), key=lambda position: (-items[position][0], position))
+            loads = [(0, shard) for shard in range(count)]
+            assigned: list[list[int]] = [[] for _ in range(count)]
+
+            for position in order:
+                load, shard = heapq.heappop(loads)
+                assigned[shard].append(position)
+                heapq.heappush(loads, (load + items[position][0], shard))
+
+            return [{items[position][1]: position for position in sorted(positions)} for positions in assigned]
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def merge_shards(cls, shard_dirs: list[str], output_dir: str, verbose: bool = False) -> None:
+        """
+        Validate shard outputs of one 'index.xml' and combine them into the normal layout in 'output_dir':
+        one 'index.json', all compound JSON files, the refid index of shards run with '--refid-index'
+        (each covers all compounds, see 'open_index') and a manifest usable by '--incremental'.
+        Shard dirs are kept, shard manifests in 'output_dir' are removed.
+
+        :param shard_dirs: output dirs of '--shard' runs, a dir may hold several shards.
+        :param output_dir: output directory path string, may be one of 'shard_dirs'.
+        :param verbose: print copied files.
+
+        :raise Exception: on missing, duplicate or mismatching shards.
+        """
+        try:
+            import shutil
+
+            shards: dict[int, tuple[Path, Path, dict[str, Any]]] = {}
+            for shard_dir in shard_dirs:
+                shard_manifest_files = sorted(
+                    Path(shard_dir).glob(cls.SHARD_MANIFEST_FILE_NAME.format(index='*', count='*'))
+                )
+                if len(shard_manifest_files) == 0:
+                    raise Exception(f"'{shard_dir}' has no shard manifest!")
+                for shard_manifest_file in shard_manifest_files:
+                    shard_manifest = json.loads(shard_manifest_file.read_text())
+                    index = shard_manifest['shard']['index']
+                    if index in shards:
+                        raise Exception(f"'{shard_manifest_file}' duplicates '{shards[index][1]}'!")
+                    shards[index] = (Path(shard_dir), shard_manifest_file, shard_manifest)
+
+            _, first_file, first = shards[min(shards)]
+            count = first['shard']['count']
+            for _, shard_manifest_file, shard_manifest in shards.values():
+                for key in ['version', 'options', 'index']:
+                    if shard_manifest[key] != first[key]:
+                        raise Exception(f"'{shard_manifest_file}' '{key}' does not match '{first_file}'!")
+                if shard_manifest['shard']['count'] != count:
+                    raise Exception(f"'{shard_manifest_file}' 'count' does not match '{first_file}'!")
+
+            missing = [index for index in range(1, count + 1) if index not in shards]
+            if len(missing) > 0 or len(shards) != count:
+                raise Exception(f"Missing shards: {missing} of {count}!")
+
+            enums_name = Path(cls.ENUMS_FILE_NAME).stem
+            index_name = Path(first['index']['xml']).stem
+            sources: dict[str, Path] = {}
+            compounds = []
+            for index in range(1, count + 1):
+                shard_dir, shard_manifest_file, shard_manifest = shards[index]
+                for name in shard_manifest['shard']['names']:
+                    json_file = shard_dir.joinpath(name + '.json')
+                    if not json_file.exists():
+                        raise Exception(f"'{json_file}' listed in '{shard_manifest_file}' not exists!")
+                    if name in sources and name != enums_name:
+                        raise Exception(f"'{name}' is in more than one shard!")
+                    if name == enums_name and name in sources:
+                        if cls.file_hash(str(json_file)) != cls.file_hash(str(sources[name])):
+                            raise Exception(f"'{json_file}' does not match '{sources[name]}'!")
+                        continue
+                    sources[name] = json_file
+                compounds.extend(zip(shard_manifest['shard']['positions'], shard_manifest['compounds'].items()))
+
+            if index_name not in sources:
+                raise Exception(f"'{index_name}' is in no shard!")
+
+            refids_files = [
+                shard_dir.joinpath(cls.REFIDS_FILE_NAME)
+                for shard_dir in {shard_dir.resolve(): shard_dir for shard_dir, _, _ in shards.values()}.values()
+                if shard_dir.joinpath(cls.REFIDS_FILE_NAME).exists()
+            ]
+            for refids_file in refids_files[1:]:
+                if cls.file_hash(str(refids_file)) != cls.file_hash(str(refids_files[0])):
+                    raise Exception(f"'{refids_file}' does not match '{refids_files[0]}'!")
+
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            copies = [(name + '.json', json_file) for name, json_file in sources.items()]
+            copies.extend((cls.REFIDS_FILE_NAME, refids_file) for refids_file in refids_files[:1])
+            for file_name, json_file in copies:
+                output_file = Path(output_dir).joinpath(file_name)
+                if json_file.resolve() == output_file.resolve():
+                    continue
+                if verbose:
+                    cls.info_message(f"copy: '{json_file}' -> '{output_file}'")
+                tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                shutil.copyfile(json_file, tmp_file)
+                os.replace(tmp_file, output_file)
+
+            manifest = {
+                'version': first['version'],
+                'options': first['options'],
+                'index': first['index'],
+                'compounds': {refid: entry for _, (refid, entry) in sorted(compounds, key=lambda item: item[0])}
+            }
+            cls.write_manifest(output_dir, manifest)
+
+            for _, shard_manifest_file, _ in shards.values():
+                if shard_manifest_file.parent.resolve() == Path(output_dir).resolve():
+                    shard_manifest_file.unlink()
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def file_hash(cls, file: str) -> str:
+        try:
+            import hashlib
+
+            result = hashlib.sha256()
+
+            with open(file, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    result.update(chunk)
+
+            return result.hexdigest()
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def read_manifest(cls, output_dir: str) -> dict[str, Any] | None:
+        """
+        Read manifest of previous incremental run.
+
+        :return: manifest or None if missing.
+        """
+        try:
+            manifest_file = Path(output_dir).joinpath(cls.MANIFEST_FILE_NAME)
+
+            if not manifest_file.exists():
+                return None
+
+            return json.loads(manifest_file.read_text())
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def is_manifest_reusable(cls, manifest: dict[str, Any], previous_manifest: dict[str, Any] | None) -> bool:
+        """
+        Previous outputs are reusable only if written by the same version with the same options.
+        """
+        try:
+            return (
+                previous_manifest is not None
+                and previous_manifest.get('version') == manifest['version']
+                and previous_manifest.get('options') == manifest['options']
+            )
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def write_manifest(cls, output_dir: str, manifest: dict[str, Any]) -> None:
+        try:
+            cls.write_json(str(Path(output_dir).joinpath(cls.MANIFEST_FILE_NAME)), manifest, 4)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def incremental_refids(
+        cls,
+        manifest: dict[str, Any],
+        previous_manifest: dict[str, Any] | None,
+        xml_dir: str,
+        output_dir: str,
+        refids: list[str],
+        verbose: bool = False
+    ) -> list[str]:
+        """
+        Record compound XML hashes in 'manifest', remove JSON files of compounds
+        that are no longer listed and select compounds that need conversion.
+
+        :return: refids of changed or new compounds.
+        """
+        try:
             result = []
+            previous_compounds = {}
+            if cls.is_manifest_reusable(manifest, previous_manifest):
+                previous_compounds = previous_manifest['compounds']
+
+            for refid in refids:
+                xml_file = Path(xml_dir).joinpath(refid + '.xml')
+                entry = {'xml': xml_file.name, 'hash': cls.file_hash(str(xml_file))}
+                manifest['compounds'][refid] = entry
+
+                if previous_compounds.get(refid) == entry and Path(output_dir).joinpath(refid + '.json').exists():
+                    if verbose:
+                        cls.info_message(f"skip: '{xml_file}'")
+                else:
+                    result.append(refid)
+
+            if previous_manifest is not None:
+                for refid in previous_manifest.get('compounds', {}):
+                    if refid not in manifest['compounds']:
+                        json_file = Path(output_dir).joinpath(refid + '.json')
+                        if json_file.exists():
+                            if verbose:
+                                cls.info_message(f"remove: '{json_file}'")
+                            json_file.unlink()
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def compound_selection(
+        cls,
+        include_kinds: list[str] | None = None,
+        exclude_kinds: list[str] | None = None,
+        include_refids: list[str] | None = None,
+        exclude_refids: list[str] | None = None,
+        select: list[str] | None = None,
+        xml_file: str | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Compounds filter for 'is_selected', plain data so it can be sent to process workers.
+
+        :param include_kinds: compound kinds to keep, None: all.
+        :param exclude_kinds: compound kinds to drop.
+        :param include_refids: refid patterns to keep, glob or 're:REGEX', None: all.
+        :param exclude_refids: refid patterns to drop, glob or 're:REGEX'.
+        :param select: refids or source file paths to keep, None: all. A path (entry with '/', '\\' or '.',
+                       refids have none) selects compounds located in that file, see 'located_refids', it needs 'xml_file'.
+        :param xml_file: 'index.xml' file path string, None: 'select' entries are refids only.
+
+        :return: filter or None if no arguments are set.
+        """
+        try:
+            if all(value is None for value in [include_kinds, exclude_kinds, include_refids, exclude_refids, select]):
+                return None
+
+            for pattern in (include_refids or []) + (exclude_refids or []):
+                if pattern.startswith('re:'):
+                    re.compile(pattern[3:])
+
+            result = {
+                'include_kinds': set(include_kinds) if include_kinds is not None else None,
+                'exclude_kinds': set(exclude_kinds or []),
+                'include_refids': include_refids,
+                'exclude_refids': exclude_refids or [],
+                'select_refids': None
+            }
+
+            if select is not None:
+                entries = [entry.strip() for entry in select if len(entry.strip()) > 0]
+                result['select_refids'] = set(entries)
+                files = [entry for entry in entries if any(c in entry for c in '/\\.')]
+                if xml_file is not None and len(files) > 0:
+                    result['select_refids'].update(cls.located_refids(xml_file, files))
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def is_selected(cls, selection: dict[str, Any], refid: str, kind: str, name: str | None) -> bool:
+        """
+        Check compound against filter, see 'compound_selection'.
+        """
+        try:
+            if selection['include_kinds'] is not None and kind not in selection['include_kinds']:
+                return False
+
+            if kind in selection['exclude_kinds']:
+                return False
+
+            if selection['include_refids'] is not None and not cls.__refid_matches(refid, selection['include_refids']):
+                return False
+
+            if cls.__refid_matches(refid, selection['exclude_refids']):
+                return False
+
+            if selection['select_refids'] is not None and refid not in selection['select_refids']:
+                return False
+
+            return True
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def located_refids(cls, xml_file: str, files: Iterable[str]) -> set[str]:
+        """
+        Refids of compounds whose own '<location file=... bodyfile=...>' is one of 'files'
+        ('file' compounds and the classes, structs, namespaces, groups, ... defined there).
+        Paths match if equal or if one ends with '/' and the other, Doxygen paths may be absolute
+        or relative ('STRIP_FROM_PATH'), so a bare file name matches that name in every directory.
+
+        :param xml_file: 'index.xml' file path string.
+        :param files: source file path strings.
+        """
+        try:
+            from xml.sax.saxutils import unescape
+
+            def normalize(path: str) -> str:
+                path = path.replace('\\', '/')
+                while path.startswith('./'):
+                    path = path[2:]
+                return path.rstrip('/')
+
+            files = {normalize(file) for file in files}
+            files.discard('')
+
+            def matches(location: str) -> bool:
+                location = normalize(location)
+                if location in files:
+                    return True
+                for file in files:
+                    if location.endswith('/' + file) or file.endswith('/' + location):
+                        return True
+                return False
+
+            result = set()
+            if len(files) == 0:
+                return result
+
+            xml_dir = Path(xml_file).parent
+            for refid in cls.iter_index_refids(xml_file):
+                compound_xml_file = xml_dir.joinpath(refid + '.xml')
+                if not compound_xml_file.exists():
+                    continue
+
+                # compound location is the last '<location>', only 'listofallmembers' follows it,
+                # so read the file tail, larger until it is found
+                with open(compound_xml_file, 'rb') as compound_xml:
+                    size = compound_xml.seek(0, os.SEEK_END)
+                    tail = 4096
+                    while True:
+                        offset = max(0, size - tail)
+                        compound_xml.seek(offset)
+                        data = compound_xml.read()
+                        start = data.rfind(b'<location ')
+                        if start >= 0 or offset == 0:
+                            break
+                        tail *= 8
+                if start < 0:
+                    continue
+                tag = data[start:data.find(b'>', start)].decode('utf-8')
+
+                for match in re.finditer(r'\s(?:file|bodyfile)="([^"]*)"', tag):
+                    if matches(unescape(match.group(1), {'&quot;': '"', '&apos;': "'"})):
+                        result.add(refid)
+                        break
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __refid_matches(cls, refid: str, patterns: list[str]) -> bool:
+        for pattern in patterns:
+            if pattern.startswith('re:'):
+                if re.fullmatch(pattern[3:], refid) is not None:
+                    return True
+            elif fnmatch.fnmatchcase(refid, pattern):
+                return True
+        return False
+
+    @classmethod
+    def stats_record(cls, xml_file: str) -> dict[str, Any]:
+        """
+        New per-file stats record: 'file' name, 'bytes_in', 'bytes_out', 'nodes' (converted objects),
+        seconds per phase in 'STATS_PHASES' and total 'time'.
+        """
+        try:
+            record = {'file': Path(xml_file).name, 'bytes_in': Path(xml_file).stat().st_size, 'bytes_out': 0, 'nodes': 0}
+            for phase in cls.STATS_PHASES:
+                record[phase] = 0.0
+            record['time'] = time.perf_counter()
+            return record
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def stats_record_done(cls, record: dict[str, Any], json_file: str) -> dict[str, Any]:
+        """
+        Set 'bytes_out', total 'time' and converting process 'pid' and its 'peak_rss' (see 'worker_memory')
+        of record started by 'stats_record'.
+        """
+        try:
+            record['time'] = time.perf_counter() - record['time']
+            record['bytes_out'] = Path(json_file).stat().st_size
+            memory = cls.worker_memory()
+            record['pid'] = memory['pid']
+            record['peak_rss'] = memory['peak_rss']
+            return record
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def stats_phase(cls, stats: dict[str, Any] | None, phase: str, start: float) -> float:
+        """
+        Add seconds since 'start' to 'stats[phase]' if 'stats' is not None.
+
+        :return: current 'time.perf_counter()', start of next phase.
+        """
+        now = time.perf_counter()
+        if stats is not None:
+            stats[phase] += now - start
+        return now
+
+    @classmethod
+    def count_nodes(cls, value: Any) -> int:
+        """
+        Number of dicts in converted value.
+        """
+        try:
+            result = 0
+            stack = [value]
+
+            while len(stack) > 0:
+                value = stack.pop()
+                if isinstance(value, dict):
+                    result += 1
+                    stack.extend(value.values())
+                elif isinstance(value, list):
+                    stack.extend(value)
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def stats_report(
+        cls,
+        records: list[dict[str, Any]],
+        wall_time: float,
+        slowest: int = 10,
+        json_encoder: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Aggregate per-file stats records.
+
+        :param records: records, see 'stats_record'.
+        :param wall_time: run seconds.
+        :param slowest: number of slowest records in report.
+        :param json_encoder: encoder of the run, see 'json_encoder'.
+
+        :return: report: 'json_encoder', 'totals' of all counters and phases,
+                 'percentiles' ('p50', 'p90', 'p99', 'max') of 'time', phases, 'nodes' and bytes,
+                 'slowest' records by descending 'time',
+                 'workers' by descending 'peak_rss': 'pid', 'files' and 'peak_rss' of each converting process
+                 (one for serial and thread runs, one per replaced worker with '--max-worker-tasks' or '--max-worker-rss').
+        """
+        try:
+            keys = ['bytes_in', 'bytes_out', 'nodes'] + cls.STATS_PHASES + ['time']
+
+            totals = {'files': len(records)}
+            percentiles = {}
+            for key in keys:
+                values = sorted(record[key] for record in records)
+                totals[key] = sum(values)
+                percentiles[key] = {
+                    name: values[min(len(values) - 1, int(len(values) * q / 100))] if len(values) > 0 else 0
+                    for name, q in [('p50', 50), ('p90', 90), ('p99', 99), ('max', 100)]
+                }
+
+            workers: dict[int, dict[str, Any]] = {}
+            for record in records:
+                if record.get('pid') is None:
+                    continue
+                worker = workers.setdefault(record['pid'], {'pid': record['pid'], 'files': 0, 'peak_rss': None})
+                worker['files'] += 1
+                if record['peak_rss'] is not None:
+                    worker['peak_rss'] = max(worker['peak_rss'] or 0, record['peak_rss'])
+
+            return {
+                'version': __version__,
+                'json_encoder': json_encoder,
+                'wall_time': wall_time,
+                'totals': totals,
+                'percentiles': percentiles,
+                'slowest': sorted(records, key=lambda record: record['time'], reverse=True)[:slowest],
+                'workers': sorted(workers.values(), key=lambda worker: worker['peak_rss'] or 0, reverse=True)
+            }
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def resolve_xml_type(cls, xml_file: str, xml_type: str = None) -> str:
+        try:
+            if xml_type is None:
+                if Path(xml_file).name == 'index.xml':
+                    xml_type = 'index'
+                else:
+                    xml_type = 'compound'
+            elif xml_type != 'index' and xml_type != 'compound':
+                raise Exception(f"Unsupported 'xml_type': '{xml_type}'! Supported: ['index', 'compound']")
+
+            return xml_type
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def info_message(cls, message: str) -> None:
+        try:
+            with cls.__lock:
+                print(message)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def check_xml_file(cls, xml_file: str) -> None:
+        try:
+            if xml_file is None:
+                raise Exception(f"'xml_file' is None!")
+
+            if len(xml_file) == 0:
+                raise Exception(f"'xml_file' is empty!")
+
+            if not Path(xml_file).exists():
+                raise Exception(f"'xml_file' not exists!")
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def check_output_dir(cls, output_dir: str) -> None:
+        try:
+            if output_dir is None:
+                raise Exception(f"'output_dir' is None!")
+
+            if len(output_dir) == 0:
+                raise Exception(f"'output_dir' is empty!")
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def check_indent(cls, indent: int) -> None:
+        try:
+            if indent is None:
+                raise Exception(f"'indent' is None!")
+
+            if indent < -1:
+                raise Exception(f"'indent' less than -1!")
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def check_parallel(cls, parallel: int) -> None:
+        try:
+            if parallel is None:
+                raise Exception(f"'parallel' is None!")
+
+            if parallel < 0 or parallel > 1024:
+                raise Exception(f"'parallel' out of range 0-1024!")
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def check_worker_limits(cls, args: Namespace) -> None:
+        try:
+            if args.max_worker_tasks < 0:
+                raise Exception(f"'max_worker_tasks' less than 0!")
+
+            if args.max_worker_rss < 0:
+                raise Exception(f"'max_worker_rss' less than 0!")
+
+            if args.large_file_size < 0:
+                raise Exception(f"'large_file_size' less than 0!")
+
+            if args.large_file_parallel < 1:
+                raise Exception(f"'large_file_parallel' less than 1!")
+
+            if (args.max_worker_tasks > 0 or args.max_worker_rss > 0) and args.parallel_type == 'thread' and args.parallel != 0:
+                raise Exception(f"'--max-worker-tasks' and '--max-worker-rss' require '--parallel-type process' or 'pipeline'!")
+
+            if args.max_worker_rss > 0 and cls.worker_memory()['rss'] is None:
+                raise Exception(f"'--max-worker-rss' is not supported, current resident memory is unknown on this platform!")
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def transform_index(
+        cls,
+        xml_file: str,
+        silence: bool = False,
+        warnings: bool = False,
+        enums: bool = True,
+        stats: dict[str, Any] | None = None,
+        selection: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        try:
+            start = time.perf_counter()
+
+            cls.check_xml_file(xml_file)
+            start = cls.stats_phase(stats, 'check', start)
+
+            root_xml = cls.doxmlparser_module('index').parse(xml_file, silence=silence, print_warnings=warnings)
+            start = cls.stats_phase(stats, 'parse', start)
+
+            if selection is not None:
+                root_xml.set_compound([
+                    compound for compound in root_xml.get_compound()
+                    if cls.is_selected(selection, compound.get_refid(), compound.get_kind(), compound.get_name())
+                ])
+
+            root_result = cls.index_enum_dicts() if enums else []
+            root_result.append(cls.to_dict(root_xml))
+            cls.stats_phase(stats, 'convert', start)
+
+            if stats is not None:
+                stats['nodes'] += cls.count_nodes(root_result[-1])
+
+            return root_result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def transform_compound(
+        cls,
+        xml_file: str,
+        silence: bool = False,
+        warnings: bool = False,
+        enums: bool = True,
+        stats: dict[str, Any] | None = None,
+        member_refs: Iterable[str] | None = None
+    ) -> list[dict[str, Any]]:
+        try:
+            start = time.perf_counter()
+
+            cls.check_xml_file(xml_file)
+            start = cls.stats_phase(stats, 'check', start)
+
+            root_xml = cls.parse_compound(xml_file, silence, warnings, member_refs)
+            start = cls.stats_phase(stats, 'parse', start)
+
+            root_result = cls.compound_enum_dicts() if enums else []
+            root_result.append(cls.member_ref_dicts(cls.to_dict(root_xml), member_refs))
+            cls.stats_phase(stats, 'convert', start)
+
+            if stats is not None:
+                stats['nodes'] += cls.count_nodes(root_result[-1])
+
+            return root_result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def parse_compound(
+        cls,
+        source: Any,
+        silence: bool = False,
+        warnings: bool = False,
+        member_refs: Iterable[str] | None = None
+    ) -> Any:
+        """
+        'doxmlparser.compound.parse' that builds memberdefs listed in 'member_refs' from their 'id' only.
+
+        :param source: XML file path string or binary file object.
+        :param member_refs: memberdef ids, see 'foreign_members', None: plain 'parse'.
+        """
+        try:
+            module = cls.doxmlparser_module('compound')
+
+            if not member_refs:
+                return module.parse(source, silence=silence, print_warnings=warnings)
+
+            member_refs = set(member_refs)
+            root = module.parsexml_(source).getroot()
+
+            for element in [e for e in root.iter('memberdef') if e.get('id') in member_refs]:
+                refid = element.get('id')
+                element.clear()
+                element.set('id', refid)
+
+            root_tag, root_class = module.get_root_tag(root)
+            if root_class is None:
+                root_tag = 'doxygen'
+                root_class = module.DoxygenType
+
+            gds_collector = module.GdsCollector_()
+            root_obj = root_class.factory()
+            root_obj.build(root, gds_collector_=gds_collector)
+
+            if not silence:
+                sys.stdout.write('<?xml version="1.0" ?>\n')
+                root_obj.export(sys.stdout, 0, name_=root_tag, pretty_print=True)
+
+            if warnings and len(gds_collector.get_messages()) > 0:
+                separator = ('-' * 50) + '\n'
+                sys.stderr.write(separator)
+                sys.stderr.write(f"----- Warnings -- count: {len(gds_collector.get_messages())} -----\n")
+                gds_collector.write_messages(sys.stderr)
+                sys.stderr.write(separator)
+
+            return root_obj
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def member_ref_dicts(cls, root_result: dict[str, Any], member_refs: Iterable[str] | None) -> dict[str, Any]:
+        """
+        Replace memberdefs built by 'parse_compound' from 'member_refs' by '{'refid': ID}' in place.
+
+        :return: 'root_result'.
+        """
+        try:
+            if not member_refs:
+                return root_result
+
+            member_refs = set(member_refs)
+            for compounddef in root_result.get('compounddef', []):
+                for sectiondef in compounddef.get('sectiondef', []):
+                    memberdefs = sectiondef.get('memberdef', [])
+                    for i, memberdef in enumerate(memberdefs):
+                        if len(memberdef) == 1 and memberdef.get('id') in member_refs:
+                            memberdefs[i] = {'refid': memberdef['id']}
+
+            return root_result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def foreign_members(cls, xml_file: str, selection: dict[str, Any] | None = None) -> dict[str, list[str]]:
+        """
+        Members that 'index.xml' lists under several compounds are converted once, by the compound
+        that owns them in 'refid_map' (the compound whose refid prefixes the member refid, where
+        Doxygen defines it, otherwise the first compound listing it). Every worker gets its own compound entry and needs no shared state.
+
+        :param xml_file: 'index.xml' file path string.
+        :param selection: compounds filter, see 'compound_selection', None: all.
+
+        :return: member refids owned by another compound, by compound refid, compounds without any are left out.
+        """
+        try:
+            from lxml import etree
+
+            owners = cls.refid_map(xml_file, selection)
+            result: dict[str, list[str]] = {}
+
+            for _, element in etree.iterparse(xml_file, events=('end',), tag='compound'):
+                refid = element.get('refid')
+                if refid in owners:
+                    foreign = {}
+                    for member in element.iterchildren('member'):
+                        member_refid = member.get('refid')
+                        if owners[member_refid][0] != refid:
+                            foreign[member_refid] = None
+                    if len(foreign) > 0:
+                        result[refid] = list(foreign)
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def doxmlparser_module(cls, xml_type: str) -> Any:
+        """
+        'doxmlparser.index' or 'doxmlparser.compound' module, imported on first use,
+        so importing this module does not pay for them. Only the requested module is loaded,
+        the 'doxmlparser' package '__init__' imports both. Imports are serialized by a lock,
+        worker threads may ask for them at the same time.
+
+        :param xml_type: 'index' or 'compound'.
+        """
+        try:
+            # only fully imported modules are cached, 'sys.modules' has them while they are initialized
+            module = cls.__doxmlparser_modules.get(xml_type)
+
+            if module is None:
+                if xml_type != 'index' and xml_type != 'compound':
+                    raise Exception(f"Unsupported 'xml_type': '{xml_type}'! Supported: ['index', 'compound']")
+
+                with cls.__lock:
+                    module = cls.__doxmlparser_modules.get(xml_type)
+                    if module is None:
+                        name = 'doxmlparser.' + xml_type
+                        if name in sys.modules:
+                            module = importlib.import_module(name)
+                        else:
+                            package = importlib.util.find_spec('doxmlparser')
+                            if package is None:
+                                raise Exception(f"'doxmlparser' is not installed!")
+
+                            spec = importlib.util.spec_from_file_location(
+                                name,
+                                Path(package.submodule_search_locations[0]).joinpath(xml_type + '.py')
+                            )
+                            module = importlib.util.module_from_spec(spec)
+                            spec.loader.exec_module(module)
+                            # registered when complete, an import of the package meanwhile loads its own copy,
+                            # then that one is used once it is initialized
+                            if sys.modules.setdefault(name, module) is not module:
+                                module = importlib.import_module(name)
+                        cls.__doxmlparser_modules[xml_type] = module
+
+            return module
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def index_enum_dicts(cls) -> list[dict[str, Any]]:
+        try:
+            return cls.__enum_dicts(cls.doxmlparser_module('index'))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def compound_enum_dicts(cls) -> list[dict[str, Any]]:
+        try:
+            return cls.__enum_dicts(cls.doxmlparser_module('compound'))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __lean_enum_dicts(cls, xml_type: str) -> list[dict[str, Any]]:
+        """
+        Lean enum tables, computed once per process, the same objects on every call, see 'lean'.
+        """
+        try:
+            result = cls.__enum_dicts_cache.get('lean.' + xml_type)
 
-            members = inspect.getmembers(doxmlparser.compound, predicate=inspect.isclass)
-            for name, type_obj in members:
-                type_obj: type = type_obj
-                if type_obj.__module__ == 'doxmlparser.compound' and issubclass(type_obj, Enum):
-                    result_child_list = []
-                    for entry in type_obj:
-                        result_child_list.append(entry.value)
-                    result_child = {type_obj.__name__: result_child_list}
-                    result.append(result_child)
+            if result is None:
+                if xml_type == 'index':
+                    result = cls.lean(cls.index_enum_dicts())
+                else:
+                    result = cls.lean(cls.compound_enum_dicts())
+                cls.__enum_dicts_cache['lean.' + xml_type] = result
 
             return result
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
 
+    @classmethod
+    def __enum_dicts(cls, module: Any) -> list[dict[str, Any]]:
+        """
+        Enum tables of doxmlparser module, computed once per process, a fresh copy on every call.
+        """
+        try:
+            result = cls.__enum_dicts_cache.get(module.__name__)
+
+            if result is None:
+                import inspect
+
+                result = []
+
+                members = inspect.getmembers(module, predicate=inspect.isclass)
+                for name, type_obj in members:
+                    type_obj: type = type_obj
+                    if type_obj.__module__ == module.__name__ and issubclass(type_obj, Enum):
+                        result_child_list = []
+                        for entry in type_obj:
+                            result_child_list.append(entry.value)
+                        result_child = {type_obj.__name__: result_child_list}
+                        result.append(result_child)
+
+                cls.__enum_dicts_cache[module.__name__] = result
+
+            return [{k: list(v) for k, v in d.items()} for d in result]
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def index_refids(cls, xml_file: str) -> list[str]:
+        """
+        Compound refids of 'index.xml' in document order, without building the object tree.
+        """
+        try:
+            return list(cls.iter_index_refids(xml_file))
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def iter_index_refids(
+        cls,
+        xml_file: str,
+        collect: list[str] | None = None,
+        selection: dict[str, Any] | None = None
+    ) -> Iterator[str]:
+        """
+        Compound refids of 'index.xml' in document order, each yielded as soon as its element is parsed.
+
+        :param xml_file: 'index.xml' file path string.
+        :param collect: list to append every yielded refid to.
+        :param selection: compounds filter, see 'compound_selection', None: all.
+        """
+        try:
+            from lxml import etree
+
+            cls.check_xml_file(xml_file)
+
+            for _, element in etree.iterparse(xml_file, events=('end',), tag='compound'):
+                refid = element.get('refid')
+                selected = selection is None or cls.is_selected(
+                    selection,
+                    refid,
+                    element.get('kind'),
+                    element.findtext('name')
+                )
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+                if not selected:
+                    continue
+                if collect is not None:
+                    collect.append(refid)
+                yield refid
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def transform_stream(
+        cls,
+        xml_file: str,
+        json_file: str,
+        indent: int | None = 4,
+        warnings: bool = False,
+        xml_type: str = None,
+        enums: bool = True,
+        buffer_size: int = BUFFER_SIZE,
+        stats: dict[str, Any] | None = None,
+        selection: dict[str, Any] | None = None,
+        member_refs: Iterable[str] | None = None
+    ) -> None:
+        """
+        Streaming engine, writes the same JSON as 'json.dumps(transform(...), indent=indent)'
+        without keeping the whole doxmlparser object tree or result dict in memory.
+
+        Elements are read with 'iterparse'. Container elements (document root, 'compounddef',
+        'sectiondef', 'programlisting') are kept as attribute-only doxmlparser objects,
+        every other child is built by its container's doxmlparser 'buildChildren',
+        list children are converted and serialized as soon as they end and then dropped.
+
+        :param xml_file: XML file path string.
+        :param json_file: JSON file path string.
+        :param indent: JSON indent, negative: compact.
+        :param warnings: print warnings.
+        :param xml_type: XML file type string.
+        :param enums: prepend enum tables to result.
+        :param buffer_size: output file buffer bytes.
+        :param stats: stats record to add phase times and node count to, parse, convert, serialize
+                      and write are interleaved and recorded as one 'stream' phase.
+        :param selection: index compounds filter, see 'compound_selection', None: all.
+        :param member_refs: compound memberdef ids to write as '{'refid': ID}', see 'foreign_members'.
+
+        :raise Exception: on error.
+        """
+        try:
+            start = time.perf_counter()
+            member_refs = set(member_refs) if member_refs else None
+
+            cls.check_xml_file(xml_file)
+            start = cls.stats_phase(stats, 'check', start)
+            xml_type = cls.resolve_xml_type(xml_file, xml_type)
+            nodes = 0
+
+            from lxml import etree
+
+            module = cls.doxmlparser_module(xml_type)
+            if xml_type == 'index':
+                enum_dicts = cls.index_enum_dicts()
+            else:
+                enum_dicts = cls.compound_enum_dicts()
+
+            if not enums:
+                enum_dicts = []
+
+            containers = cls.__stream_containers[xml_type]
+            gds_collector = module.GdsCollector_()
+            path: list[str] = []
+            frames: list[dict[str, Any]] = []
+
+            with cls.open_atomic(json_file, buffer_size) as output:
+                output.write('[')
+                for i, enum_dict in enumerate(enum_dicts):
+                    output.write(cls.__stream_separator(indent, 1, i > 0))
+                    output.write(cls.__stream_dumps(enum_dict, indent, 1))
+
+                events = etree.iterparse(xml_file, events=('start', 'end'), remove_comments=True, remove_pis=True)
+                for event, element in events:
+                    if event == 'start':
+                        path.append(etree.QName(element).localname)
+                        if tuple(path) in containers:
+                            frames.append(cls.__stream_frame(module, frames, element, path[-1], gds_collector))
+                        continue
+
+                    frame = frames[-1] if len(frames) > 0 else None
+
+                    if frame is not None and frame['element'] is element:
+                        frames.pop()
+                        if len(frames) == 0:
+                            output.write(cls.__stream_separator(indent, 1, len(enum_dicts) > 0))
+                            nodes += cls.__stream_write_frame(output, frame, indent, stats is not None)
+                        else:
+                            parent_spill = cls.__stream_spill(frames[-1], frame['key'], frame['is_list'])
+                            if parent_spill['count'] > 0:
+                                parent_spill['file'].write(cls.__stream_separator(indent, frame['depth'], True))
+                            nodes += cls.__stream_write_frame(parent_spill['file'], frame, indent, stats is not None)
+                            parent_spill['count'] += 1
+                            frames[-1]['element'].remove(element)
+                    elif frame is not None and len(path) == len(frame['path']) + 1:
+                        if (
+                                selection is not None
+                                and xml_type == 'index'
+                                and path[-1] == 'compound'
+                                and not cls.is_selected(
+                                    selection,
+                                    element.get('refid'),
+                                    element.get('kind'),
+                                    element.findtext('name')
+                                )
+                        ):
+                            frame['element'].remove(element)
+                            path.pop()
+                            continue
+
+                        member_ref = None
+                        if member_refs is not None and path[-1] == 'memberdef' and element.get('id') in member_refs:
+                            member_ref = {'refid': element.get('id')}
+                            element.clear()
+
+                        frame['obj'].buildChildren(element, frame['element'], path[-1], gds_collector_=gds_collector)
+                        attr = cls.__stream_attr_name(path[-1])
+                        value = getattr(frame['obj'], attr, None)
+                        if isinstance(value, list) and len(value) > 0:
+                            spill = cls.__stream_spill(frame, path[-1], True)
+                            if spill['count'] > 0:
+                                spill['file'].write(cls.__stream_separator(indent, frame['depth'] + 2, True))
+                            value = cls.__to_dict(value.pop())
+                            if member_ref is not None:
+                                value = member_ref
+                            spill['file'].write(cls.__stream_dumps(value, indent, frame['depth'] + 2))
+                            spill['count'] += 1
+                            if stats is not None:
+                                nodes += cls.count_nodes(value)
+                        frame['element'].remove(element)
+
+                    path.pop()
+
+                output.write(cls.__stream_separator(indent, 0, False) + ']')
+
+            cls.stats_phase(stats, 'stream', start)
+            if stats is not None:
+                stats['nodes'] += nodes
+
+            if warnings and len(gds_collector.get_messages()) > 0:
+                separator = ('-' * 50) + '\n'
+                sys.stderr.write(separator)
+                sys.stderr.write(f"----- Warnings -- count: {len(gds_collector.get_messages())} -----\n")
+                gds_collector.write_messages(sys.stderr)
+                sys.stderr.write(separator)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __stream_frame(
+        cls,
+        module: Any,
+        frames: list[dict[str, Any]],
+        element: Any,
+        name: str,
+        gds_collector: Any
+    ) -> dict[str, Any]:
+        try:
+            if len(frames) == 0:
+                _, root_class = module.get_root_tag(element)
+                if root_class is None:
+                    root_class = module.DoxygenType
+                obj = root_class.factory()
+                obj.gds_collector_ = gds_collector
+                obj.buildAttributes(element, element.attrib, set())
+                is_list = False
+                depth = 1
+            else:
+                from lxml import etree
+
+                parent = frames[-1]
+                # build from attribute-only copy, children are added one by one when they end
+                shell = etree.Element(element.tag, attrib=dict(element.attrib))
+                parent['obj'].buildChildren(shell, parent['element'], name, gds_collector_=gds_collector)
+                attr = cls.__stream_attr_name(name)
+                value = getattr(parent['obj'], attr)
+                if isinstance(value, list):
+                    obj = value.pop()
+                    is_list = True
+                    depth = parent['depth'] + 2
+                else:
+                    obj = value
+                    setattr(parent['obj'], attr, None)
+                    is_list = False
+                    depth = parent['depth'] + 1
+
+            return {
+                'element': element,
+                'path': (frames[-1]['path'] if len(frames) > 0 else []) + [name],
+                'key': name,
+                'obj': obj,
+                'is_list': is_list,
+                'depth': depth,
+                'spills': {}
+            }
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __stream_spill(cls, frame: dict[str, Any], key: str, is_list: bool) -> dict[str, Any]:
+        try:
+            spill = frame['spills'].get(key)
+
+            if spill is None:
+                import tempfile
+
+                spill = {
+                    'file': tempfile.SpooledTemporaryFile(max_size=cls.__stream_spill_size, mode='w+'),
+                    'count': 0,
+                    'is_list': is_list
+                }
+                frame['spills'][key] = spill
+
+            return spill
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __stream_write_frame(cls, output: Any, frame: dict[str, Any], indent: int | None, count_nodes: bool = False) -> int:
+        """
+        :return: number of converted objects written directly (not from spills) if 'count_nodes', otherwise 0.
+        """
+        try:
+            import shutil
+
+            depth = frame['depth']
+            spills = frame['spills']
+            values = cls.__to_dict(frame['obj'])
+            count = 0
+
+            try:
+                output.write('{')
+                for key, _ in cls.__to_dict_plan(type(frame['obj'])):
+                    spill = spills.get(key)
+                    if spill is None and key not in values:
+                        continue
+
+                    output.write(cls.__stream_separator(indent, depth + 1, count > 0))
+                    output.write(cls.json_dumps(key, -1) + (':' if indent is not None and indent < 0 else ': '))
+                    count += 1
+
+                    if spill is None:
+                        output.write(cls.__stream_dumps(values[key], indent, depth + 1))
+                        continue
+
+                    if spill['is_list']:
+                        output.write('[' + cls.__stream_separator(indent, depth + 2, False))
+                    spill['file'].seek(0)
+                    shutil.copyfileobj(spill['file'], output)
+                    if spill['is_list']:
+                        output.write(cls.__stream_separator(indent, depth + 1, False) + ']')
+                if count > 0:
+                    output.write(cls.__stream_separator(indent, depth, False))
+                output.write('}')
+            finally:
+                for spill in spills.values():
+                    spill['file'].close()
+
+            return cls.count_nodes(values) if count_nodes else 0
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __stream_separator(cls, indent: int | None, depth: int, item: bool) -> str:
+        if indent is None:
+            return ', ' if item else ''
+        if indent < 0:
+            return ',' if item else ''
+        return (',' if item else '') + '\n' + ' ' * (indent * depth)
+
+    @classmethod
+    def __stream_dumps(cls, value: Any, indent: int | None, depth: int) -> str:
+        result = cls.json_dumps(value, indent)
+        if indent is not None and indent > 0 and depth > 0:
+            result = result.replace('\n', '\n' + ' ' * (indent * depth))
+        return result
+
+    @classmethod
+    def __stream_attr_name(cls, name: str) -> str:
+        name = name.replace('-', '_')
+        if keyword.iskeyword(name):
+            name = name + '_'
+        return name
+
     @classmethod
     def to_dict(cls, obj) -> dict[str, Any]:
         try:
             if obj is None:
                 raise Exception(f"'obj' is None!")
 
+            module = sys.modules.get(type(obj).__module__)
             if (
-                    not isinstance(obj, doxmlparser.index.DoxygenType)
-                    and not isinstance(obj, doxmlparser.compound.DoxygenType)
+                    type(obj).__module__ not in ['doxmlparser.index', 'doxmlparser.compound']
+                    or not isinstance(obj, module.DoxygenType)
             ):
                 raise Exception(f"Unsupported type: '{type(obj)}'!")
 
@@ -393,21 +3476,43 @@ class Xml2Json:
             raise e
 
     @classmethod
-    def __to_dict_is_doxmlparser_object(cls, obj) -> bool:
+    def __to_dict_is_doxmlparser_type(cls, obj_type: type) -> bool:
         try:
-            if obj is None:
-                raise Exception(f"'obj' is None!")
+            result = cls.__to_dict_types.get(obj_type)
 
-            obj_type = type(obj)
+            if result is None:
+                result = False
 
-            if obj_type.__module__ == 'doxmlparser.index':
-                if obj_type.__name__ in doxmlparser.index.__all__:
-                    return True
-            elif obj_type.__module__ == 'doxmlparser.compound':
-                if obj_type.__name__ in doxmlparser.compound.__all__:
-                    return True
+                if obj_type.__module__ in ['doxmlparser.index', 'doxmlparser.compound']:
+                    if obj_type.__name__ in sys.modules[obj_type.__module__].__all__:
+                        result = True
 
-            return False
+                cls.__to_dict_types[obj_type] = result
+
+            return result
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __to_dict_plan(cls, obj_type: type) -> list[tuple[str, Any]]:
+        """
+        Conversion plan of doxmlparser type: sorted list of '(key, getter)' pairs.
+        Computed once per type and reused for every node of that type.
+        """
+        try:
+            result = cls.__to_dict_plans.get(obj_type)
+
+            if result is None:
+                import inspect
+
+                result = []
+                methods = inspect.getmembers(obj_type, predicate=inspect.isfunction)
+                for method_name, key in cls.__to_dict_method_key_names(methods):
+                    result.append((key, getattr(obj_type, method_name)))
+                cls.__to_dict_plans[obj_type] = result
+
+            return result
         except Exception as e:
             cls.__logger.error(e, exc_info=True)
             raise e
@@ -436,14 +3541,12 @@ class Xml2Json:
             if obj is None:
                 return None
 
-            if cls.__to_dict_is_doxmlparser_object(obj):
+            if cls.__to_dict_is_doxmlparser_type(type(obj)):
                 result = {}
-                methods = inspect.getmembers(obj, predicate=inspect.ismethod)
-                method_key_names = cls.__to_dict_method_key_names(methods)
-                for method_name, key in method_key_names:
-                    value = getattr(obj, method_name)()
+                for key, getter in cls.__to_dict_plan(type(obj)):
+                    value = getter(obj)
                     if value is not None:
-                        if cls.__to_dict_is_doxmlparser_object(value):
+                        if cls.__to_dict_is_doxmlparser_type(type(value)):
                             value = cls.__to_dict(value)
                             result[key] = value
                         elif isinstance(value, list):
@@ -463,9 +3566,211 @@ class Xml2Json:
             raise e
 
 
-Xml2Json.set_logger_level(logging.INFO)
+class Xml2JsonIndex:
+    """
+    Class Xml2JsonIndex, refid lookup over converted output, see 'Xml2Json.open_index'.
+    """
+    __logger = logging.getLogger('.'.join([__name__, __qualname__]))
+
+    def __init__(self, output_dir: str, refid_index: dict[str, Any]):
+        self.output_dir = output_dir
+        self.ndjson = refid_index['ndjson']
+        self.offsets = refid_index['offsets']
+        self.refids = refid_index['refids']
+
+    def __len__(self) -> int:
+        return len(self.refids)
+
+    def __contains__(self, refid: str) -> bool:
+        return refid in self.refids
+
+    def lookup(self, refid: str) -> dict[str, Any] | None:
+        """
+        Find compound or member.
+
+        :param refid: compound or member refid.
+
+        :return: 'refid', 'compound' refid, 'kind', output 'file' path string and,
+                 for combined output, uncompressed 'offset' and 'length' of the compound record line,
+                 None if refid is unknown.
+        """
+        try:
+            entry = self.refids.get(refid)
+
+            if entry is None:
+                return None
+
+            compound, kind = entry
+            result = {'refid': refid, 'compound': compound, 'kind': kind}
+
+            if self.ndjson is None:
+                result['file'] = str(Path(self.output_dir).joinpath(compound + '.json'))
+            else:
+                result['file'] = str(Path(self.output_dir).joinpath(self.ndjson))
+                result['offset'], result['length'] = self.offsets[compound]
+
+            return result
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def load(self, refid: str) -> Any:
+        """
+        Read converted compound JSON of compound or member without reading other compounds.
+        Compressed combined output is decompressed up to the record.
+
+        :return: compound JSON or None if refid is unknown.
+        """
+        try:
+            entry = self.lookup(refid)
+
+            if entry is None:
+                return None
+
+            if self.ndjson is None:
+                with open(entry['file'], 'r', encoding='utf-8') as json_input:
+                    return json.load(json_input)
+
+            if self.ndjson.endswith(Xml2Json.COMPRESSION_SUFFIXES['gzip']):
+                import gzip
+                opener = gzip.open
+            elif self.ndjson.endswith(Xml2Json.COMPRESSION_SUFFIXES['lzma']):
+                import lzma
+                opener = lzma.open
+            else:
+                opener = open
+
+            with opener(entry['file'], 'rb') as ndjson_input:
+                ndjson_input.seek(entry['offset'])
+                return json.loads(ndjson_input.read(entry['length']))['data']
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def load_member(self, refid: str) -> dict[str, Any] | None:
+        """
+        Read full memberdef of a member from the compound that owns it,
+        resolves '{'refid': ID}' entries of '--dedup-members' output.
+
+        :return: memberdef or None if refid is unknown or not a memberdef.
+        """
+        try:
+            value = self.load(refid)
+
+            if value is None:
+                return None
+
+            for compounddef in value[-1].get('compounddef', []):
+                for sectiondef in compounddef.get('sectiondef', []):
+                    for memberdef in sectiondef.get('memberdef', []):
+                        if memberdef.get('id') == refid:
+                            return memberdef
+
+            return None
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+
+class Xml2JsonWorkerPool:
+    """
+    Class Xml2JsonWorkerPool, process pool with bounded worker memory, see 'Xml2Json.create_executor'.
+    Once a worker ran 'max_tasks' tasks or is above 'max_rss' resident bytes, the next 'submit'
+    waits for running tasks and replaces the pool, so there are never more workers than the pool size.
+    'max_rss' needs current resident memory, see 'Xml2Json.worker_memory'.
+    Implements 'submit' and 'shutdown' of 'Executor', returned futures cancel together with their pool tasks.
+    """
+    __logger = logging.getLogger('.'.join([__name__, __qualname__]))
+
+    def __init__(self, factory: Callable[[], Executor], max_tasks: int = 0, max_rss: int = 0):
+        from concurrent.futures import Future
+
+        if max_rss > 0 and Xml2Json.worker_memory()['rss'] is None:
+            raise Exception(f"'max_rss' is not supported, current resident memory is unknown on this platform!")
+
+        class TaskFuture(Future):
+            """
+            Future of a pool task, cancelled only if the pool task is, so a cancelled task never runs.
+            """
+            task_future: Future | None = None
+
+            def cancel(self) -> bool:
+                if self.task_future is not None and not self.task_future.cancel():
+                    return False
+                return super().cancel()
+
+        self.__future_type = TaskFuture
+        self.factory = factory
+        self.max_tasks = max_tasks
+        self.max_rss = max_rss
+        self.recycled = 0
+        self.__executor: Executor | None = None
+        self.__recycle: str | None = None
+        self.__lock = Lock()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        try:
+            with self.__lock:
+                reason = self.__recycle
+                self.__recycle = None
+
+            if reason is not None and self.__executor is not None:
+                self.__logger.info(f"recycle workers: {reason}")
+                self.__executor.shutdown(wait=True)
+                self.__executor = None
+                self.recycled += 1
+
+            if self.__executor is None:
+                self.__executor = self.factory()
+
+            future = self.__future_type()
+            future.task_future = self.__executor.submit(Xml2Json.worker_task, fn, args, kwargs)
+            future.task_future.add_done_callback(lambda done: self.__done(done, future))
+
+            return future
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        try:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def __done(self, task_future: Future, future: Future) -> None:
+        """
+        Pass 'worker_task' result to 'future' and mark pool for recycling if the worker is over a limit.
+        """
+        if task_future.cancelled():
+            future.cancel()
+            return
+
+        if not future.set_running_or_notify_cancel():
+            return
+
+        error = task_future.exception()
+        if error is not None:
+            future.set_exception(error)
+            return
+
+        result, memory = task_future.result()
+        # peak RSS never goes down, a worker above 'max_rss' would recycle the pool on every task
+        rss = memory['rss']
+
+        with self.__lock:
+            if 0 < self.max_tasks <= memory['tasks']:
+                self.__recycle = f"worker {memory['pid']} ran {memory['tasks']} tasks"
+            elif 0 < self.max_rss and rss is not None and rss >= self.max_rss:
+                self.__recycle = f"worker {memory['pid']} rss {rss / (1024 * 1024):.1f} MiB"
+
+        future.set_result(result)
+
 
 if __name__ == "__main__":
+    Xml2Json.set_logger_level(logging.INFO)
     argv = sys.argv
     ecode = Xml2Json.main(argv)
     sys.exit(ecode)
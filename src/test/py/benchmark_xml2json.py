@@ -0,0 +1,242 @@
+import gc
+import logging
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+import doxmlparser
+
+from exqudens.doxygen.xml2json import Xml2Json
+from exqudens.doxygen.xml2json import __version__
+from doxygen_xml_generator import DoxygenXmlGenerator
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class BenchmarkXml2Json:
+    """
+    Class BenchmarkXml2Json, throughput benchmark on synthetic Doxygen XML.
+    Every scenario runs in a fresh interpreter so peak RSS is per scenario.
+    'retain' scenarios keep all 'transform' results in memory and measure them with 'tracemalloc',
+    their times include tracing overhead.
+    """
+    __logger = logging.getLogger('.'.join([__name__, __qualname__]))
+
+    SCENARIOS = ['transform', 'main-serial', 'main-thread', 'main-process', 'main-pipeline', 'main-stream', 'main-dedup', 'retain', 'retain-lean']
+
+    @classmethod
+    def main(cls, arguments: list[str]) -> int:
+        try:
+            parser = ArgumentParser()
+            parser.add_argument('--work-dir', type=str, default='build/benchmark', help='default: build/benchmark')
+            parser.add_argument('--compounds', type=int, default=200, help='default: 200')
+            parser.add_argument('--members', type=int, default=50, help='default: 50')
+            parser.add_argument('--depth', type=int, default=2, help='default: 2')
+            parser.add_argument('--seed', type=int, default=0, help='default: 0')
+            parser.add_argument('--duplicates', type=float, default=0.0, help='default: 0.0, fraction of members also listed by another compound')
+            parser.add_argument('--replicate', type=str, help='use copies of Doxygen XML dir instead of generated corpus')
+            parser.add_argument('--copies', type=int, default=100, help='default: 100, copies of --replicate dir')
+            parser.add_argument('--parallel', type=int, default=os.cpu_count(), help='default: cpu count')
+            parser.add_argument('--scenarios', type=str, nargs='+', default=cls.SCENARIOS, choices=cls.SCENARIOS)
+            parser.add_argument('--output', type=str, default='<default>', help='default: WORK_DIR/result.json')
+            parser.add_argument('--compare', type=str, help='previous result JSON file')
+            parser.add_argument('--run-scenario', type=str, choices=cls.SCENARIOS, help='internal')
+
+            args = parser.parse_args(arguments[1:])
+
+            xml_dir = Path(args.work_dir).joinpath('xml')
+
+            if args.run_scenario is not None:
+                print(json.dumps(cls.run_scenario(args.run_scenario, str(xml_dir), args.work_dir, args.parallel)))
+                return 0
+
+            if args.output == '<default>':
+                args.output = str(Path(args.work_dir).joinpath('result.json'))
+
+            if xml_dir.exists():
+                shutil.rmtree(xml_dir)
+
+            start = time.perf_counter()
+            if args.replicate is not None:
+                DoxygenXmlGenerator.replicate(args.replicate, str(xml_dir), args.copies)
+            else:
+                DoxygenXmlGenerator.generate(str(xml_dir), args.compounds, args.members, args.depth, args.seed, args.duplicates)
+            xml_files = list(xml_dir.glob('*.xml'))
+
+            result = {
+                'version': __version__,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'parallel': args.parallel,
+                'corpus': {
+                    'compounds': args.compounds,
+                    'members': args.members,
+                    'depth': args.depth,
+                    'seed': args.seed,
+                    'duplicates': args.duplicates,
+                    'replicate': args.replicate,
+                    'copies': args.copies if args.replicate is not None else None,
+                    'files': len(xml_files),
+                    'bytes': sum(f.stat().st_size for f in xml_files),
+                    'generate_time': time.perf_counter() - start
+                },
+                'scenarios': {}
+            }
+
+            for scenario in args.scenarios:
+                completed = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        '--work-dir', args.work_dir,
+                        '--parallel', str(args.parallel),
+                        '--run-scenario', scenario
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True
+                )
+                result['scenarios'][scenario] = json.loads(completed.stdout.strip().split('\n')[-1])
+
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.output).write_text(json.dumps(result, indent=4))
+
+            previous = None
+            if args.compare is not None:
+                previous = json.loads(Path(args.compare).read_text())
+
+            print(cls.report(result, previous))
+
+            return 0
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def run_scenario(cls, scenario: str, xml_dir: str, work_dir: str, parallel: int) -> dict[str, Any]:
+        try:
+            index_xml_file = str(Path(xml_dir).joinpath('index.xml'))
+            output_dir = Path(work_dir).joinpath('json', scenario)
+            xml_files = sorted(Path(xml_dir).glob('*.xml'))
+            phases = {}
+            retained = None
+
+            if output_dir.exists():
+                shutil.rmtree(output_dir)
+
+            start = time.perf_counter()
+
+            if scenario == 'transform':
+                phases = {'parse': 0.0, 'to_dict': 0.0, 'serialize': 0.0, 'write': 0.0}
+                output_dir.mkdir(parents=True)
+                for xml_file in xml_files:
+                    module = doxmlparser.index if xml_file.name == 'index.xml' else doxmlparser.compound
+
+                    phase_start = time.perf_counter()
+                    root_xml = module.parse(str(xml_file), silence=True, print_warnings=False)
+                    phases['parse'] += time.perf_counter() - phase_start
+
+                    phase_start = time.perf_counter()
+                    root_result = Xml2Json.to_dict(root_xml)
+                    phases['to_dict'] += time.perf_counter() - phase_start
+
+                    phase_start = time.perf_counter()
+                    json_str = json.dumps(root_result, indent=4)
+                    phases['serialize'] += time.perf_counter() - phase_start
+
+                    phase_start = time.perf_counter()
+                    output_dir.joinpath(xml_file.stem + '.json').write_text(json_str)
+                    phases['write'] += time.perf_counter() - phase_start
+            elif scenario in ['retain', 'retain-lean']:
+                gc.collect()
+                tracemalloc.start()
+                results = [Xml2Json.transform(str(xml_file), lean=scenario == 'retain-lean') for xml_file in xml_files]
+                gc.collect()
+                retained = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del results
+            else:
+                arguments = ['app.py', '--xml-file', index_xml_file, '--output-dir', str(output_dir)]
+                if scenario == 'main-thread':
+                    arguments += ['--parallel', str(parallel), '--parallel-type', 'thread']
+                elif scenario == 'main-process':
+                    arguments += ['--parallel', str(parallel), '--parallel-type', 'process']
+                elif scenario == 'main-pipeline':
+                    arguments += ['--parallel', str(parallel), '--parallel-type', 'pipeline']
+                elif scenario == 'main-stream':
+                    arguments += ['--engine', 'stream']
+                elif scenario == 'main-dedup':
+                    arguments += ['--dedup-members']
+                Xml2Json.main(arguments)
+
+            wall_time = time.perf_counter() - start
+            bytes_in = sum(f.stat().st_size for f in xml_files)
+            bytes_out = sum(f.stat().st_size for f in output_dir.glob('*.json'))
+
+            return {
+                'files': len(xml_files),
+                'bytes_in': bytes_in,
+                'bytes_out': bytes_out,
+                'time': wall_time,
+                'files_per_sec': len(xml_files) / wall_time,
+                'mb_per_sec': bytes_in / wall_time / (1024 * 1024),
+                'peak_rss': cls.peak_rss(resource.RUSAGE_SELF) if resource is not None else None,
+                'peak_rss_children': cls.peak_rss(resource.RUSAGE_CHILDREN) if resource is not None else None,
+                'retained': retained,
+                'phases': phases
+            }
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def peak_rss(cls, who: int) -> int:
+        """
+        Peak resident set size in bytes ('ru_maxrss' is KiB on Linux, bytes on macOS).
+        """
+        value = resource.getrusage(who).ru_maxrss
+        return value if sys.platform == 'darwin' else value * 1024
+
+    @classmethod
+    def report(cls, result: dict[str, Any], previous: dict[str, Any] | None = None) -> str:
+        try:
+            lines = [
+                f"version: {result['version']} python: {result['python']} cpu_count: {result['cpu_count']}"
+                f" corpus: {result['corpus']['files']} files {result['corpus']['bytes'] / (1024 * 1024):.1f} MB"
+            ]
+            for name, metrics in result['scenarios'].items():
+                rss = metrics['peak_rss']
+                line = (
+                    f"{name:<14} {metrics['time']:8.3f} s {metrics['files_per_sec']:9.1f} files/s"
+                    f" {metrics['mb_per_sec']:7.2f} MB/s"
+                    f" out: {metrics['bytes_out'] / (1024 * 1024):7.1f} MB"
+                    f" rss: {rss / (1024 * 1024) if rss is not None else float('nan'):7.1f} MB"
+                )
+                if metrics.get('retained') is not None:
+                    line += f" retained: {metrics['retained'] / (1024 * 1024):7.1f} MB"
+                if len(metrics['phases']) > 0:
+                    line += ' ' + ' '.join(f"{phase}: {value:.3f} s" for phase, value in metrics['phases'].items())
+                if previous is not None and name in previous['scenarios']:
+                    line += f" speedup: {previous['scenarios'][name]['time'] / metrics['time']:.2f}x"
+                lines.append(line)
+            return '\n'.join(lines)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(BenchmarkXml2Json.main(sys.argv))
@@ -0,0 +1,237 @@
+import logging
+import random
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+
+class DoxygenXmlGenerator:
+    """
+    Class DoxygenXmlGenerator, synthetic Doxygen XML output ('index.xml' + compound XML files).
+    """
+    __logger = logging.getLogger('.'.join([__name__, __qualname__]))
+
+    KINDS = ['class', 'struct', 'namespace', 'file', 'group']
+    MEMBER_KINDS = {
+        'class': [('public-func', 'function'), ('public-attrib', 'variable'), ('public-type', 'typedef')],
+        'struct': [('public-attrib', 'variable')],
+        'namespace': [('func', 'function'), ('typedef', 'typedef'), ('enum', 'enum')],
+        'file': [('define', 'define'), ('func', 'function'), ('var', 'variable')],
+        'group': [('func', 'function'), ('var', 'variable')]
+    }
+    HEADER = (
+        "<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n"
+        '<{root} xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+        ' xsi:noNamespaceSchemaLocation="{schema}" version="1.10.0" xml:lang="en-US">\n'
+    )
+
+    @classmethod
+    def generate(
+        cls,
+        output_dir: str,
+        compounds: int = 100,
+        members: int = 20,
+        depth: int = 2,
+        seed: int = 0,
+        duplicates: float = 0.0
+    ) -> str:
+        """
+        Generate synthetic Doxygen XML corpus.
+
+        :param output_dir: output directory path string.
+        :param compounds: number of compounds.
+        :param members: members per compound.
+        :param depth: nesting depth of detailed descriptions.
+        :param seed: random seed, same arguments and seed give identical files.
+        :param duplicates: fraction of members also listed, with the same memberdef, by one other compound
+                           (as Doxygen does for file, namespace and group members).
+
+        :return: 'index.xml' file path string.
+        """
+        try:
+            rnd = random.Random(seed)
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+            index_entries = []
+            refids = [cls.__refid(rnd.choice(cls.KINDS), i) for i in range(compounds)]
+            memberdefs: dict[str, list[tuple[tuple[str, str, str], str]]] = {}
+
+            for refid in refids:
+                kind = refid.split('_', 1)[0]
+                name = f"{kind}_{refid.rsplit('_', 1)[1]}"
+                member_entries = []
+                sections: dict[str, list[str]] = {}
+
+                for j in range(members):
+                    section_kind, member_kind = rnd.choice(cls.MEMBER_KINDS[kind])
+                    member_id = f"{refid}_1a{j:032x}"
+                    member_name = f"{member_kind}_{j}"
+                    member_entries.append((member_id, member_kind, member_name))
+                    memberdef = cls.__memberdef(rnd, refids, refid, member_id, member_kind, member_name, depth)
+                    sections.setdefault(section_kind, []).append(memberdef)
+                    if duplicates > 0:
+                        memberdefs.setdefault(refid, []).append(((member_id, member_kind, member_name), memberdef))
+
+                index_entries.append((refid, kind, name, member_entries))
+                Path(output_dir).joinpath(refid + '.xml').write_text(
+                    cls.__compounddef(rnd, refids, refid, kind, name, sections, depth)
+                )
+
+            if duplicates > 0 and compounds > 1:
+                # separate generator, corpus without duplicates stays the same
+                duplicates_rnd = random.Random(seed + 1)
+                listed = {entry[0]: entry[3] for entry in index_entries}
+                extra: dict[str, list[str]] = {}
+                for i, refid in enumerate(refids):
+                    for member_entry, memberdef in memberdefs.get(refid, []):
+                        if duplicates_rnd.random() < duplicates:
+                            other = refids[(i + duplicates_rnd.randrange(1, compounds)) % compounds]
+                            extra.setdefault(other, []).append(memberdef)
+                            listed[other].append(member_entry)
+                for refid, texts in extra.items():
+                    compound_file = Path(output_dir).joinpath(refid + '.xml')
+                    compound_file.write_text(compound_file.read_text().replace(
+                        '\n    <briefdescription>',
+                        f'\n      <sectiondef kind="user-defined">\n{"".join(texts)}      </sectiondef>\n    <briefdescription>',
+                        1
+                    ))
+
+            index_lines = [cls.HEADER.format(root='doxygenindex', schema='index.xsd')]
+            for refid, kind, name, member_entries in index_entries:
+                index_lines.append(f'  <compound refid="{refid}" kind="{kind}"><name>{escape(name)}</name>\n')
+                for member_id, member_kind, member_name in member_entries:
+                    index_lines.append(
+                        f'    <member refid="{member_id}" kind="{member_kind}"><name>{escape(member_name)}</name></member>\n'
+                    )
+                index_lines.append('  </compound>\n')
+            index_lines.append('</doxygenindex>\n')
+
+            index_xml_file = Path(output_dir).joinpath('index.xml')
+            index_xml_file.write_text(''.join(index_lines))
+
+            return str(index_xml_file)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def replicate(cls, source_dir: str, output_dir: str, copies: int = 100) -> str:
+        """
+        Scale a Doxygen XML directory: 'copies' copies of every compound XML file with all 'id' and 'refid'
+        values prefixed by 'rN_' (members stay prefixed by the refid of the compound that defines them)
+        and one 'index.xml' listing all copies.
+
+        :param source_dir: Doxygen XML directory ('index.xml' + compound XML files).
+        :param output_dir: output directory path string.
+        :param copies: number of copies.
+
+        :return: 'index.xml' file path string.
+        """
+        try:
+            ids = re.compile(r'(\s(?:id|refid)=")([^"]*)"')
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+            index_text = Path(source_dir).joinpath('index.xml').read_text()
+            start = index_text.index('<compound ')
+            end = index_text.rindex('</doxygenindex>')
+            index_lines = [index_text[:start]]
+
+            for copy in range(copies):
+                def prefix(match: re.Match) -> str:
+                    return f'{match.group(1)}r{copy}_{match.group(2)}"'
+
+                index_lines.append(ids.sub(prefix, index_text[start:end]))
+                for xml_file in sorted(Path(source_dir).glob('*.xml')):
+                    if xml_file.name != 'index.xml':
+                        Path(output_dir).joinpath(f"r{copy}_{xml_file.name}").write_text(ids.sub(prefix, xml_file.read_text()))
+
+            index_lines.append(index_text[end:])
+
+            index_xml_file = Path(output_dir).joinpath('index.xml')
+            index_xml_file.write_text(''.join(index_lines))
+
+            return str(index_xml_file)
+        except Exception as e:
+            cls.__logger.error(e, exc_info=True)
+            raise e
+
+    @classmethod
+    def __refid(cls, kind: str, i: int) -> str:
+        return f"{kind}_{i:06d}"
+
+    @classmethod
+    def __description(cls, rnd: random.Random, refids: list[str], depth: int) -> str:
+        words = ' '.join(rnd.choice(['value', 'index', 'compute', 'returns', 'the', 'a', 'of']) for _ in range(8))
+        ref = rnd.choice(refids)
+        result = f'<para>{words} <ref refid="{ref}" kindref="compound">{ref}</ref> <emphasis>{words}</emphasis> '
+        if depth > 0:
+            items = ''.join(
+                f'<listitem>{cls.__description(rnd, refids, depth - 1)}</listitem>' for _ in range(2)
+            )
+            result += f'<itemizedlist>{items}</itemizedlist>'
+        result += f'<computeroutput>{words}</computeroutput></para>\n'
+        return result
+
+    @classmethod
+    def __memberdef(
+        cls,
+        rnd: random.Random,
+        refids: list[str],
+        refid: str,
+        member_id: str,
+        member_kind: str,
+        member_name: str,
+        depth: int
+    ) -> str:
+        params = ''
+        if member_kind in ['function', 'define']:
+            for k in range(rnd.randint(0, 4)):
+                params += f'        <param>\n          <type>int</type>\n          <declname>p{k}</declname>\n        </param>\n'
+        line = rnd.randint(1, 5000)
+        return (
+            f'      <memberdef kind="{member_kind}" id="{member_id}" prot="public" static="no"'
+            f' const="no" explicit="no" inline="no" virt="non-virtual">\n'
+            f'        <type>int</type>\n'
+            f'        <definition>int {escape(member_name)}</definition>\n'
+            f'        <argsstring>(int a)</argsstring>\n'
+            f'        <name>{escape(member_name)}</name>\n'
+            f'{params}'
+            f'        <briefdescription>\n<para>Brief {escape(member_name)}. </para>\n        </briefdescription>\n'
+            f'        <detaileddescription>\n{cls.__description(rnd, refids, depth)}        </detaileddescription>\n'
+            f'        <inbodydescription>\n        </inbodydescription>\n'
+            f'        <location file={quoteattr(f"src/{refid}.h")} line="{line}" column="5"'
+            f' bodyfile={quoteattr(f"src/{refid}.c")} bodystart="{line}" bodyend="{line + 3}"/>\n'
+            f'      </memberdef>\n'
+        )
+
+    @classmethod
+    def __compounddef(
+        cls,
+        rnd: random.Random,
+        refids: list[str],
+        refid: str,
+        kind: str,
+        name: str,
+        sections: dict[str, list[str]],
+        depth: int
+    ) -> str:
+        section_text = ''
+        for section_kind, memberdefs in sections.items():
+            section_text += f'      <sectiondef kind="{section_kind}">\n{"".join(memberdefs)}      </sectiondef>\n'
+        inner = ''
+        if kind in ['namespace', 'file', 'group']:
+            for inner_refid in rnd.sample(refids, min(3, len(refids))):
+                inner += f'    <innerclass refid="{inner_refid}" prot="public">{inner_refid}</innerclass>\n'
+        return (
+            cls.HEADER.format(root='doxygen', schema='compound.xsd')
+            + f'  <compounddef id="{refid}" kind="{kind}" language="C++" prot="public">\n'
+            + f'    <compoundname>{escape(name)}</compoundname>\n'
+            + inner
+            + section_text
+            + f'    <briefdescription>\n<para>Brief {escape(name)}. </para>\n    </briefdescription>\n'
+            + f'    <detaileddescription>\n{cls.__description(rnd, refids, depth)}    </detaileddescription>\n'
+            + f'    <location file={quoteattr(f"src/{refid}.h")} line="1" column="1"/>\n'
+            + '  </compounddef>\n'
+            + '</doxygen>\n'
+        )
@@ -1,12 +1,27 @@
+import ast
 import logging
 import logging.config
 import os
+import re
 import shutil
 import subprocess
+import sys
+import gzip
 import json
+import lzma
+import inspect
+import io
+import socket
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
+
+import doxmlparser
 
 from exqudens.doxygen.xml2json import Xml2Json
+from doxygen_xml_generator import DoxygenXmlGenerator
 
 
 class TestXml2Json:
@@ -33,6 +48,37 @@ class TestXml2Json:
             cls.__logger.info(e, exc_info=True)
             raise e
 
+    @classmethod
+    def __reflection_to_dict(cls, obj) -> Any:
+        """
+        Reference 'to_dict' implementation (per node reflection).
+        """
+        if obj is None:
+            return None
+
+        obj_type = type(obj)
+        if (
+                (obj_type.__module__ == 'doxmlparser.index' and obj_type.__name__ in doxmlparser.index.__all__)
+                or (obj_type.__module__ == 'doxmlparser.compound' and obj_type.__name__ in doxmlparser.compound.__all__)
+        ):
+            result = {}
+            for method_name, _ in inspect.getmembers(obj, predicate=inspect.ismethod):
+                if method_name.startswith('get_') and not method_name.endswith('_'):
+                    key = method_name.split('_', 1)[1]
+                elif method_name == 'get_valueOf_':
+                    key = 'value'
+                else:
+                    continue
+                value = getattr(obj, method_name)()
+                if isinstance(value, list):
+                    if len(value) > 0:
+                        result[key] = [cls.__reflection_to_dict(o) for o in value]
+                elif value is not None:
+                    result[key] = cls.__reflection_to_dict(value)
+            return result
+
+        return obj
+
     def test_11(self):
         """
         Test 11.
@@ -143,3 +189,1744 @@ class TestXml2Json:
             assert exit_code == 0
         except Exception as e:
             self.__logger.error(e, exc_info=True)
+
+    def test_23(self):
+        """
+        Test 23.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            self.__logger.info(f"test_path_elements: '{test_path_elements}'")
+            resource_dir = Path(project_dir).joinpath(
+                'src',
+                'test',
+                'resources',
+                '/'.join(test_path_elements)
+            )
+            self.__logger.info(f"resource_dir: '{resource_dir}'")
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            # hand-written XML in Doxygen 1.10 format for 'math.c' and 'math.h' of 'c', not doxygen output
+            xml_file = str(Path(resource_dir).joinpath('xml', 'index.xml'))
+            self.__logger.info(f"xml_file: '{xml_file}'")
+
+            outputs = {}
+            for name, parallel_args in [
+                ('serial', []),
+                ('thread', ['--parallel', '2', '--parallel-type', 'thread']),
+                ('process', ['--parallel', '2', '--parallel-type', 'process']),
+                ('stream', ['--engine', 'stream']),
+                ('stream-process', ['--engine', 'stream', '--parallel', '2', '--parallel-type', 'process']),
+                ('shared', ['--enums', 'shared']),
+                ('shared-stream', ['--enums', 'shared', '--engine', 'stream']),
+                ('index-order', ['--parallel', '2', '--order', 'index', '--batch-size', '0']),
+                ('batch', ['--parallel', '2', '--parallel-type', 'process', '--batch-size', '1000000']),
+                ('pipeline', ['--parallel', '2', '--parallel-type', 'pipeline'])
+            ]:
+                output_dir = str(Path(test_build_dir).joinpath(name))
+                exit_code = Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', output_dir] + parallel_args)
+
+                assert exit_code == 0
+
+                outputs[name] = {f.name: f.read_text() for f in Path(output_dir).glob('*.json')}
+
+            assert len(outputs['serial']) == len(list(Path(resource_dir).joinpath('xml').glob('*.xml')))
+            assert outputs['thread'] == outputs['serial']
+            assert outputs['process'] == outputs['serial']
+            assert outputs['stream'] == outputs['serial']
+            assert outputs['stream-process'] == outputs['serial']
+            assert outputs['index-order'] == outputs['serial']
+            assert outputs['batch'] == outputs['serial']
+            assert outputs['pipeline'] == outputs['serial']
+
+            enums_json = outputs['shared'].pop(Xml2Json.ENUMS_FILE_NAME)
+            enums = json.loads(enums_json)
+
+            assert outputs['shared-stream'].pop(Xml2Json.ENUMS_FILE_NAME) == enums_json
+            assert outputs['shared-stream'] == outputs['shared']
+            assert outputs['shared']['index.json'] == outputs['serial']['index.json']
+
+            for name, text in outputs['shared'].items():
+                if name != 'index.json':
+                    assert json.loads(outputs['serial'][name]) == enums + json.loads(text)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_24(self):
+        """
+        Test 24.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            self.__logger.info(f"test_path_elements: '{test_path_elements}'")
+            resource_dir = Path(project_dir).joinpath(
+                'src',
+                'test',
+                'resources',
+                '/'.join(test_path_elements)
+            )
+            self.__logger.info(f"resource_dir: '{resource_dir}'")
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements), 'test_24')
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_dir = Path(test_build_dir).joinpath('xml')
+            output_dir = Path(test_build_dir).joinpath('json')
+            shutil.copytree(Path(resource_dir).joinpath('xml'), xml_dir)
+            arguments = ['app.py', '--xml-file', str(xml_dir.joinpath('index.xml')), '--incremental']
+
+            assert Xml2Json.main(arguments) == 0
+            assert output_dir.joinpath(Xml2Json.MANIFEST_FILE_NAME).exists()
+
+            mtimes = {f.name: f.stat().st_mtime_ns for f in output_dir.glob('*.json')}
+            time.sleep(0.01)
+
+            assert Xml2Json.main(arguments) == 0
+            assert {f.name: f.stat().st_mtime_ns for f in output_dir.glob('*.json')} == mtimes | {
+                Xml2Json.MANIFEST_FILE_NAME: output_dir.joinpath(Xml2Json.MANIFEST_FILE_NAME).stat().st_mtime_ns
+            }
+
+            changed_xml_file = xml_dir.joinpath('math_8c.xml')
+            changed_xml_file.write_text(changed_xml_file.read_text().replace('Sum of two', 'Sum of 2'))
+            index_xml_file = xml_dir.joinpath('index.xml')
+            index_xml_file.write_text(re.sub(
+                r'<compound refid="dir_1e6f5a8c6a3b2c63e1d0c7d8f5a1c2b3".*?</compound>',
+                '',
+                index_xml_file.read_text(),
+                flags=re.DOTALL
+            ))
+
+            assert Xml2Json.main(arguments) == 0
+
+            changed = {f.name for f in output_dir.glob('*.json') if mtimes.get(f.name) != f.stat().st_mtime_ns}
+
+            assert changed == {'index.json', 'math_8c.json', Xml2Json.MANIFEST_FILE_NAME}
+            assert not output_dir.joinpath('dir_1e6f5a8c6a3b2c63e1d0c7d8f5a1c2b3.json').exists()
+            assert 'Sum of 2' in output_dir.joinpath('math_8c.json').read_text()
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_25(self):
+        """
+        Test 25.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            self.__logger.info(f"test_path_elements: '{test_path_elements}'")
+            resource_dir = Path(project_dir).joinpath(
+                'src',
+                'test',
+                'resources',
+                '/'.join(test_path_elements)
+            )
+            self.__logger.info(f"resource_dir: '{resource_dir}'")
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements), 'test_25')
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_dir = Path(test_build_dir).joinpath('xml')
+            shutil.copytree(Path(resource_dir).joinpath('xml'), xml_dir)
+            xml_dir.joinpath('math_8c.xml').unlink()
+
+            for parallel_type in ['process', 'pipeline']:
+                error = None
+                try:
+                    Xml2Json.main([
+                        'app.py',
+                        '--xml-file', str(xml_dir.joinpath('index.xml')),
+                        '--parallel', '2',
+                        '--parallel-type', parallel_type
+                    ])
+                except Exception as e:
+                    error = e
+
+                assert error is not None
+                assert 'math_8c.xml' in str(error)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_26(self):
+        """
+        Test 26.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            self.__logger.info(f"test_path_elements: '{test_path_elements}'")
+            resource_dir = Path(project_dir).joinpath(
+                'src',
+                'test',
+                'resources',
+                '/'.join(test_path_elements)
+            )
+            self.__logger.info(f"resource_dir: '{resource_dir}'")
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements), 'test_26')
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = str(Path(resource_dir).joinpath('xml', 'index.xml'))
+            files_dir = Path(test_build_dir).joinpath('files')
+
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(files_dir)]) == 0
+
+            outputs = {}
+            for name, compression, parallel_args in [
+                ('serial', 'none', []),
+                ('serial-gzip', 'gzip', []),
+                ('process-gzip', 'gzip', ['--parallel', '2', '--parallel-type', 'process', '--batch-size', '0']),
+                ('stream-lzma', 'lzma', ['--engine', 'stream', '--parallel', '2'])
+            ]:
+                output_dir = Path(test_build_dir).joinpath(name)
+                exit_code = Xml2Json.main([
+                    'app.py',
+                    '--xml-file', xml_file,
+                    '--output-dir', str(output_dir),
+                    '--output-format', 'ndjson',
+                    '--compression', compression
+                ] + parallel_args)
+
+                assert exit_code == 0
+                assert len(list(output_dir.iterdir())) == 1
+
+                outputs[name] = next(output_dir.iterdir()).read_bytes()
+
+            assert outputs['serial-gzip'] == outputs['process-gzip']
+            assert gzip.decompress(outputs['serial-gzip']) == outputs['serial']
+            assert lzma.decompress(outputs['stream-lzma']) == outputs['serial']
+
+            lines = outputs['serial'].decode('utf-8').split('\n')
+
+            assert lines[-1] == ''
+
+            records = [json.loads(line) for line in lines[:-1]]
+            refids = [compound['refid'] for compound in records[0]['data'][-1]['compound']]
+
+            assert [record['name'] for record in records] == ['index'] + refids
+
+            for record in records:
+                assert record['data'] == json.loads(files_dir.joinpath(record['name'] + '.json').read_text())
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_27(self):
+        """
+        Test 27.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_27']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(
+                str(Path(test_build_dir).joinpath('xml')),
+                compounds=20,
+                members=10,
+                depth=2
+            )
+
+            outputs = {}
+            for name, extra_args in [
+                ('serial', []),
+                ('stream', ['--engine', 'stream']),
+                ('process', ['--parallel', '2', '--parallel-type', 'process']),
+                ('pipeline', ['--parallel', '2', '--parallel-type', 'pipeline'])
+            ]:
+                output_dir = Path(test_build_dir).joinpath(name)
+
+                assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir)] + extra_args) == 0
+
+                outputs[name] = {f.name: f.read_text() for f in output_dir.glob('*.json')}
+
+            assert len(outputs['serial']) == 21
+            assert outputs['stream'] == outputs['serial']
+            assert outputs['process'] == outputs['serial']
+            assert outputs['pipeline'] == outputs['serial']
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_28(self):
+        """
+        Test 28.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_28']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(
+                str(Path(test_build_dir).joinpath('xml')),
+                compounds=10,
+                members=5,
+                depth=1
+            )
+
+            hook_calls = []
+            Xml2Json.set_stats_hook(lambda report, records: hook_calls.append((report, records)))
+            try:
+                nodes = {}
+                for name, extra_args in [
+                    ('serial', []),
+                    ('stream', ['--engine', 'stream']),
+                    ('process', ['--parallel', '2', '--parallel-type', 'process', '--batch-size', '0']),
+                    ('pipeline', ['--parallel', '2', '--parallel-type', 'pipeline'])
+                ]:
+                    output_dir = Path(test_build_dir).joinpath(name)
+                    stats_file = Path(test_build_dir).joinpath(name + '.stats.json')
+
+                    assert Xml2Json.main([
+                        'app.py',
+                        '--xml-file', xml_file,
+                        '--output-dir', str(output_dir),
+                        '--stats', str(stats_file),
+                        '--stats-slowest', '3'
+                    ] + extra_args) == 0
+
+                    report = json.loads(stats_file.read_text())
+
+                    assert report == hook_calls[-1][0]
+                    assert report['totals']['files'] == 11
+                    assert sorted(record['file'] for record in hook_calls[-1][1]) == sorted(
+                        f.name for f in Path(xml_file).parent.glob('*.xml')
+                    )
+                    assert report['totals']['bytes_out'] == sum(f.stat().st_size for f in output_dir.glob('*.json'))
+                    assert report['totals']['time'] > 0
+                    assert report['wall_time'] > 0
+                    assert len(report['slowest']) == 3
+                    assert [record['time'] for record in report['slowest']] == sorted(
+                        [record['time'] for record in report['slowest']], reverse=True
+                    )
+                    for key in ['p50', 'p90', 'p99', 'max']:
+                        assert report['percentiles']['time'][key] <= report['percentiles']['time']['max']
+                    if name == 'stream':
+                        assert report['totals']['stream'] > 0
+                        assert report['totals']['parse'] == 0
+                    else:
+                        assert report['totals']['parse'] > 0
+                        assert report['totals']['convert'] > 0
+                        assert report['totals']['serialize'] > 0
+                        assert report['totals']['write'] > 0
+                        for record in hook_calls[-1][1]:
+                            assert record['serialize'] > 0
+                            assert record['write'] > 0
+
+                    nodes[name] = {record['file']: record['nodes'] for record in hook_calls[-1][1]}
+
+                assert len(hook_calls) == 4
+                assert nodes['process'] == nodes['serial']
+                assert nodes['pipeline'] == nodes['serial']
+                assert nodes['stream'] == nodes['serial']
+            finally:
+                Xml2Json.set_stats_hook(None)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_29(self):
+        """
+        Test 29.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_29']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(
+                str(Path(test_build_dir).joinpath('xml')),
+                compounds=30,
+                members=3,
+                depth=0
+            )
+
+            full_dir = Path(test_build_dir).joinpath('full')
+
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(full_dir)]) == 0
+
+            full_index = json.loads(full_dir.joinpath('index.json').read_text())
+            compounds = full_index[-1]['compound']
+            select_file = Path(test_build_dir).joinpath('select.txt')
+            file_compound = next(compound for compound in compounds if compound['kind'] == 'file')
+            # generator locates every compound in 'src/REFID.h', paths in other directories do not match
+            select_file.write_text(f"src/{file_compound['refid']}.h\nstruct_000003\n\nother/{compounds[0]['refid']}.h\n")
+
+            resource_xml_file = str(Path(project_dir).joinpath(
+                'src', 'test', 'resources', __name__, __class__.__name__, 'test_2', 'xml', 'index.xml'
+            ))
+            math_refids = {'math_8c', 'structExqudensMath', 'group__EXQUDENS__MATH'}
+            for files, expected_refids in [
+                (['c/exqudens/math.c'], math_refids),
+                (['/abs/src/test/resources/test_xml2json/TestXml2Json/test_2/c/exqudens/math.c'], math_refids),
+                (['math.c'], math_refids),
+                (['c/other/math.c', 'exqudens/math.h'], set())
+            ]:
+                assert Xml2Json.located_refids(resource_xml_file, files) == expected_refids
+                assert Xml2Json.compound_selection(select=files, xml_file=resource_xml_file)['select_refids'] == set(files) | expected_refids
+            # compound '<location>' far before the end of the file
+            long_xml_dir = Path(test_build_dir).joinpath('long')
+            shutil.copytree(Path(resource_xml_file).parent, long_xml_dir)
+            long_xml_file = long_xml_dir.joinpath('structExqudensMath.xml')
+            long_xml_file.write_text(long_xml_file.read_text().replace(
+                '</listofallmembers>',
+                '<member refid="x" prot="public" virt="non-virtual"><scope>S</scope><name>n</name></member>\n' * 1000 + '</listofallmembers>'
+            ))
+            assert Xml2Json.located_refids(str(long_xml_dir.joinpath('index.xml')), ['math.c']) == math_refids
+
+            # refids only: compound files are not scanned, so a missing 'index.xml' is not read
+            missing_xml_file = str(Path(test_build_dir).joinpath('missing', 'index.xml'))
+            assert Xml2Json.compound_selection(select=['math_8c', ' '], xml_file=missing_xml_file)['select_refids'] == {'math_8c'}
+
+            for name, filter_args, expected in [
+                (
+                    'kinds',
+                    ['--include-kind', 'class', 'namespace', 'group'],
+                    [c for c in compounds if c['kind'] in ['class', 'namespace', 'group']]
+                ),
+                (
+                    'exclude',
+                    ['--exclude-kind', 'class', '--exclude-refid', 'file_*'],
+                    [c for c in compounds if c['kind'] != 'class' and not c['refid'].startswith('file_')]
+                ),
+                (
+                    'regex',
+                    ['--include-refid', 're:.*_00001[0-9]'],
+                    [c for c in compounds if re.fullmatch(r'.*_00001[0-9]', c['refid']) is not None]
+                ),
+                (
+                    'select',
+                    ['--select-from', str(select_file)],
+                    [c for c in compounds if c['refid'] in ['struct_000003', file_compound['refid']]]
+                )
+            ]:
+                outputs = {}
+                for engine_name, engine_args in [
+                    ('object', []),
+                    ('stream', ['--engine', 'stream']),
+                    ('process', ['--parallel', '2', '--parallel-type', 'process', '--order', 'index'])
+                ]:
+                    output_dir = Path(test_build_dir).joinpath(name, engine_name)
+
+                    assert Xml2Json.main(
+                        ['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir)] + filter_args + engine_args
+                    ) == 0
+
+                    outputs[engine_name] = {f.name: f.read_text() for f in output_dir.glob('*.json')}
+
+                assert len(expected) > 0
+                assert len(expected) < len(compounds)
+                assert outputs['stream'] == outputs['object']
+                assert outputs['process'] == outputs['object']
+                assert sorted(outputs['object']) == sorted(['index.json'] + [c['refid'] + '.json' for c in expected])
+                assert json.loads(outputs['object']['index.json']) == full_index[:-1] + [{
+                    **full_index[-1],
+                    'compound': expected
+                }]
+
+                for file_name, text in outputs['object'].items():
+                    if file_name != 'index.json':
+                        assert text == full_dir.joinpath(file_name).read_text()
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_31(self):
+        """
+        Test 31.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            self.__logger.info(f"test_path_elements: '{test_path_elements}'")
+            resource_dir = Path(project_dir).joinpath(
+                'src',
+                'test',
+                'resources',
+                '/'.join(test_path_elements)
+            )
+            self.__logger.info(f"resource_dir: '{resource_dir}'")
+
+            repeat = 20
+            xml_files = sorted(Path(resource_dir).joinpath('xml').glob('*.xml'))
+
+            assert len(xml_files) > 0
+
+            for xml_file in xml_files:
+                if xml_file.name == 'index.xml':
+                    root_xml = doxmlparser.index.parse(str(xml_file), silence=True, print_warnings=False)
+                else:
+                    root_xml = doxmlparser.compound.parse(str(xml_file), silence=True, print_warnings=False)
+
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    expected = self.__reflection_to_dict(root_xml)
+                reflection_time = (time.perf_counter() - start) / repeat
+
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    actual = Xml2Json.to_dict(root_xml)
+                plan_time = (time.perf_counter() - start) / repeat
+
+                self.__logger.info(
+                    f"xml_file: '{xml_file.name}'"
+                    f" reflection: {reflection_time * 1000:.3f} ms"
+                    f" plan: {plan_time * 1000:.3f} ms"
+                    f" speedup: {reflection_time / plan_time:.1f}x"
+                )
+
+                assert json.dumps(actual, indent=4) == json.dumps(expected, indent=4)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_32(self):
+        """
+        Test 32.
+        """
+        try:
+            start = time.perf_counter()
+            first = Xml2Json.compound_enum_dicts()
+            first_time = time.perf_counter() - start
+
+            first[0][next(iter(first[0]))].append('modified')
+
+            start = time.perf_counter()
+            second = Xml2Json.compound_enum_dicts()
+            second_time = time.perf_counter() - start
+
+            self.__logger.info(f"compound_enum_dicts first: {first_time * 1000:.3f} ms second: {second_time * 1000:.3f} ms")
+
+            assert 'modified' not in second[0][next(iter(second[0]))]
+            assert len(second) > 0
+            assert Xml2Json.compound_enum_dicts() == second
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_41(self):
+        """
+        Test 41.
+        """
+        try:
+            lock = threading.Lock()
+            state = {'running': 0, 'max_running': 0, 'calls': 0}
+
+            def task(value: int) -> int:
+                with lock:
+                    state['calls'] += 1
+                    state['running'] += 1
+                    state['max_running'] = max(state['max_running'], state['running'])
+                time.sleep(0.01)
+                with lock:
+                    state['running'] -= 1
+                if value == 5:
+                    raise ValueError(f"task: {value}")
+                return value
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = sorted(Xml2Json.schedule(executor, task, [(i,) for i in range(5)], max_pending=2))
+
+            assert results == [0, 1, 2, 3, 4]
+            assert state['max_running'] <= 2
+
+            state['calls'] = 0
+            error = None
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                try:
+                    for _ in Xml2Json.schedule(executor, task, [(i,) for i in range(100)], max_pending=2):
+                        pass
+                except ValueError as e:
+                    error = e
+
+            assert str(error) == 'task: 5'
+            assert state['calls'] < 100
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_42(self):
+        """
+        Test 42.
+        """
+        try:
+            costs = {'a': 10, 'b': 500, 'c': 20, 'd': 300, 'e': 5, 'f': 40}
+
+            batches = Xml2Json.plan_batches(list(costs), cost=costs.get)
+
+            assert batches == [['b'], ['d'], ['f'], ['c'], ['a'], ['e']]
+
+            batches = Xml2Json.plan_batches(list(costs), cost=costs.get, batch_cost=50)
+
+            assert batches == [['b'], ['d'], ['f', 'c'], ['a', 'e']]
+
+            batches = Xml2Json.plan_batches(list(costs), cost=costs.get, batch_cost=50, largest_first=False)
+
+            assert batches == [['b'], ['d'], ['a', 'c', 'e', 'f']]
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_43(self):
+        """
+        Test 43.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_43']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            json_file = Path(test_build_dir).joinpath('a.json')
+
+            Xml2Json.write_json(str(json_file), {'a': [1, 2], 'b': 'c'}, indent=-1, buffer_size=16)
+
+            assert json_file.read_text() == '{"a":[1,2],"b":"c"}'
+
+            error = None
+            try:
+                Xml2Json.write_json(str(json_file), {'a': [1, 2], 'b': object()}, indent=4)
+            except TypeError as e:
+                error = e
+
+            assert error is not None
+            assert json_file.read_text() == '{"a":[1,2],"b":"c"}'
+            assert [f.name for f in Path(test_build_dir).iterdir()] == ['a.json']
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_44(self):
+        """
+        Test 44.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_44']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(str(Path(test_build_dir).joinpath('xml')), compounds=5, members=2, depth=0)
+
+            collect = []
+            refids = Xml2Json.iter_index_refids(xml_file, collect)
+
+            assert next(refids) == collect[0]
+            assert len(collect) == 1
+            assert list(refids) == collect[1:]
+            assert collect == Xml2Json.index_refids(xml_file)
+
+            costs = {'a': 10, 'b': 500, 'c': 20, 'd': 300, 'e': 5, 'f': 40}
+            consumed = []
+
+            def files():
+                for name in costs:
+                    consumed.append(name)
+                    yield name
+
+            batches = Xml2Json.iter_batches(files(), cost=costs.get, batch_cost=50)
+
+            assert next(batches) == ['b']
+            assert consumed == ['a', 'b']
+            assert list(batches) == [['d'], ['a', 'c', 'e', 'f']]
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_51(self):
+        """
+        Test 51.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            self.__logger.info(f"project_dir: '{project_dir}'")
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            self.__logger.info(f"test_path_elements: '{test_path_elements}'")
+            resource_dir = Path(project_dir).joinpath(
+                'src',
+                'test',
+                'resources',
+                '/'.join(test_path_elements)
+            )
+            self.__logger.info(f"resource_dir: '{resource_dir}'")
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements), 'test_51')
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            xml_files = sorted(Path(resource_dir).joinpath('xml').glob('*.xml'))
+
+            assert len(xml_files) > 0
+
+            for indent in [4, 2, 0, None, -1]:
+                for xml_file in xml_files:
+                    json_file = Path(test_build_dir).joinpath(f"{xml_file.stem}-{indent}.json")
+
+                    Xml2Json.transform_stream(xml_file=str(xml_file), json_file=str(json_file), indent=indent)
+
+                    expected = json.dumps(Xml2Json.transform(str(xml_file)), **Xml2Json.json_dump_kwargs(indent))
+
+                    assert json_file.read_text() == expected, f"indent: {indent} xml_file: '{xml_file.name}'"
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_61(self):
+        """
+        Test 61.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_61']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(str(Path(test_build_dir).joinpath('xml')), compounds=6, members=3, depth=0)
+            xml_dir = Path(xml_file).parent
+            output_dir = Path(test_build_dir).joinpath('watch')
+            refids = Xml2Json.index_refids(xml_file)
+            changed_refid, touched_refid, removed_refid = refids[0], refids[1], refids[2]
+
+            def wait_for(condition) -> None:
+                deadline = time.monotonic() + 30
+                while not condition():
+                    assert time.monotonic() < deadline
+                    time.sleep(0.05)
+
+            args = Xml2Json.argument_parser().parse_args([
+                '--xml-file', xml_file,
+                '--output-dir', str(output_dir),
+                '--watch',
+                '--watch-interval', '0.05'
+            ])
+            stop = threading.Event()
+            watcher = threading.Thread(target=Xml2Json.watch, args=(args, None, stop))
+            watcher.start()
+            try:
+                wait_for(lambda: all(output_dir.joinpath(refid + '.json').exists() for refid in refids))
+                time.sleep(0.2)
+                mtimes = {f.name: f.stat().st_mtime_ns for f in output_dir.glob('*.json')}
+
+                changed_xml = xml_dir.joinpath(changed_refid + '.xml')
+                changed_xml.write_text(changed_xml.read_text().replace('<para>Brief ', '<para>Changed '))
+                touched_xml = xml_dir.joinpath(touched_refid + '.xml')
+                touched_xml.write_text(touched_xml.read_text())
+                os.utime(touched_xml, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+
+                wait_for(lambda: 'Changed ' in output_dir.joinpath(changed_refid + '.json').read_text())
+
+                index_text = Path(xml_file).read_text()
+                Path(xml_file).write_text(re.sub(
+                    f'<compound refid="{removed_refid}".*?</compound>\\n',
+                    '',
+                    index_text,
+                    flags=re.DOTALL
+                ))
+
+                wait_for(lambda: not output_dir.joinpath(removed_refid + '.json').exists())
+            finally:
+                stop.set()
+                watcher.join()
+
+            assert output_dir.joinpath(touched_refid + '.json').stat().st_mtime_ns == mtimes[touched_refid + '.json']
+            for refid in refids[3:]:
+                assert output_dir.joinpath(refid + '.json').stat().st_mtime_ns == mtimes[refid + '.json']
+            assert json.loads(output_dir.joinpath('index.json').read_text())[-1]['compound'][0]['refid'] == changed_refid
+
+            expected_dir = Path(test_build_dir).joinpath('expected')
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(expected_dir)]) == 0
+            expected = {f.name: f.read_text() for f in expected_dir.glob('*.json')}
+            assert {f.name: f.read_text() for f in output_dir.glob('*.json')} == expected
+
+            compound_xml = Path(test_build_dir).joinpath('single', refids[3] + '.xml')
+            compound_xml.parent.mkdir(parents=True)
+            shutil.copyfile(xml_dir.joinpath(refids[3] + '.xml'), compound_xml)
+            compound_output_dir = Path(test_build_dir).joinpath('watch-compound')
+            args = Xml2Json.argument_parser().parse_args([
+                '--xml-file', str(compound_xml),
+                '--xml-type', 'compound',
+                '--output-dir', str(compound_output_dir),
+                '--watch',
+                '--watch-interval', '0.05'
+            ])
+            stop = threading.Event()
+            watcher = threading.Thread(target=Xml2Json.watch, args=(args, None, stop))
+            watcher.start()
+            try:
+                wait_for(lambda: compound_output_dir.joinpath(refids[3] + '.json').exists())
+                compound_xml.write_text(compound_xml.read_text().replace('<para>Brief ', '<para>Changed '))
+                wait_for(lambda: 'Changed ' in compound_output_dir.joinpath(refids[3] + '.json').read_text())
+            finally:
+                stop.set()
+                watcher.join()
+
+            compound_expected_dir = Path(test_build_dir).joinpath('expected-compound')
+            assert Xml2Json.main(
+                ['app.py', '--xml-file', str(compound_xml), '--xml-type', 'compound', '--output-dir', str(compound_expected_dir)]
+            ) == 0
+            assert [f.name for f in compound_output_dir.iterdir()] == [refids[3] + '.json']
+            assert compound_output_dir.joinpath(refids[3] + '.json').read_text() == compound_expected_dir.joinpath(refids[3] + '.json').read_text()
+            assert 'compounddef' in json.loads(compound_output_dir.joinpath(refids[3] + '.json').read_text())[-1]
+
+            server_args = Xml2Json.argument_parser().parse_args(['--serve', '-'])
+            requests = [
+                {'arguments': ['--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('serve-1'))]},
+                {'arguments': ['--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('serve-2')), '--indent', '-1']},
+                {'arguments': ['--xml-file', str(xml_dir.joinpath('missing.xml')), '--xml-type', 'compound']},
+                {'arguments': ['--unknown']},
+                {'arguments': ['--xml-file', xml_file, '--stats-hook', 'builtins:print']},
+                {'arguments': ['--xml-file', xml_file, '--select-from', '-']},
+                {'arguments': ['--serve', '-']},
+                {'command': 'shutdown'},
+                {'arguments': ['--xml-file', xml_file]}
+            ]
+            output_stream = io.StringIO()
+            shutdown = Xml2Json.serve_stream(
+                server_args,
+                None,
+                io.StringIO('\n'.join(json.dumps(request) for request in requests) + '\n'),
+                output_stream
+            )
+            responses = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+
+            assert shutdown
+            assert [response['exit_code'] for response in responses] == [0, 0, 1, 1, 1, 1, 1, 0]
+            assert {f.name: f.read_text() for f in Path(test_build_dir).joinpath('serve-1').glob('*.json')} == expected
+            assert "'xml_file' not exists!" in responses[2]['error']
+            assert "'--select-from -' is not supported in requests!" in responses[5]['error']
+
+            sys_stdin, sys_stdout, sys_stderr = sys.stdin, sys.stdout, sys.stderr
+            sys.stdin = io.StringIO(json.dumps({
+                'arguments': ['--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('serve-verbose')), '--verbose']
+            }) + '\n')
+            sys.stdout, sys.stderr = io.StringIO(), io.StringIO()
+            try:
+                Xml2Json.serve(Xml2Json.argument_parser().parse_args(['--serve', '-', '--verbose']), None)
+                verbose_stdout, verbose_stderr = sys.stdout.getvalue(), sys.stderr.getvalue()
+            finally:
+                sys.stdin, sys.stdout, sys.stderr = sys_stdin, sys_stdout, sys_stderr
+
+            assert [json.loads(line)['exit_code'] for line in verbose_stdout.splitlines()] == [0]
+            assert f"process: '{xml_file}'" in verbose_stderr
+
+            output = io.StringIO()
+            sys_stdout = sys.stdout
+            sys.stdout = output
+            try:
+                hook_dir = str(Path(test_build_dir).joinpath('hook'))
+                assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', hook_dir, '--stats-hook', 'builtins:print']) == 0
+                hook_output = output.getvalue()
+                assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', hook_dir]) == 0
+            finally:
+                sys.stdout = sys_stdout
+
+            assert "'totals'" in hook_output
+            assert output.getvalue() == hook_output
+
+            for host in ['0.0.0.0', '']:
+                error = None
+                try:
+                    Xml2Json.serve(Xml2Json.argument_parser().parse_args(['--serve', f"{host}:0"]), None)
+                except Exception as e:
+                    error = e
+
+                assert error is not None
+                assert 'is not loopback!' in str(error)
+
+            with socket.socket() as probe:
+                probe.bind(('127.0.0.1', 0))
+                port = probe.getsockname()[1]
+
+            server_args = Xml2Json.argument_parser().parse_args(['--serve', f"127.0.0.1:{port}", '--parallel', '2'])
+            server = threading.Thread(target=Xml2Json.daemon, args=(server_args,))
+            server.start()
+            try:
+                deadline = time.monotonic() + 30
+                while True:
+                    try:
+                        connection = socket.create_connection(('127.0.0.1', port))
+                        break
+                    except ConnectionRefusedError:
+                        assert time.monotonic() < deadline
+                        time.sleep(0.05)
+                with connection:
+                    request = {
+                        'arguments': ['--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('serve-tcp'))]
+                    }
+                    connection.sendall((json.dumps(request) + '\n' + json.dumps({'command': 'shutdown'}) + '\n').encode('utf-8'))
+                    with connection.makefile('r', encoding='utf-8') as reader:
+                        responses = [json.loads(reader.readline()) for _ in range(2)]
+            finally:
+                server.join(timeout=60)
+
+            assert not server.is_alive()
+            assert [response['exit_code'] for response in responses] == [0, 0]
+            assert {f.name: f.read_text() for f in Path(test_build_dir).joinpath('serve-tcp').glob('*.json')} == expected
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_62(self):
+        """
+        Test 62.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_2']
+            resource_dir = Path(project_dir).joinpath('src', 'test', 'resources', '/'.join(test_path_elements))
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements), 'test_62')
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            main_py_dir = str(Path(project_dir).joinpath('src', 'main', 'py'))
+            env = {**os.environ, 'PYTHONPATH': os.pathsep.join([main_py_dir, os.environ.get('PYTHONPATH', '')])}
+            heavy = ['doxmlparser.index', 'doxmlparser.compound', 'lxml.etree', 'concurrent.futures.process', 'inspect', 'socket']
+
+            completed = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', 'import exqudens.doxygen.xml2json'],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            imported = {line.split('|')[-1].strip(): int(line.split('|')[1]) for line in completed.stderr.splitlines()[1:]}
+            self.__logger.info(f"import time: {imported['exqudens.doxygen.xml2json']} us")
+
+            for name in heavy:
+                assert name not in imported
+
+            script = (
+                'import sys\n'
+                'from exqudens.doxygen.xml2json import Xml2Json\n'
+                'Xml2Json.main(["app.py"] + sys.argv[1:])\n'
+                'print(sorted(sys.modules))\n'
+            )
+            xml_dir = Path(resource_dir).joinpath('xml')
+            for arguments, expected in [
+                (['--version'], []),
+                (
+                    ['--xml-file', str(xml_dir.joinpath('index.xml')), '--xml-type', 'index'],
+                    ['doxmlparser.index', 'lxml.etree']
+                ),
+                (
+                    ['--xml-file', str(xml_dir.joinpath('math_8c.xml')), '--xml-type', 'compound'],
+                    ['doxmlparser.compound', 'lxml.etree']
+                ),
+                (
+                    ['--xml-file', str(xml_dir.joinpath('index.xml')), '--parallel', '2', '--parallel-type', 'process'],
+                    ['lxml.etree', 'concurrent.futures.process']
+                )
+            ]:
+                if arguments[0] == '--xml-file':
+                    arguments = arguments + ['--output-dir', str(test_build_dir)]
+                completed = subprocess.run(
+                    [sys.executable, '-c', script] + arguments,
+                    env=env,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                modules = ast.literal_eval(completed.stdout.splitlines()[-1])
+
+                assert sorted(name for name in heavy[:4] if name in modules) == sorted(expected)
+
+            script = (
+                'import json\n'
+                'import threading\n'
+                'from exqudens.doxygen.xml2json import Xml2Json\n'
+                'errors = []\n'
+                'barrier = threading.Barrier(8)\n'
+                'def task(xml_type):\n'
+                '    try:\n'
+                '        barrier.wait()\n'
+                '        Xml2Json.doxmlparser_module(xml_type).parse\n'
+                '        import doxmlparser\n'
+                '        doxmlparser.DoxygenType\n'
+                '    except Exception as e:\n'
+                '        errors.append(repr(e))\n'
+                'threads = [threading.Thread(target=task, args=(["index", "compound"][i % 2],)) for i in range(8)]\n'
+                'for thread in threads:\n'
+                '    thread.start()\n'
+                'for thread in threads:\n'
+                '    thread.join()\n'
+                'print(json.dumps(errors))\n'
+            )
+            for _ in range(3):
+                completed = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True, check=True)
+                assert json.loads(completed.stdout.splitlines()[-1]) == []
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_63(self):
+        """
+        Test 63.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_63']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(str(Path(test_build_dir).joinpath('xml')), compounds=10, members=4, depth=0)
+            files_dir = Path(test_build_dir).joinpath('files')
+
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(files_dir), '--refid-index']) == 0
+
+            compounds = json.loads(files_dir.joinpath('index.json').read_text())[-1]['compound']
+            expected = {}
+            for compound in compounds:
+                expected[compound['refid']] = (compound['refid'], compound['kind'])
+                for member in compound['member']:
+                    expected[member['refid']] = (compound['refid'], member['kind'])
+
+            for name, extra_args in [
+                ('files', []),
+                ('ndjson', ['--output-format', 'ndjson']),
+                ('ndjson-gzip', ['--output-format', 'ndjson', '--compression', 'gzip']),
+                ('ndjson-lzma-process', ['--output-format', 'ndjson', '--compression', 'lzma', '--parallel', '2', '--parallel-type', 'process'])
+            ]:
+                output_dir = Path(test_build_dir).joinpath(name)
+
+                assert Xml2Json.main(
+                    ['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir), '--refid-index'] + extra_args
+                ) == 0
+
+                refid_index = Xml2Json.open_index(str(output_dir))
+
+                assert len(refid_index) == len(expected)
+                assert refid_index.lookup('missing') is None
+                assert refid_index.load('missing') is None
+                assert 'missing' not in refid_index
+
+                for refid, (compound_refid, kind) in expected.items():
+                    entry = refid_index.lookup(refid)
+
+                    assert refid in refid_index
+                    assert entry['compound'] == compound_refid
+                    assert entry['kind'] == kind
+                    assert Path(entry['file']).exists()
+                    assert refid_index.load(refid) == json.loads(files_dir.joinpath(compound_refid + '.json').read_text())
+
+                    if name != 'files':
+                        assert entry['length'] > 0
+
+            refid_index = Xml2Json.open_index(str(Path(test_build_dir).joinpath('ndjson')))
+            with open(Path(test_build_dir).joinpath('ndjson', Xml2Json.NDJSON_FILE_NAME), 'rb') as ndjson_input:
+                entry = refid_index.lookup(compounds[-1]['refid'])
+                ndjson_input.seek(entry['offset'])
+                line = ndjson_input.read(entry['length'])
+
+            assert line.endswith(b'}\n')
+            assert json.loads(line)['name'] == compounds[-1]['refid']
+
+            parts_dir = Path(test_build_dir).joinpath('parts')
+            parts_dir.mkdir(parents=True)
+            parts = {'ascii': [1, 'a'], 'utf8': ['\u00e9\u4e2d\U0001f600'], 'lines': {'a': [1, 2]}}
+            parts_dir.joinpath('ascii.json').write_text(json.dumps(parts['ascii']))
+            parts_dir.joinpath('utf8.json').write_bytes(json.dumps(parts['utf8'], ensure_ascii=False).encode('utf-8'))
+            parts_dir.joinpath('lines.json').write_bytes(json.dumps(parts['lines'], indent=4).encode('utf-8'))
+            ndjson_file = Path(test_build_dir).joinpath('parts.ndjson')
+            offsets = Xml2Json.write_ndjson(str(ndjson_file), str(parts_dir), list(parts), buffer_size=4)
+            ndjson_bytes = ndjson_file.read_bytes()
+
+            assert b'\r' not in ndjson_bytes
+            assert sum(length for _, length in offsets.values()) == len(ndjson_bytes)
+            for name, (offset, length) in offsets.items():
+                assert json.loads(ndjson_bytes[offset:offset + length]) == {'name': name, 'data': parts[name]}
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_64(self):
+        """
+        Test 64.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_64']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_dir = Path(test_build_dir).joinpath('xml')
+            xml_file = DoxygenXmlGenerator.generate(str(xml_dir), compounds=10, members=4, depth=1)
+            compound_xml_file = sorted(xml_dir.glob('*_000001.xml'))[0]
+            compound_xml_file.write_text(compound_xml_file.read_text().replace('Brief', 'Brïef\u007f €', 1), encoding='utf-8')
+
+            backends = ['stdlib']
+            try:
+                import orjson
+                backends.append('orjson')
+            except ImportError:
+                self.__logger.info(f"'orjson' is not installed, only 'stdlib' is checked")
+
+            values = [
+                {'b': 1, 'a': [], 'c': {}, 'd': [{}, [[]], {'e': None}], 'f': True, 'g': False},
+                ['ascii', 'ünïcode €', 'del \u007f', 'ctrl \x00\x1f\b\t\n\r\f', 'quote " \\ /', 'spaces  \n  x'],
+                {'big': 2 ** 70, 'small': -2 ** 63, 'max': 2 ** 64 - 1},
+                {1: 'int key'},
+                'string',
+                0,
+                None
+            ]
+            json_file = Path(test_build_dir).joinpath('value.json')
+            for backend in backends:
+                assert Xml2Json.set_json_backend(backend) == backend
+                assert Xml2Json.json_backend() == backend
+                assert [Xml2Json.json_encoder(indent) for indent in [None, -1, 0, 2, 4]] == ['stdlib', backend, 'stdlib', backend, 'stdlib']
+                for value in values:
+                    for indent in [None, -1, 0, 1, 2, 3, 4, 8]:
+                        assert Xml2Json.json_dumps(value, indent) == json.dumps(value, **Xml2Json.json_dump_kwargs(indent))
+                        Xml2Json.write_json(str(json_file), value, indent, buffer_size=16)
+                        assert json_file.read_text() == json.dumps(value, **Xml2Json.json_dump_kwargs(indent))
+                floats = {'time': 5e-06, 'big': 1e+20, 'nan': float('nan')}
+                assert Xml2Json.json_dumps(floats, 4, False) == json.dumps(floats, indent=4)
+
+            for name, extra_args in [
+                ('indent-4', []),
+                ('indent-2', ['--indent', '2']),
+                ('indent-0', ['--indent', '0']),
+                ('compact', ['--indent', '-1']),
+                ('stream', ['--engine', 'stream']),
+                ('process', ['--parallel', '2', '--parallel-type', 'process']),
+                ('pipeline', ['--parallel', '2', '--parallel-type', 'pipeline', '--indent', '-1']),
+                ('ndjson', ['--output-format', 'ndjson', '--refid-index'])
+            ]:
+                outputs = {}
+                for backend in backends:
+                    output_dir = Path(test_build_dir).joinpath(name, backend)
+                    assert Xml2Json.main(
+                        ['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir), '--json-backend', backend] + extra_args
+                    ) == 0
+                    outputs[backend] = {f.name: f.read_bytes() for f in output_dir.iterdir()}
+
+                expected = outputs['stdlib']
+                assert len(expected) > 0
+                if name != 'ndjson':
+                    assert b'Br\\u00efef\\u007f \\u20ac' in expected[compound_xml_file.stem + '.json']
+                for backend in backends:
+                    assert outputs[backend] == expected
+
+            output = io.StringIO()
+            sys_stdout = sys.stdout
+            sys.stdout = output
+            try:
+                Xml2Json.main([
+                    'app.py', '--verbose', '--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('verbose')),
+                    '--indent', '2', '--stats', str(Path(test_build_dir).joinpath('stats.json'))
+                ])
+            finally:
+                sys.stdout = sys_stdout
+
+            assert f"json backend: '{Xml2Json.json_backend()}', encoder: '{Xml2Json.json_backend()}'" in output.getvalue()
+            assert json.loads(Path(test_build_dir).joinpath('stats.json').read_text())['json_encoder'] == Xml2Json.json_backend()
+            assert Xml2Json.json_backend() == backends[-1]
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+        finally:
+            Xml2Json.set_json_backend()
+
+    def test_65(self):
+        """
+        Test 65.
+        """
+        try:
+            import gc
+            import tracemalloc
+
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_65']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_dir = Path(test_build_dir).joinpath('xml')
+            DoxygenXmlGenerator.generate(str(xml_dir), compounds=20, members=10, depth=1)
+            xml_files = sorted(xml_dir.glob('*.xml'))
+
+            value = {'a': [1, 'x' * 300, None, {'b': 2 ** 70}], 'c': [1, 'x' * 300, None, {'b': 2 ** 70}], 'd': {'e': 1.5}, 'f': {'e': 1.5}}
+            lean_value = Xml2Json.lean(value)
+            assert lean_value == value
+            assert lean_value['a'] is lean_value['c']
+            assert lean_value['d'] is not lean_value['f']
+
+            for xml_file in xml_files:
+                for enums in [True, False]:
+                    lean_result = Xml2Json.transform(str(xml_file), enums=enums, lean=True)
+                    assert lean_result == Xml2Json.transform(str(xml_file), enums=enums)
+                    assert json.dumps(lean_result, indent=4) == json.dumps(Xml2Json.transform(str(xml_file), enums=enums), indent=4)
+
+            assert Xml2Json.transform(str(xml_files[0]), lean=True)[0] is Xml2Json.transform(str(xml_files[1]), lean=True)[0]
+
+            compound = Xml2Json.transform(str(xml_files[0]), enums=False, lean=True)[-1]['compounddef'][0]
+            memberdefs = [m for section in compound['sectiondef'] for m in section['memberdef']]
+            assert len(set(id(m['type']) for m in memberdefs if 'type' in m)) == 1
+            assert len(set(id(m['prot']) for m in memberdefs)) == 1
+
+            retained = {}
+            for lean in [False, True]:
+                gc.collect()
+                tracemalloc.start()
+                results = [Xml2Json.transform(str(xml_file), lean=lean) for xml_file in xml_files]
+                gc.collect()
+                retained[lean] = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                del results
+            self.__logger.info(f"retained: {retained}")
+
+            assert retained[True] < retained[False]
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_66(self):
+        """
+        Test 66.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_66']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(str(Path(test_build_dir).joinpath('xml')), compounds=12, members=6, depth=1)
+            count = 3
+
+            plan = Xml2Json.shard_plan(xml_file, count)
+            names = [name for shard in plan for name in shard]
+            costs = {name: Path(xml_file).parent.joinpath(name + '.xml').stat().st_size for name in names}
+            loads = [sum(costs[name] for name in shard) for shard in plan]
+
+            assert plan == Xml2Json.shard_plan(xml_file, count)
+            assert sorted(names) == sorted(['index'] + Xml2Json.index_refids(xml_file))
+            assert max(loads) - min(loads) <= max(costs.values())
+            assert all(list(shard.values()) == sorted(shard.values()) for shard in plan)
+
+            def read_dir(output_dir: Path) -> dict[str, bytes]:
+                return {f.name: f.read_bytes() for f in output_dir.iterdir()}
+
+            for enums in ['inline', 'shared']:
+                reference_dir = Path(test_build_dir).joinpath(enums, 'reference')
+                assert Xml2Json.main(
+                    ['app.py', '--xml-file', xml_file, '--output-dir', str(reference_dir), '--enums', enums, '--incremental', '--refid-index']
+                ) == 0
+                expected = read_dir(reference_dir)
+
+                shard_dirs = []
+                shared_dir = Path(test_build_dir).joinpath(enums, 'shared')
+                for index in range(1, count + 1):
+                    shard_dir = Path(test_build_dir).joinpath(enums, f"shard-{index}")
+                    extra_args = ['--parallel', '2', '--parallel-type', 'process'] if index == 2 else []
+                    extra_args += ['--refid-index'] if enums == 'inline' or index != 1 else []
+                    for output_dir in [shard_dir, shared_dir]:
+                        assert Xml2Json.main(
+                            ['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir), '--enums', enums, '--shard', f"{index}/{count}"] + extra_args
+                        ) == 0
+                    shard_dirs.append(str(shard_dir))
+
+                    shard_names = {f.stem for f in shard_dir.glob('*.json') if not f.name.startswith('xml2json.')}
+                    assert shard_names == set(plan[index - 1]) | ({'enums'} if enums == 'shared' else set())
+
+                merged_dir = Path(test_build_dir).joinpath(enums, 'merged')
+                assert Xml2Json.main(['app.py', '--merge'] + shard_dirs + ['--output-dir', str(merged_dir)]) == 0
+                assert read_dir(merged_dir) == expected
+
+                merged_index = Xml2Json.open_index(str(merged_dir))
+                reference_index = Xml2Json.open_index(str(reference_dir))
+                assert len(merged_index) == len(reference_index) > len(names)
+                for refid in list(reference_index.refids)[::7]:
+                    assert merged_index.load(refid) == reference_index.load(refid)
+
+                assert Xml2Json.main(['app.py', '--merge', str(shared_dir), '--output-dir', str(shared_dir)]) == 0
+                assert read_dir(shared_dir) == expected
+
+                assert Xml2Json.main(
+                    ['app.py', '--xml-file', xml_file, '--output-dir', str(merged_dir), '--enums', enums, '--incremental', '--refid-index', '--verbose']
+                ) == 0
+                assert read_dir(merged_dir) == expected
+
+            mismatch_dir = Path(test_build_dir).joinpath('mismatch')
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(mismatch_dir), '--shard', f"3/{count}", '--indent', '2']) == 0
+            shard_dirs = [str(Path(test_build_dir).joinpath('inline', f"shard-{index}")) for index in range(1, count + 1)]
+            refids_mismatch_dir = Path(test_build_dir).joinpath('refids-mismatch')
+            shutil.copytree(shard_dirs[2], refids_mismatch_dir)
+            refids_mismatch_dir.joinpath(Xml2Json.REFIDS_FILE_NAME).write_text('{}')
+
+            for merge_dirs, message in [
+                (shard_dirs[:2], 'Missing shards: [3] of 3'),
+                (shard_dirs + shard_dirs[:1], 'duplicates'),
+                (shard_dirs[:2] + [str(mismatch_dir)], "'options' does not match"),
+                (shard_dirs[:2] + [str(refids_mismatch_dir)], f"{Xml2Json.REFIDS_FILE_NAME}' does not match"),
+                ([str(Path(test_build_dir).joinpath('xml'))], 'has no shard manifest')
+            ]:
+                error = None
+                try:
+                    Xml2Json.main(['app.py', '--merge'] + merge_dirs + ['--output-dir', str(Path(test_build_dir).joinpath('error'))])
+                except Exception as e:
+                    error = e
+
+                assert error is not None
+                assert message in str(error)
+
+            for extra_args, message in [
+                (['--shard', f"0/{count}"], 'Unsupported'),
+                (['--shard', 'x'], 'Unsupported'),
+                (['--shard', f"1/{count}", '--output-format', 'ndjson'], 'ndjson'),
+                (['--shard', f"1/{count}", '--incremental'], 'incremental'),
+                (['--shard', f"1/{count}", '--watch'], 'watch')
+            ]:
+                error = None
+                try:
+                    Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('error'))] + extra_args)
+                except Exception as e:
+                    error = e
+
+                assert error is not None
+                assert message in str(error)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_67(self):
+        """
+        Test 67.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_67']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_dir = Path(test_build_dir).joinpath('xml')
+            xml_file = DoxygenXmlGenerator.generate(str(xml_dir), compounds=10, members=4, depth=1)
+            refids = Xml2Json.index_refids(xml_file)
+            expected = {'index': Xml2Json.transform(xml_file)}
+            for refid in refids:
+                expected[refid] = Xml2Json.transform(str(xml_dir.joinpath(refid + '.xml')))
+
+            for kwargs in [
+                {},
+                {'parallel': 2},
+                {'parallel': 2, 'parallel_type': 'process'},
+                {'parallel': 2, 'parallel_type': 'pipeline', 'lean': True},
+                {'lean': True}
+            ]:
+                results = list(Xml2Json.iter_transform(xml_file, **kwargs))
+
+                if kwargs.get('parallel', 0) == 0:
+                    assert [name for name, _ in results] == ['index'] + refids
+                assert len(results) == len(expected)
+                assert dict(results) == expected
+
+            selection = Xml2Json.compound_selection(include_kinds=['class'])
+            results = dict(Xml2Json.iter_transform(xml_file, parallel=2, enums=False, selection=selection, index=False))
+            assert set(results) == {refid for refid in refids if refid.startswith('class_')}
+            assert all(result == expected[refid][-1:] for refid, result in results.items())
+
+            class CountingExecutor(ThreadPoolExecutor):
+                submitted = 0
+
+                def submit(self, fn, /, *args, **kwargs):
+                    CountingExecutor.submitted += 1
+                    return super().submit(fn, *args, **kwargs)
+
+            with CountingExecutor(max_workers=1) as executor:
+                iterator = Xml2Json.iter_transform(xml_file, parallel=1, executor=executor, max_pending=2)
+                consumed = [next(iterator)]
+                time.sleep(0.2)
+
+                assert CountingExecutor.submitted <= len(consumed) + 2
+
+                consumed.extend(iterator)
+
+                assert dict(consumed) == expected
+                assert CountingExecutor.submitted == len(expected)
+
+                iterator = Xml2Json.iter_transform(xml_file, parallel=1, executor=executor, max_pending=1)
+                next(iterator)
+                iterator.close()
+
+                assert executor.submit(sum, [1, 2]).result() == 3
+
+            assert len(list(Path(test_build_dir).rglob('*.json'))) == 0
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_68(self):
+        """
+        Test 68.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_68']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            xml_file = DoxygenXmlGenerator.generate(str(Path(test_build_dir).joinpath('xml')), compounds=12, members=6, depth=1)
+
+            choice = Xml2Json.auto_parallel(xml_file)
+            self.__logger.info(f"choice: {choice}")
+
+            assert choice['compounds'] == 12
+            assert choice['calibration']['file'] is not None
+            assert choice['calibration']['time'] > 0
+            assert choice['serial_time'] > 0
+
+            choice = Xml2Json.auto_parallel(xml_file, cpu_count=1, seconds_per_byte=1e-3)
+            assert choice['parallel'] == 0
+
+            choice = Xml2Json.auto_parallel(xml_file, cpu_count=8, seconds_per_byte=1e-12)
+            assert choice['parallel'] == 0
+            assert choice['calibration']['file'] is None
+
+            choice = Xml2Json.auto_parallel(xml_file, cpu_count=32, seconds_per_byte=1e-3)
+            assert choice['parallel'] == 12
+            assert choice['parallel_type'] in ['process', 'thread']
+            assert 0 < choice['batch_size'] <= choice['bytes'] / (4 * 12)
+
+            choice = Xml2Json.auto_parallel(xml_file, cpu_count=4, seconds_per_byte=1e-4)
+            assert choice['parallel'] == 4
+            assert choice['batch_size'] == int(Xml2Json.AUTO_TASK_TIME / 1e-4)
+
+            selection = Xml2Json.compound_selection(include_kinds=['file'])
+            file_refids = list(Xml2Json.iter_index_refids(xml_file, selection=selection))
+            choice = Xml2Json.auto_parallel(xml_file, cpu_count=32, seconds_per_byte=1e-3, selection=selection)
+            assert 0 < len(file_refids) < 12
+            assert choice['compounds'] == len(file_refids)
+            assert choice['parallel'] == len(file_refids)
+            assert choice['bytes'] == sum(Path(xml_file).parent.joinpath(refid + '.xml').stat().st_size for refid in file_refids)
+
+            output = io.StringIO()
+            sys_stdout = sys.stdout
+            sys.stdout = output
+            try:
+                assert Xml2Json.main([
+                    'app.py', '--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('auto-file')),
+                    '--parallel', 'auto', '--include-kind', 'file', '--verbose'
+                ]) == 0
+            finally:
+                sys.stdout = sys_stdout
+
+            assert f"compounds: {len(file_refids)}," in output.getvalue()
+
+            reference_dir = Path(test_build_dir).joinpath('reference')
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(reference_dir)]) == 0
+
+            output_dir = Path(test_build_dir).joinpath('auto')
+            output = io.StringIO()
+            sys_stdout = sys.stdout
+            sys.stdout = output
+            try:
+                assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir), '--parallel', 'auto', '--verbose']) == 0
+            finally:
+                sys.stdout = sys_stdout
+
+            assert 'parallel auto: ' in output.getvalue()
+            assert 'calibration: ' in output.getvalue()
+            assert {f.name: f.read_bytes() for f in output_dir.iterdir()} == {f.name: f.read_bytes() for f in reference_dir.iterdir()}
+
+            compound_xml_file = sorted(Path(xml_file).parent.glob('class_*.xml'))[0]
+            assert Xml2Json.main(['app.py', '--xml-file', str(compound_xml_file), '--xml-type', 'compound', '--output-dir', str(output_dir), '--parallel', 'auto']) == 0
+
+            error = None
+            try:
+                Xml2Json.argument_parser().parse_args(['--parallel', 'many'])
+            except SystemExit as e:
+                error = e
+
+            assert error is not None
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_69(self):
+        """
+        Test 69.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_69']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            resource_xml_file = str(Path(project_dir).joinpath(
+                'src', 'test', 'resources', __name__, __class__.__name__, 'test_2', 'xml', 'index.xml'
+            ))
+            generated_xml_file = DoxygenXmlGenerator.generate(
+                str(Path(test_build_dir).joinpath('xml')), compounds=12, members=6, depth=1, duplicates=0.5
+            )
+            replicated_xml_file = DoxygenXmlGenerator.replicate(
+                str(Path(resource_xml_file).parent), str(Path(test_build_dir).joinpath('replicated')), copies=3
+            )
+
+            assert Xml2Json.foreign_members(resource_xml_file) == {
+                'math_8c': [
+                    'group__EXQUDENS__MATH_1ga8d3c6cb46b4dc0aa56a8d3fbd4d52a0b',
+                    'group__EXQUDENS__MATH_1ga5f0a3a79b1c6d9f4f0f6a2f6e3c6c2b1'
+                ]
+            }
+
+            def resolve(value: Any, refid_index: Any) -> Any:
+                if isinstance(value, dict):
+                    if list(value) == ['refid'] and refid_index.load_member(value['refid']) is not None:
+                        return refid_index.load_member(value['refid'])
+                    return {k: resolve(v, refid_index) for k, v in value.items()}
+                if isinstance(value, list):
+                    return [resolve(v, refid_index) for v in value]
+                return value
+
+            assert Xml2Json.foreign_members(replicated_xml_file) == {
+                f"r{copy}_{refid}": [f"r{copy}_{member_refid}" for member_refid in member_refids]
+                for copy in range(3)
+                for refid, member_refids in Xml2Json.foreign_members(resource_xml_file).items()
+            }
+
+            for xml_name, xml_file in [
+                ('resource', resource_xml_file),
+                ('replicated', replicated_xml_file),
+                ('generated', generated_xml_file)
+            ]:
+                foreign = Xml2Json.foreign_members(xml_file)
+                assert len(foreign) > 0
+
+                reference_dir = Path(test_build_dir).joinpath(xml_name, 'reference')
+                assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(reference_dir)]) == 0
+                expected = {f.stem: json.loads(f.read_text()) for f in reference_dir.glob('*.json')}
+                reference_size = sum(f.stat().st_size for f in reference_dir.glob('*.json'))
+
+                for name, extra_args in [
+                    ('serial', []),
+                    ('stream', ['--engine', 'stream']),
+                    ('thread', ['--parallel', '2']),
+                    ('process', ['--parallel', '2', '--parallel-type', 'process', '--batch-size', '0']),
+                    ('pipeline', ['--parallel', '2', '--parallel-type', 'pipeline']),
+                    ('ndjson', ['--output-format', 'ndjson'])
+                ]:
+                    output_dir = Path(test_build_dir).joinpath(xml_name, name)
+                    assert Xml2Json.main(
+                        ['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir), '--dedup-members', '--refid-index'] + extra_args
+                    ) == 0
+                    refid_index = Xml2Json.open_index(str(output_dir))
+
+                    for refid, value in expected.items():
+                        if refid == 'index':
+                            continue
+                        result = refid_index.load(refid)
+                        members = [m for c in result[-1].get('compounddef', []) for s in c.get('sectiondef', []) for m in s['memberdef']]
+
+                        assert [m['refid'] for m in members if 'refid' in m] == foreign.get(refid, [])
+                        assert resolve(result, refid_index) == value
+
+                    if name != 'ndjson':
+                        assert sum(f.stat().st_size for f in output_dir.glob('*.json') if not f.name.startswith('xml2json.')) < reference_size
+
+            error = None
+            try:
+                Xml2Json.main(['app.py', '--xml-file', generated_xml_file, '--dedup-members', '--incremental'])
+            except Exception as e:
+                error = e
+
+            assert error is not None
+            assert 'dedup-members' in str(error)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
+
+    def test_70(self):
+        """
+        Test 70.
+        """
+        try:
+            project_dir = Path(__file__).parent.parent.parent.parent
+            test_path_elements = [__name__, __class__.__name__, 'test_70']
+            test_build_dir = Path(project_dir).joinpath('build', 'test', '/'.join(test_path_elements))
+            self.__logger.info(f"test_build_dir: '{test_build_dir}'")
+
+            if Path(test_build_dir).exists():
+                shutil.rmtree(test_build_dir)
+
+            memory = Xml2Json.worker_memory()
+            assert memory['pid'] == os.getpid()
+            assert memory['rss'] is None or memory['rss'] > 0
+            assert memory['peak_rss'] is None or memory['peak_rss'] >= (memory['rss'] or 0)
+
+            for max_tasks, max_rss in [(1, 0), (0, 1)]:
+                executor = Xml2Json.create_executor(2, 'process', max_tasks=max_tasks, max_rss=max_rss)
+                try:
+                    pids = [executor.submit(Xml2Json.worker_memory).result()['pid'] for _ in range(3)]
+                finally:
+                    executor.shutdown(wait=True)
+                assert len(set(pids)) == 3
+                assert os.getpid() not in pids
+                assert executor.recycled == 2
+
+            cancel_dir = Path(test_build_dir).joinpath('cancel')
+            executor = Xml2Json.create_executor(1, 'process', max_tasks=100)
+            try:
+                first = executor.submit(time.sleep, 1.0)
+                futures = [
+                    executor.submit(Xml2Json.write_json, str(cancel_dir.joinpath(f"{i}.json")), {'i': i}) for i in range(6)
+                ]
+                cancelled = [future.cancel() for future in futures]
+                first.result()
+            finally:
+                executor.shutdown(wait=True)
+
+            assert any(cancelled)
+            for i, future in enumerate(futures):
+                assert future.cancelled() == cancelled[i]
+                assert cancel_dir.joinpath(f"{i}.json").exists() != cancelled[i]
+
+            worker_memory = Xml2Json.__dict__['worker_memory']
+            Xml2Json.worker_memory = classmethod(lambda cls: {'pid': os.getpid(), 'rss': None, 'peak_rss': 1, 'tasks': 0})
+            try:
+                for create in [
+                    lambda: Xml2Json.create_executor(2, 'process', max_rss=1),
+                    lambda: Xml2Json.main(['app.py', '--xml-file', 'index.xml', '--parallel', '2', '--parallel-type', 'process', '--max-worker-rss', '1'])
+                ]:
+                    error = None
+                    try:
+                        create()
+                    except Exception as e:
+                        error = e
+
+                    assert error is not None
+                    assert 'current resident memory is unknown on this platform!' in str(error)
+            finally:
+                Xml2Json.worker_memory = worker_memory
+
+            lock = threading.Lock()
+            running = {'lane': 0, 'lane_max': 0}
+
+            def task(name: str, large: bool) -> str:
+                with lock:
+                    if large:
+                        running['lane'] += 1
+                        running['lane_max'] = max(running['lane_max'], running['lane'])
+                time.sleep(0.01)
+                with lock:
+                    if large:
+                        running['lane'] -= 1
+                return name
+
+            tasks = [(f"task_{i}", i % 3 == 0) for i in range(12)]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(Xml2Json.schedule(executor, task, tasks, 4, lane=lambda t: t[1], lane_pending=1))
+
+            assert sorted(results) == sorted(name for name, _ in tasks)
+            assert running['lane_max'] == 1
+
+            xml_file = DoxygenXmlGenerator.generate(str(Path(test_build_dir).joinpath('xml')), compounds=12, members=6, depth=1)
+            sizes = sorted(f.stat().st_size for f in Path(xml_file).parent.glob('*.xml') if f.name != 'index.xml')
+            large_file_size = sizes[len(sizes) // 2]
+
+            reference_dir = Path(test_build_dir).joinpath('reference')
+            assert Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(reference_dir)]) == 0
+            expected = {f.name: f.read_bytes() for f in reference_dir.iterdir()}
+
+            for name, extra_args in [
+                ('thread', ['--parallel', '2', '--batch-size', '0']),
+                ('process', ['--parallel', '2', '--parallel-type', 'process', '--batch-size', '0', '--max-worker-tasks', '3']),
+                ('pipeline', ['--parallel', '2', '--parallel-type', 'pipeline', '--max-worker-tasks', '3', '--max-worker-rss', '4096'])
+            ]:
+                output_dir = Path(test_build_dir).joinpath(name)
+                stats_file = Path(test_build_dir).joinpath(name + '.stats.json')
+                assert Xml2Json.main(
+                    ['app.py', '--xml-file', xml_file, '--output-dir', str(output_dir), '--stats', str(stats_file),
+                     '--large-file-size', str(large_file_size), '--large-file-parallel', '1'] + extra_args
+                ) == 0
+                assert {f.name: f.read_bytes() for f in output_dir.iterdir()} == expected
+
+                report = json.loads(stats_file.read_text())
+                workers = report['workers']
+                assert sum(worker['files'] for worker in workers) == report['totals']['files'] == 13
+                assert [worker['peak_rss'] or 0 for worker in workers] == sorted([worker['peak_rss'] or 0 for worker in workers], reverse=True)
+                if name == 'thread':
+                    assert [worker['pid'] for worker in workers] == [os.getpid()]
+                else:
+                    # 12 compounds, at most 3 per worker generation of 2 workers
+                    assert len(workers) >= 3
+                    assert os.getpid() not in [worker['pid'] for worker in workers]
+
+            for extra_args, message in [
+                (['--parallel', '2', '--max-worker-tasks', '3'], "require '--parallel-type process'"),
+                (['--max-worker-rss', '-1'], "'max_worker_rss' less than 0!"),
+                (['--large-file-parallel', '0'], "'large_file_parallel' less than 1!")
+            ]:
+                error = None
+                try:
+                    Xml2Json.main(['app.py', '--xml-file', xml_file, '--output-dir', str(Path(test_build_dir).joinpath('error'))] + extra_args)
+                except Exception as e:
+                    error = e
+
+                assert error is not None
+                assert message in str(error)
+        except Exception as e:
+            self.__logger.error(e, exc_info=True)
+            raise e
@@ -0,0 +1,40 @@
+#include "exqudens/math.h"
+#include "exqudens/math_util.h"
+
+/*!
+* @brief Math state.
+* @details See exqudens_math_add() for the @e public API.
+*/
+struct ExqudensMath {
+  int value; //!< Last computed value.
+};
+
+/*!
+* @addtogroup EXQUDENS_MATH
+* @{
+*/
+
+/*!
+* @private @memberof ExqudensMath
+*/
+static int add(int a, int b);
+
+/*!
+* @brief Sum of two integer values.
+* @details Public sum of two integer values.
+* @param a first value
+* @param b second value
+* @return `a + b`
+*/
+int exqudens_math_add(int a, int b) {
+  return add(a, b);
+}
+
+/*!
+* @private @memberof ExqudensMath
+*/
+static int add(int a, int b) {
+  return exqudens_math_util_add(a, b);
+}
+
+//! @}
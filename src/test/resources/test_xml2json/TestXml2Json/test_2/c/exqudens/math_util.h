@@ -0,0 +1,22 @@
+#ifndef EXQUDENS_MATH_UTIL_H_INCLUDED
+#define EXQUDENS_MATH_UTIL_H_INCLUDED
+
+/*!
+* @addtogroup EXQUDENS_MATH
+* @{
+*/
+
+/*!
+* @brief Protected add int to int.
+* @protected
+*/
+int exqudens_math_util_add(int a, int b);
+
+/*!
+* @protected
+*/
+int exqudens_math_util_subtract(int a, int b);
+
+//! @}
+
+#endif